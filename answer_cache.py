@@ -0,0 +1,151 @@
+"""
+Advent of code, 2018
+On-disk answer cache, bounded in size, least recently used entries evicted first
+
+The key of an answer is made of the day, the part, the SHA-256 of the input text and the parameters of
+the solution: the day module's upper case constants (NUM_GENERATIONS, STABLE_GENS, ...), any extra
+parameters given by the caller, and the hash of the module source (so that a change in a parameter that is
+hard coded in a part, like the number of workers of day 7, also changes the key).
+
+Each entry is a small JSON file in .cache/answers/. A hit touches the file, so the file modification times
+give the recency order. When the total size goes over the bound, the oldest entries are removed.
+
+Usage:
+    python answer_cache.py stats
+    python answer_cache.py clear
+"""
+
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Dict, List, Tuple
+
+import puzzles
+
+ANSWERS_DIR = os.path.join(puzzles.HERE, ".cache", "answers")
+MAX_BYTES = 1024 * 1024
+
+
+def solution_params(day: int) -> Dict[str, str]:
+    """
+    the module level constants of the day module (repr'd, some are dicts/sets)
+    """
+    module = puzzles.load_module(day)
+    return {name: repr(value) for name, value in sorted(vars(module).items())
+            if name.isupper() and name != "INPUT_FILE" and isinstance(value, (int, float, str, tuple, list, dict, set))}
+
+
+def answer_key(day: int, part: int, text: str, params: Dict[str, Any] = None) -> str:
+    key = {
+        "day": day,
+        "part": part,
+        "input": puzzles.text_hash(text),
+        "source": puzzles.module_source_hash(day),
+        "params": {**solution_params(day), **{name: repr(value) for name, value in (params or {}).items()}},
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+class AnswerCache():
+    def __init__(self, directory: str = ANSWERS_DIR, max_bytes: int = MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        returns (found, answer)
+        """
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                answer = json.load(f)["answer"]
+            os.utime(path)  # now the most recently used
+        except (OSError, ValueError, KeyError):  # not cached (or evicted meanwhile), or a broken entry
+            return False, None
+
+        return True, answer
+
+    def put(self, key: str, answer: Any, info: Dict[str, Any] = None):
+        try:
+            data = json.dumps({"answer": answer, **(info or {})})
+        except TypeError:  # not JSON serializable, not cached
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        # write + rename, so that parallel runs never read a half written entry
+        tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+
+        self.evict()
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """
+        (last used, size, path) of the entries, least recently used first
+        """
+        entries = []
+        for name in os.listdir(self.directory) if os.path.isdir(self.directory) else []:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:  # evicted by a parallel run
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        return sorted(entries)
+
+    def evict(self):
+        """
+        removes least recently used entries until the total size is within the bound
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            os.remove(path)
+
+
+def solve(day: int, part: int, input_path: str = None, params: Dict[str, Any] = None,
+          cache: AnswerCache = None) -> Any:
+    """
+    the answer of the part, from the cache if the same input has been solved before with the same parameters
+    """
+    cache = cache or AnswerCache()
+    text = puzzles.read_text(day, input_path)
+    key = answer_key(day, part, text, params)
+
+    found, answer = cache.get(key)
+    if not found:
+        answer = puzzles.get_solver(day, part)(puzzles.parse_text(day, text))
+        cache.put(key, answer, {"day": day, "part": part})
+
+    return answer
+
+
+if __name__ == "__main__":
+    cache = AnswerCache()
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if command == "clear":
+        cache.clear()
+    elif command == "stats":
+        entries = cache.entries()
+        print(f"{len(entries)} answers, {sum(size for _, size, _ in entries) / 1024:.1f} kB "
+              f"of {cache.max_bytes / 1024:.0f} kB, in {cache.directory}")
+    else:
+        sys.exit(f"Unknown command {command}, use stats or clear")
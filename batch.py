@@ -0,0 +1,153 @@
+"""
+Advent of code, 2018
+Batch mode: solves one day for every input file in a directory, sharded over a pool of worker processes
+
+The input files are handed to the workers in chunks (a worker takes the next chunk when it is done with
+the previous one), and each worker keeps the day module loaded between its inputs. Every input is parsed
+once for all the parts. The results are streamed out as JSON lines, one per input and part, in the order
+they finish:
+    {"day": 17, "part": 1, "input": "scans/a.txt", "answer": 31383, "wall_s": 31.2}
+    {"day": 17, "part": 1, "input": "scans/b.txt", "error": "ValueError: Unexpected input"}
+An input that fails does not stop the others.
+
+Usage:
+    python batch.py 17 scans/
+    python batch.py 5 inputs/ --part 2 --jobs 4 --chunksize 8 --pattern "*.txt"
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import json
+import os
+import sys
+import time
+from multiprocessing import get_context
+from typing import Any, Dict, Iterator, List, Tuple
+
+import answer_cache
+import puzzles
+
+DEFAULT_PATTERN = "*"
+CHUNKS_PER_WORKER = 4  # default chunk size: the inputs split into about this many chunks per worker
+
+
+def input_files(directory: str, pattern: str = DEFAULT_PATTERN) -> List[str]:
+    """
+    the files in the directory matching the pattern, sorted by name
+    """
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if fnmatch.fnmatch(name, pattern) and os.path.isfile(os.path.join(directory, name))]
+
+
+def default_chunksize(num_inputs: int, jobs: int) -> int:
+    return max(1, num_inputs // (jobs * CHUNKS_PER_WORKER))
+
+
+def _load_day(day: int):
+    # worker initializer: the import is paid once per worker, not once per input
+    puzzles.load_module(day)
+
+
+def solve_input(day: int, parts: Tuple[int, ...], path: str, use_cache: bool = True,
+                use_answers: bool = False) -> List[Dict[str, Any]]:
+    """
+    solves the parts of the day for one input file, returns one result record per part
+    """
+    # stdout is the channel of the results, anything the solutions print goes to stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        return _solve_input(day, parts, path, use_cache, use_answers)
+
+
+def _solve_input(day: int, parts: Tuple[int, ...], path: str, use_cache: bool,
+                 use_answers: bool) -> List[Dict[str, Any]]:
+    records = []
+    try:
+        text = puzzles.read_text(day, path)
+        puzzle = puzzles.parse_text(day, text, use_cache)
+    except Exception as e:  # a broken input fails all its parts, but not the batch
+        return [{"day": day, "part": part, "input": path, "error": f"{type(e).__name__}: {e}"} for part in parts]
+
+    cache = answer_cache.AnswerCache() if use_answers else None
+    for part in parts:
+        record = {"day": day, "part": part, "input": path}
+        start = time.perf_counter()
+        try:
+            if cache:
+                key = answer_cache.answer_key(day, part, text)
+                found, answer = cache.get(key)
+                if not found:
+                    answer = puzzles.get_solver(day, part)(puzzle)
+                    cache.put(key, answer, {"day": day, "part": part})
+                record["cached"] = found
+            else:
+                answer = puzzles.get_solver(day, part)(puzzle)
+            record.update(answer=answer, wall_s=time.perf_counter() - start)
+        except Exception as e:
+            record.update(error=f"{type(e).__name__}: {e}", wall_s=time.perf_counter() - start)
+        records.append(record)
+
+    return records
+
+
+def _solve_task(task: Tuple[int, Tuple[int, ...], str, bool, bool]) -> List[Dict[str, Any]]:
+    return solve_input(*task)
+
+
+def run_batch(day: int, paths: List[str], parts: Tuple[int, ...], jobs: int = 1, chunksize: int = None,
+              use_cache: bool = True, use_answers: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    yields the result records as the inputs get solved (not in the order of paths)
+    """
+    tasks = [(day, parts, path, use_cache, use_answers) for path in paths]
+    chunksize = chunksize or default_chunksize(len(tasks), jobs)
+
+    with get_context("spawn").Pool(jobs, initializer=_load_day, initargs=(day,)) as pool:
+        for records in pool.imap_unordered(_solve_task, tasks, chunksize=chunksize):
+            yield from records
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("day", type=int)
+    parser.add_argument("directory", help="directory of input files of the day")
+    parser.add_argument("--part", type=int, choices=puzzles.PARTS, help="solve only this part")
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN, help="solve the files matching this pattern (default: all)")
+    parser.add_argument("--jobs", type=int, default=0, help="number of worker processes (default 0: one per CPU)")
+    parser.add_argument("--chunksize", type=int, help=f"inputs per chunk (default: about {CHUNKS_PER_WORKER} chunks per worker)")
+    parser.add_argument("--no-cache", action="store_true", help="always parse the inputs, do not use the parsed input cache")
+    parser.add_argument("--answers", action="store_true", help="use the answer cache (see answer_cache.py)")
+    return parser
+
+
+def main(argv: List[str] = None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+
+    if args.day not in puzzles.DAY_MODULES:
+        parser.error(f"No solution for day {args.day}")
+    if args.jobs < 0:
+        parser.error("--jobs must be at least 1 (or 0 for one per CPU)")
+    if args.chunksize is not None and args.chunksize < 1:
+        parser.error("--chunksize must be at least 1")
+
+    paths = input_files(args.directory, args.pattern)
+    if not paths:
+        parser.error(f"No input files in {args.directory} matching {args.pattern}")
+
+    parts = tuple(part for part in puzzles.available_parts(args.day) if args.part is None or part == args.part)
+    jobs = min(args.jobs or os.cpu_count(), len(paths))
+
+    failed = 0
+    for record in run_batch(args.day, paths, parts, jobs=jobs, chunksize=args.chunksize,
+                            use_cache=not args.no_cache, use_answers=args.answers):
+        failed += "error" in record
+        print(json.dumps(record, default=str), flush=True)
+
+    if failed:
+        print(f"{failed} part(s) failed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
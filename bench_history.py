@@ -0,0 +1,199 @@
+"""
+Advent of code, 2018
+Benchmark history: saved benchmark runs and a regression check between two of them
+
+A record is one benchmark.py run, saved as JSON: when and where (machine fingerprint, commit) it ran,
+and the results (timings, peak memory, input sizes). Records go to .cache/bench_history/ by default.
+
+compare matches the measurements of two records by (day, part, size) and flags the ones that got slower
+than the threshold allows. The exit code is 1 if something regressed, so it can be used as a gate.
+
+Usage:
+    python benchmark.py 15 17 --save                         # run and save a record
+    python bench_history.py list
+    python bench_history.py compare BASELINE [CURRENT] --threshold 0.2
+      (CURRENT defaults to the latest saved record)
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+import puzzles
+
+HISTORY_DIR = os.path.join(puzzles.HERE, ".cache", "bench_history")
+
+# measurements faster than this are mostly noise, they are not flagged
+MIN_WALL_S = 0.01
+
+
+class Regression(NamedTuple):
+    day: int
+    part: int
+    size: int
+    baseline_wall_s: float
+    current_wall_s: float  # inf if the part timed out
+
+    @property
+    def ratio(self) -> float:
+        return self.current_wall_s / self.baseline_wall_s
+
+
+def machine_fingerprint() -> Dict[str, Any]:
+    return {
+        "hostname": platform.node(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+    }
+
+
+def git_commit() -> Dict[str, Any]:
+    """
+    the commit the benchmark ran on, and whether there were uncommitted changes
+    """
+    def git(*args: str) -> str:
+        return subprocess.run(["git", *args], cwd=puzzles.HERE, capture_output=True, text=True, check=True).stdout.strip()
+
+    try:
+        return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+    except (OSError, subprocess.CalledProcessError):  # no git, or not a repository
+        return {"commit": None, "dirty": None}
+
+
+def make_record(results: List[NamedTuple], settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    results: the BenchResults of a run, settings: the benchmark arguments (timeout, seed)
+    """
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": machine_fingerprint(),
+        **git_commit(),
+        "settings": settings,
+        "results": [result._asdict() for result in results],
+    }
+
+
+def save_record(record: Dict[str, Any], path: str = None) -> str:
+    """
+    saves the record, to the history dir if no path is given. Returns the path
+    """
+    if path is None:
+        commit = (record["commit"] or "nocommit")[:10]
+        path = os.path.join(HISTORY_DIR, f"{record['created'].replace(':', '')}_{commit}.json")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(record, f, indent=1)
+
+    return path
+
+
+def load_record(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def history() -> List[str]:
+    """
+    paths of the saved records, oldest first (the file names start with the creation time)
+    """
+    return sorted(glob.glob(os.path.join(HISTORY_DIR, "*.json")))
+
+
+def _wall_times(record: Dict[str, Any]) -> Dict[Tuple[int, int, int], float]:
+    return {(r["day"], r["part"], r["size"]): float("inf") if r["timed_out"] or r.get("failed") else r["wall_s"]
+            for r in record["results"]}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Regression]:
+    """
+    returns the measurements that are more than threshold (0.2 = 20 %) slower in current than in baseline.
+    Only measurements found in both records are compared. A part that times out now, but did not before, is a regression
+    """
+    base_walls, current_walls = _wall_times(baseline), _wall_times(current)
+
+    regressions = []
+    for key in sorted(base_walls.keys() & current_walls.keys()):
+        base_wall, current_wall = base_walls[key], current_walls[key]
+        if base_wall == float("inf") or max(base_wall, current_wall) < MIN_WALL_S:
+            continue
+        if current_wall > base_wall * (1 + threshold):
+            regressions.append(Regression(*key, baseline_wall_s=base_wall, current_wall_s=current_wall))
+
+    return regressions
+
+
+def fingerprint_differences(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """
+    the machine details that differ. Timings from different machines are not really comparable
+    """
+    return [f"{key}: {baseline['machine'].get(key)} -> {value}"
+            for key, value in current["machine"].items() if baseline["machine"].get(key) != value]
+
+
+def describe(record: Dict[str, Any]) -> str:
+    commit = (record["commit"] or "?")[:10] + (" (dirty)" if record["dirty"] else "")
+    days = sorted({r["day"] for r in record["results"]})
+    return f"{record['created']}  {commit:<18} {record['machine']['hostname']:<20} days {', '.join(map(str, days))}"
+
+
+def format_regressions(regressions: List[Regression]) -> str:
+    lines = [f"{'day':>3} {'part':>4} {'size':>9}  {'baseline s':>10} {'current s':>10} {'ratio':>6}"]
+    for r in regressions:
+        current = "timed out" if r.current_wall_s == float("inf") else f"{r.current_wall_s:.3f}"
+        lines.append(f"{r.day:>3} {r.part:>4} {r.size:>9}  {r.baseline_wall_s:>10.3f} {current:>10} {r.ratio:>6.2f}")
+
+    return "\n".join(lines)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Saved benchmark runs and the regression check")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="list the saved records")
+
+    compare_parser = commands.add_parser("compare", help="flag the parts that got slower than the baseline")
+    compare_parser.add_argument("baseline", help="the baseline record")
+    compare_parser.add_argument("current", nargs="?", help="the record to check (default: the latest saved record)")
+    compare_parser.add_argument("--threshold", type=float, default=0.2,
+                                help="allowed slowdown, as a fraction of the baseline wall time (default 0.2)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for path in history():
+            print(f"{os.path.basename(path)}  {describe(load_record(path))}")
+        return 0
+
+    if args.current is None:
+        if not history():
+            parser.error("no saved records, give the current record explicitly")
+        args.current = history()[-1]
+
+    baseline, current = load_record(args.baseline), load_record(args.current)
+    print(f"baseline: {describe(baseline)}\ncurrent:  {describe(current)}")
+    for difference in fingerprint_differences(baseline, current):
+        print(f"warning: different machine, {difference}")
+
+    regressions = compare(baseline, current, args.threshold)
+    if not regressions:
+        print(f"\nno regressions (threshold {args.threshold:.0%})")
+        return 0
+
+    print(f"\n{len(regressions)} regression(s), threshold {args.threshold:.0%}:")
+    print(format_regressions(regressions))
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
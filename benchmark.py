@@ -0,0 +1,184 @@
+"""
+Advent of code, 2018
+Benchmark suite: how the solutions scale with the input size
+
+For each day, synthetic inputs of increasing size are made with generators.py and every part is solved
+on each of them (in a fresh process, like run.py does). Climbing the size ladder stops at the first size
+where a part runs out of the time budget: the bigger sizes would only take longer.
+
+Usage:
+    python benchmark.py 5 9                    # default size ladders of days 5 and 9
+    python benchmark.py 18 --sizes 10 50 250   # own ladder
+    python benchmark.py all --timeout 10 --json
+    python benchmark.py 15 17 --save          # save the run to the history, see bench_history.py
+"""
+
+import argparse
+import json
+import os
+import time
+from multiprocessing import get_context
+from typing import List, NamedTuple, Optional
+
+import bench_history
+import generators
+import puzzles
+import run
+
+INPUTS_DIR = os.path.join(puzzles.HERE, ".cache", "bench_inputs")
+
+
+class BenchResult(NamedTuple):
+    day: int
+    part: int
+    size: int
+    input_bytes: int
+    answer: Optional[str]  # None if the part timed out or failed
+    wall_s: Optional[float]
+    cpu_s: Optional[float]
+    peak_rss_kb: Optional[int]
+    timed_out: bool
+    failed: bool = False  # the process died without a result (crash, out of memory)
+
+
+class PartFailed(RuntimeError):
+    pass
+
+
+def write_input(day: int, size: int, seed: int = 0) -> str:
+    """
+    generates the input (unless already generated), returns the path of the input file
+    """
+    path = os.path.join(INPUTS_DIR, f"day{day:02}_size{size}_seed{seed}.txt")
+    if not os.path.exists(path):
+        os.makedirs(INPUTS_DIR, exist_ok=True)
+        with open(path, "w") as f:
+            f.write(generators.generate(day, size, seed))
+
+    return path
+
+
+def _measure_into(conn, day: int, part: int, input_path: str, repeat: int):
+    # the generated inputs are not worth keeping in the parse cache
+    conn.send(run.measure_part(day, part, input_path, repeat, use_cache=False))
+    conn.close()
+
+
+def measure_with_timeout(day: int, part: int, input_path: str, timeout: float,
+                         repeat: int = 1) -> Optional[run.PartResult]:
+    """
+    solves the part (repeat times) in a fresh process. Returns None if it did not finish in timeout seconds,
+    raises PartFailed if the process died
+    """
+    ctx = get_context("spawn")
+    receiver, sender = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_measure_into, args=(sender, day, part, input_path, repeat))
+    proc.start()
+    sender.close()
+
+    try:
+        result = receiver.recv() if receiver.poll(timeout) else None
+    except (EOFError, OSError):  # the process died before sending anything
+        proc.join()
+        raise PartFailed(f"Day {day} part {part} died on {input_path} (exit code {proc.exitcode})") from None
+
+    if result is None:
+        proc.terminate()
+    proc.join()
+
+    return result
+
+
+def bench_day(day: int, sizes: List[int], parts: List[int], timeout: float, seed: int = 0,
+              repeat: int = 1) -> List[BenchResult]:
+    results = []
+    for size in sizes:
+        input_path = write_input(day, size, seed)
+        input_bytes = os.path.getsize(input_path)
+
+        give_up = False  # a part timed out or failed at this size: no use climbing higher
+        for part in parts:
+            try:
+                r = measure_with_timeout(day, part, input_path, timeout, repeat)
+            except PartFailed:
+                results.append(BenchResult(day, part, size, input_bytes, None, None, None, None, timed_out=False,
+                                           failed=True))
+                give_up = True
+                continue
+
+            if r is None:
+                results.append(BenchResult(day, part, size, input_bytes, None, None, None, None, timed_out=True))
+                give_up = True
+            else:
+                results.append(BenchResult(day, part, size, input_bytes, str(r.answer), r.wall_s, r.cpu_s,
+                                           r.peak_rss_kb, timed_out=False))
+
+        if give_up:
+            break
+
+    return results
+
+
+def format_table(results: List[BenchResult]) -> str:
+    lines = [f"{'day':>3} {'part':>4} {'size':>9} {'input kB':>9}  {'wall s':>9} {'cpu s':>9} {'peak RSS MB':>11}"]
+    for r in results:
+        if r.failed:
+            lines.append(f"{r.day:>3} {r.part:>4} {r.size:>9} {r.input_bytes / 1024:>9.1f}  failed (the process died)")
+        elif r.timed_out:
+            lines.append(f"{r.day:>3} {r.part:>4} {r.size:>9} {r.input_bytes / 1024:>9.1f}  timed out")
+        else:
+            lines.append(f"{r.day:>3} {r.part:>4} {r.size:>9} {r.input_bytes / 1024:>9.1f}  "
+                         f"{r.wall_s:>9.3f} {r.cpu_s:>9.3f} {r.peak_rss_kb / 1024:>11.1f}")
+
+    return "\n".join(lines)
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Time the solutions on synthetic inputs of increasing size")
+    parser.add_argument("days", nargs="+", help='days to benchmark: numbers, ranges like 9-11, or "all"')
+    parser.add_argument("--sizes", type=int, nargs="+", help="input sizes (default: the ladder of the day in generators.py)")
+    parser.add_argument("--part", type=int, choices=puzzles.PARTS, help="benchmark only this part")
+    parser.add_argument("--timeout", type=float, default=60, help="time budget per part and size, seconds")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the input generators")
+    parser.add_argument("--repeat", type=int, default=1, help="solve each part N times, report the best wall time")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per measurement instead of a table")
+    parser.add_argument("--save", nargs="?", const="", metavar="PATH",
+                        help="save the run as a history record (default: to .cache/bench_history/)")
+    return parser
+
+
+def main(argv: List[str] = None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        days = run.parse_days(args.days)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    start = time.perf_counter()
+    results = []
+    for day in days:
+        parts = [part for part in puzzles.available_parts(day) if args.part is None or part == args.part]
+        results.extend(bench_day(day, args.sizes or generators.DEFAULT_SIZES[day], parts, args.timeout, args.seed,
+                                 args.repeat))
+
+    if args.json:
+        for result in results:
+            print(json.dumps(result._asdict()))
+    else:
+        print(format_table(results))
+        print(f"\ntotal wall time {time.perf_counter() - start:.3f} s")
+
+    if args.save is not None:
+        settings = {"timeout": args.timeout, "seed": args.seed, "repeat": args.repeat}
+        record = bench_history.make_record(results, settings)
+        path = bench_history.save_record(record, args.save or None)
+        if not args.json:
+            print(f"saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
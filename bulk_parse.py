@@ -0,0 +1,50 @@
+"""
+Advent of code, 2018
+Bulk parsing of numeric inputs: the numbers of the whole text into one typed numpy array, no regex or object per line
+
+Everything that is not part of a number is turned into a space, and numpy reads the numbers in one go:
+    claims = int_array(text, columns=5)   # "#1 @ 1,3: 4x4" -> [1, 1, 3, 4, 4], one row per claim
+Letters that carry information are first replaced by numbers, e.g. the axis of the day 17 veins:
+    veins = int_array(text, columns=5, replacements=(("x=", " 0 "), ("y=", " 1 ")))
+"""
+
+import warnings
+from typing import Any, Iterable, Sequence, Tuple
+
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+# digits and minus signs are kept, any other ASCII character becomes a space
+NUMBER_CHARS = "0123456789-"
+_TO_SPACES = {code: " " for code in range(128) if chr(code) not in NUMBER_CHARS}
+
+
+def int_array(text: str, columns: int, dtype: str = "int32",
+              replacements: Sequence[Tuple[str, str]] = ()) -> "np.ndarray":
+    """
+    returns the numbers of the text as an (N, columns) array. Raises ValueError if the text has something
+    that does not read as a number (e.g. a stray "-"), or if the numbers do not fill whole rows
+    """
+    for old, new in replacements:
+        text = text.replace(old, new)
+
+    with warnings.catch_warnings():
+        # numpy only warns when it stops at something that is not a number
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            numbers = np.fromstring(text.translate(_TO_SPACES), dtype=dtype, sep=" ")
+        except DeprecationWarning as e:
+            raise ValueError(f"Unexpected input: {e}") from None
+
+    if numbers.size % columns:
+        raise ValueError(f"Unexpected input: {numbers.size} numbers do not make rows of {columns}")
+
+    return numbers.reshape(-1, columns)
+
+
+def rows_to_array(rows: Iterable[Sequence[Any]], columns: int, dtype: str = "int32") -> "np.ndarray":
+    """
+    collects the rows (e.g. the records of streaming.py) into an (N, columns) array
+    """
+    return np.array(list(rows), dtype=dtype).reshape(-1, columns)
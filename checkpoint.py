@@ -0,0 +1,117 @@
+"""
+Advent of code, 2018
+Checkpoints of the long simulations: the state is saved to disk every N steps, so that a killed run can resume
+
+Each simulation that can resume has a checkpoint store, off by default:
+    checkpoints = checkpoint.store("day09", every=1_000_000)   # default N, in the steps of the simulation
+When it starts, it continues from the saved state if there is one, and in its main loop it saves its
+state every checkpoints.every steps, behind a check of the flag like the progress channels:
+    saved = checkpoints.load(key) if checkpoints.enabled else None
+    ...
+    if checkpoints.enabled and step % checkpoints.every == 0: checkpoints.save(key, state)
+The key tells the runs of the simulation apart (e.g. "455 players, 7122300 marbles"), the job set by the runner
+(day, part and input hash) the runs of different inputs. The state is pickled and zlib compressed, and written
+with a rename: a run killed while saving leaves the previous checkpoint intact.
+
+run.py --checkpoint saves checkpoints, --resume also continues from them. The checkpoints of a part are
+removed when the part finishes.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from lazy_import import lazy_import
+
+# the day modules import this at load time, and most runs never save a checkpoint
+hashlib = lazy_import("hashlib")
+pickle = lazy_import("pickle")
+shutil = lazy_import("shutil")
+zlib = lazy_import("zlib")
+
+# found here rather than through the runner's puzzles.py, which the day modules should not import
+CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "checkpoints")
+COMPRESS_LEVEL = 1  # fast: the states are mostly big arrays of small numbers, they compress well anyway
+
+_stores: Dict[str, "Store"] = {}
+_settings = {"job": None, "every": None, "resume": False, "directory": CHECKPOINT_DIR}
+
+
+class Store():
+    """
+    the checkpoints of one simulation, in the directory of the current job
+    """
+    def __init__(self, name: str, every: int):
+        self.name = name
+        self.default_every = every
+        self.every = every
+        self.enabled = False
+
+    def __repr__(self):
+        return f"<checkpoint store {self.name} ({'on' if self.enabled else 'off'}, every {self.every})>"
+
+    def path(self, key: str) -> str:
+        key_hash = hashlib.sha256(key.encode()).hexdigest()[:16]
+        return os.path.join(_settings["directory"], _settings["job"], f"{self.name}_{key_hash}.ckpt")
+
+    def save(self, key: str, state: Any):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), COMPRESS_LEVEL)
+
+        # write + rename: the old checkpoint stays until the new one is complete
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def load(self, key: str) -> Optional[Any]:
+        """
+        the saved state, None if there is none (or if not resuming)
+        """
+        if not _settings["resume"]:
+            return None
+        try:
+            with open(self.path(key), "rb") as f:
+                return pickle.loads(zlib.decompress(f.read()))
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+
+def store(name: str, every: int) -> Store:
+    """
+    returns the checkpoint store of the given name, created on first use
+    """
+    if name not in _stores:
+        _stores[name] = Store(name, every)
+        _apply(_stores[name])
+
+    return _stores[name]
+
+
+def _apply(s: Store):
+    s.enabled = _settings["job"] is not None
+    s.every = _settings["every"] or s.default_every
+
+
+def enable(job: str, every: int = None, resume: bool = False, directory: str = CHECKPOINT_DIR):
+    """
+    turns the checkpoints on for the job (e.g. "day09_part2_<input hash>"). every overrides the default
+    interval of every store. With resume, the simulations continue from the saved states
+    """
+    _settings.update(job=job, every=every, resume=resume, directory=directory)
+    for s in _stores.values():
+        _apply(s)
+
+
+def disable():
+    _settings.update(job=None, every=None, resume=False)
+    for s in _stores.values():
+        _apply(s)
+
+
+def clear_job():
+    """
+    removes the checkpoints of the current job
+    """
+    if _settings["job"] is not None:
+        shutil.rmtree(os.path.join(_settings["directory"], _settings["job"]), ignore_errors=True)
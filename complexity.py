@@ -0,0 +1,280 @@
+"""
+Advent of code, 2018
+Empirical complexity: growth exponents of the solver functions
+
+Each entry point is run on a geometric ladder of synthetic input sizes (generators.py). Every size runs
+in a fresh process: once for the wall time, once under tracemalloc for the peak memory allocated by the call.
+A straight line is fitted to log(time) vs log(size), and to log(memory) vs log(size). Its slope is
+the growth exponent: ~1 linear, ~2 quadratic, ... Entry points whose time grows super-linearly are flagged.
+
+The exponents are empirical: they hold over the measured sizes, with the generated inputs.
+
+Usage:
+    python complexity.py                               # the entry points listed in ENTRY_POINTS
+    python complexity.py reduce_polymer --steps 7
+    python complexity.py day9.part2 day18.part1        # parts, on the inputs of generators.py
+    python complexity.py parts --timeout 10            # every part of every day
+"""
+
+import argparse
+import contextlib
+import io
+import math
+import time
+import tracemalloc
+from multiprocessing import get_context
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+
+import generators
+import puzzles
+
+# an exponent this much above 1 is reported as super-linear
+SUPERLINEAR_MARGIN = 0.2
+
+# measurements below these are mostly noise (timer resolution, allocator), left out of the fits
+MIN_WALL_S = 0.001
+MIN_PEAK_BYTES = 10_000
+
+
+class EntryPoint(NamedTuple):
+    day: int
+    setup: Callable[[int, int], Callable[[], Any]]  # (size, seed) -> the call to measure, inputs ready
+    first_size: int  # smallest size of the ladder
+    size_unit: str
+
+
+class Point(NamedTuple):
+    size: int
+    wall_s: Optional[float]  # None if timed out or failed
+    peak_bytes: Optional[int]
+    failed: bool = False  # the process died without a result (crash, out of memory)
+
+
+class Growth(NamedTuple):
+    name: str
+    points: List[Point]
+    time_exponent: Optional[float]  # None if there are too few usable points to fit
+    memory_exponent: Optional[float]
+
+
+def _puzzle(day: int, size: int, seed: int) -> Any:
+    return puzzles.load_module(day).parse_puzzle(generators.generate(day, size, seed))
+
+
+def _reduce_polymer(size: int, seed: int) -> Callable[[], Any]:
+    day05 = puzzles.load_module(5)
+    polymer = _puzzle(5, size, seed)
+    return lambda: day05.reduce_polymer(polymer)
+
+
+def _get_nearests_grid(size: int, seed: int) -> Callable[[], Any]:
+    day06 = puzzles.load_module(6)
+    points = _puzzle(6, size, seed)
+    return lambda: day06.get_nearests_grid(points)
+
+
+def _find_max_total_power_square(size: int, seed: int) -> Callable[[], Any]:
+    # the actual grid is always 300x300, here the size is the side of the grid
+    day11 = puzzles.load_module(11)
+    cell_powers = day11.get_cell_powers(_puzzle(11, size, seed), x_max=size, y_max=size)
+    return lambda: day11.find_max_total_power_square(cell_powers)
+
+
+def _plantation_evolve(size: int, seed: int) -> Callable[[], Any]:
+    day12 = puzzles.load_module(12)
+    plantation = day12.Plantation(*_puzzle(12, size, seed))
+    return lambda: plantation.evolve(day12.NUM_GENERATIONS)
+
+
+def _parse_route(size: int, seed: int) -> Callable[[], Any]:
+    day20 = puzzles.load_module(20)
+    regex = _puzzle(20, size, seed)
+    return lambda: day20.parse(regex)
+
+
+def _part(day: int, part: int) -> Callable[[int, int], Callable[[], Any]]:
+    def setup(size: int, seed: int) -> Callable[[], Any]:
+        solver = puzzles.get_solver(day, part)
+        puzzle = _puzzle(day, size, seed)
+        return lambda: solver(puzzle)
+
+    return setup
+
+
+ENTRY_POINTS = {
+    "reduce_polymer": EntryPoint(5, _reduce_polymer, 2_000, "polymer units"),
+    "get_nearests_grid": EntryPoint(6, _get_nearests_grid, 10, "coordinates"),
+    "find_max_total_power_square": EntryPoint(11, _find_max_total_power_square, 10, "grid side"),
+    "Plantation.evolve": EntryPoint(12, _plantation_evolve, 100, "pots (20 generations)"),
+    "parse": EntryPoint(20, _parse_route, 1_000, "directions in the regex"),
+}
+
+
+def part_entry_point(name: str) -> EntryPoint:
+    """
+    entry point for "dayN.partP": the part, on the generated inputs of the day
+    """
+    day_spec, part_spec = name.split(".")
+    day, part = int(day_spec[len("day"):]), int(part_spec[len("part"):])
+    if part not in puzzles.available_parts(day):
+        raise ValueError(f"No solution for day {day} part {part}")
+
+    return EntryPoint(day, _part(day, part), generators.DEFAULT_SIZES[day][0], generators.SIZE_UNITS[day])
+
+
+def get_entry_point(name: str) -> EntryPoint:
+    if name in ENTRY_POINTS:
+        return ENTRY_POINTS[name]
+    if name.startswith("day") and ".part" in name:
+        return part_entry_point(name)
+
+    raise ValueError(f"Unknown entry point {name}, known ones: {', '.join(ENTRY_POINTS)} and dayN.partP")
+
+
+def _measure_into(conn, name: str, size: int, seed: int):
+    entry_point = get_entry_point(name)
+
+    # progress prints of the solutions are not wanted here
+    with contextlib.redirect_stdout(io.StringIO()):
+        call = entry_point.setup(size, seed)
+        start = time.perf_counter()
+        call()
+        wall_s = time.perf_counter() - start
+
+        # again with fresh inputs (the call may have changed them), now tracing the allocations
+        call = entry_point.setup(size, seed)
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        call()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    conn.send((wall_s, peak_bytes))
+    conn.close()
+
+
+def measure(name: str, size: int, seed: int, timeout: float) -> Point:
+    """
+    runs the entry point in a fresh process. Wall time and peak are None if it did not finish in timeout seconds
+    (the timeout covers both runs), or if the process died (then the point is failed)
+    """
+    ctx = get_context("spawn")
+    receiver, sender = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_measure_into, args=(sender, name, size, seed))
+    proc.start()
+    sender.close()
+
+    try:
+        result = receiver.recv() if receiver.poll(timeout) else (None, None)
+    except (EOFError, OSError):  # the process died before sending anything
+        proc.join()
+        return Point(size, None, None, failed=True)
+
+    if result[0] is None:
+        proc.terminate()
+    proc.join()
+
+    return Point(size, *result)
+
+
+def fit_exponent(sizes: List[float], values: List[float]) -> Optional[float]:
+    """
+    least squares slope of log(value) vs log(size). None if there are less than 3 points
+    """
+    if len(sizes) < 3:
+        return None
+
+    xs, ys = [math.log(size) for size in sizes], [math.log(value) for value in values]
+    x_mean, y_mean = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxx = sum((x - x_mean) ** 2 for x in xs)
+    sxy = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+
+    return sxy / sxx
+
+
+def growth(name: str, steps: int = 6, ratio: float = 2, timeout: float = 30, seed: int = 0) -> Growth:
+    """
+    measures the entry point over the ladder first_size * ratio**i, i < steps. Stops climbing at the first timeout
+    or failure
+    """
+    entry_point = get_entry_point(name)
+
+    points = []
+    for i in range(steps):
+        point = measure(name, round(entry_point.first_size * ratio ** i), seed, timeout)
+        points.append(point)
+        if point.wall_s is None:
+            break
+
+    timed = [(p.size, p.wall_s) for p in points if p.wall_s is not None and p.wall_s >= MIN_WALL_S]
+    allocated = [(p.size, p.peak_bytes) for p in points if p.peak_bytes is not None and p.peak_bytes >= MIN_PEAK_BYTES]
+
+    return Growth(name, points, fit_exponent(*zip(*timed)) if timed else None,
+                  fit_exponent(*zip(*allocated)) if allocated else None)
+
+
+def classify(exponent: Optional[float]) -> str:
+    if exponent is None:
+        return "?"
+    if exponent <= 1 + SUPERLINEAR_MARGIN:
+        return "linear or better"
+
+    return f"SUPER-LINEAR (~n^{exponent:.2f})"
+
+
+def format_growth(g: Growth, unit: str) -> str:
+    lines = [f"{g.name}  (size: {unit})"]
+    for p in g.points:
+        if p.failed:
+            lines.append(f"  {p.size:>9}  failed (the process died)")
+        elif p.wall_s is None:
+            lines.append(f"  {p.size:>9}  timed out")
+        else:
+            lines.append(f"  {p.size:>9}  {p.wall_s:>9.4f} s  {p.peak_bytes / 1024:>10.1f} kB")
+
+    def exponent(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:.2f}"
+
+    lines.append(f"  time exponent {exponent(g.time_exponent)}: {classify(g.time_exponent)}")
+    lines.append(f"  memory exponent {exponent(g.memory_exponent)}: {classify(g.memory_exponent)}")
+
+    return "\n".join(lines)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Estimate the growth exponents of solver functions")
+    parser.add_argument("names", nargs="*",
+                        help='entry points (default: all in ENTRY_POINTS), dayN.partP, or "parts" for every part')
+    parser.add_argument("--steps", type=int, default=6, help="number of sizes in the ladder")
+    parser.add_argument("--ratio", type=float, default=2, help="ratio of consecutive sizes")
+    parser.add_argument("--timeout", type=float, default=30, help="time budget per size, seconds")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the input generators")
+    args = parser.parse_args(argv)
+
+    names = []
+    for name in args.names or list(ENTRY_POINTS):
+        if name == "parts":
+            names.extend(f"day{day}.part{part}" for day in puzzles.DAY_MODULES for part in puzzles.available_parts(day))
+        else:
+            names.append(name)
+
+    try:
+        entry_points = [get_entry_point(name) for name in names]
+    except ValueError as e:
+        parser.error(str(e))
+
+    flagged: List[Tuple[str, float]] = []
+    for name, entry_point in zip(names, entry_points):
+        g = growth(name, args.steps, args.ratio, args.timeout, args.seed)
+        print(format_growth(g, entry_point.size_unit), end="\n\n", flush=True)
+        if g.time_exponent is not None and g.time_exponent > 1 + SUPERLINEAR_MARGIN:
+            flagged.append((name, g.time_exponent))
+
+    if flagged:
+        print("super-linear time: " + ", ".join(f"{name} (~n^{exponent:.2f})" for name, exponent in flagged))
+    else:
+        print("no super-linear time found")
+
+
+if __name__ == "__main__":
+    main()
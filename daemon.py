@@ -0,0 +1,256 @@
+"""
+Advent of code, 2018
+Solver daemon: keeps the day modules loaded and answers solve requests, JSON lines over stdin/stdout or a Unix socket
+
+Every run of a script pays the interpreter startup, the imports (numpy, networkx) and cold caches.
+The daemon pays them once. Requests, one JSON object per line:
+    {"day": 14, "part": 1}                              the default input of the day
+    {"day": 14, "part": 1, "input": "540561"}           the input text
+    {"day": 17, "part": 2, "path": "scans/a.txt"}       an input file
+    {"cmd": "stats"}                                    what is kept warm, and how often it was hit
+    {"cmd": "shutdown"}
+An "id" in a request is copied to its response. Responses, one per request:
+    {"id": 1, "day": 14, "part": 1, "answer": "3610281143", "solve_s": 0.0001, "memo": true}
+    {"id": 2, "error": "ValueError: No solution for day 25"}
+
+Kept warm between requests:
+    - the day modules and their lazily imported libraries
+    - parsed puzzles and answers, by the SHA-256 of the input text (least recently used dropped first)
+    - day 11 cell power tables, by the grid serial number
+    - the day 14 scoreboard: it only grows, a query creates just the recipes that are not there yet
+
+Usage:
+    python daemon.py serve                                # JSON lines in stdin, out stdout
+    python daemon.py serve --socket .cache/daemon.sock
+    python daemon.py ask 14 1 --text 540561 --socket .cache/daemon.sock
+"""
+
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import time
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple
+
+import puzzles
+from lazy_import import LazyModule
+
+SOCKET_PATH = os.path.join(puzzles.HERE, ".cache", "daemon.sock")
+MAX_ENTRIES = 256  # parsed puzzles and answers kept, each
+
+
+def _remember(entries: OrderedDict, key, value, max_entries: int):
+    entries[key] = value
+    entries.move_to_end(key)
+    while len(entries) > max_entries:
+        entries.popitem(last=False)
+
+
+class WarmSolver():
+    """
+    solves (day, part, input text) requests, keeping the state that can be reused between them
+    """
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.parsed = OrderedDict()  # (day, input hash) -> parsed puzzle
+        self.answers = OrderedDict()  # (day, part, input hash) -> answer
+        self.stats = Counter()
+        self.stopped = False
+
+        # day specific warm state, used by the warm solvers below instead of the plain part functions
+        self.cell_powers = lru_cache(maxsize=16)(puzzles.load_module(11).get_cell_powers)
+        self.scoreboard = puzzles.load_module(14).GrowingScoreboard()
+        self.warm_solvers: Dict[Tuple[int, int], Callable[[Any], Any]] = {
+            (11, 1): self._day11_part1,
+            (11, 2): self._day11_part2,
+            (14, 1): self.scoreboard.scores_after,
+            (14, 2): lambda num_recipes: self.scoreboard.num_recipes_before(str(num_recipes)),
+        }
+
+    def preload(self):
+        """
+        imports every day module and the libraries they import lazily
+        """
+        for day in puzzles.DAY_MODULES:
+            module = puzzles.load_module(day)
+            for value in list(vars(module).values()):
+                if isinstance(value, LazyModule):
+                    importlib.import_module(value.__name__)
+
+    def _day11_part1(self, grid_serial_num: int) -> str:
+        (x, y), _ = puzzles.load_module(11).find_max_power_square(cell_powers=self.cell_powers(grid_serial_num))
+        return f"{x},{y}"
+
+    def _day11_part2(self, grid_serial_num: int) -> str:
+        (x, y, square_size), _ = puzzles.load_module(11).find_max_total_power_square(
+            cell_powers=self.cell_powers(grid_serial_num))
+        return f"{x},{y},{square_size}"
+
+    def puzzle(self, day: int, text: str, text_hash: str) -> Any:
+        key = (day, text_hash)
+        if key in self.parsed:
+            self.stats["parsed hits"] += 1
+            self.parsed.move_to_end(key)
+            return self.parsed[key]
+
+        puzzle = puzzles.parse_text(day, text)
+        _remember(self.parsed, key, puzzle, self.max_entries)
+        return puzzle
+
+    def solve(self, day: int, part: int, text: str) -> Tuple[Any, bool]:
+        """
+        returns (answer, whether it was remembered from an earlier request)
+        """
+        text_hash = puzzles.text_hash(text)
+        key = (day, part, text_hash)
+        if key in self.answers:
+            self.stats["answer hits"] += 1
+            self.answers.move_to_end(key)
+            return self.answers[key], True
+
+        solver = self.warm_solvers.get((day, part)) or puzzles.get_solver(day, part)
+        # stdout may be the channel of the responses, anything the solutions print goes to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            answer = solver(self.puzzle(day, text, text_hash))
+
+        self.stats["solved"] += 1
+        _remember(self.answers, key, answer, self.max_entries)
+        return answer, False
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        response = {"id": request["id"]} if "id" in request else {}
+        self.stats["requests"] += 1
+
+        try:
+            cmd = request.get("cmd", "solve")
+            if cmd == "stats":
+                response.update(parsed=len(self.parsed), answers=len(self.answers),
+                                scoreboard_recipes=len(self.scoreboard), **self.stats)
+            elif cmd == "shutdown":
+                self.stopped = True
+                response["stopped"] = True
+            elif cmd == "solve":
+                day, part = int(request["day"]), int(request["part"])
+                text = request["input"] if "input" in request else puzzles.read_text(day, request.get("path"))
+                start = time.perf_counter()
+                answer, memo = self.solve(day, part, text)
+                response.update(day=day, part=part, answer=answer, solve_s=time.perf_counter() - start, memo=memo)
+            else:
+                raise ValueError(f"Unknown command {cmd}")
+        except Exception as e:  # the daemon keeps serving, the error goes to the client
+            self.stats["errors"] += 1
+            response["error"] = f"{type(e).__name__}: {e}"
+
+        return response
+
+    def handle_line(self, line: str) -> str:
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("a request is a JSON object")
+        except ValueError as e:
+            return json.dumps({"error": f"Bad request: {e}"})
+
+        return json.dumps(self.handle(request), default=str)
+
+
+def serve_stdio(solver: WarmSolver, stdin=sys.stdin, stdout=sys.stdout):
+    for line in stdin:
+        if not line.strip():
+            continue
+        stdout.write(solver.handle_line(line) + "\n")
+        stdout.flush()
+        if solver.stopped:
+            break
+
+
+def serve_socket(solver: WarmSolver, path: str = SOCKET_PATH):
+    """
+    serves the connections one at a time (the solutions are not thread safe), until a shutdown request
+    """
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                self.wfile.write((solver.handle_line(line.decode()) + "\n").encode())
+                if solver.stopped:
+                    break
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)  # left behind by an earlier daemon
+
+    with socketserver.UnixStreamServer(path, Handler) as server:
+        print(f"Serving on {path}", file=sys.stderr)
+        try:
+            while not solver.stopped:
+                server.handle_request()
+        finally:
+            os.remove(path)
+
+
+def ask(request: Dict[str, Any], path: str = SOCKET_PATH) -> Dict[str, Any]:
+    """
+    sends one request to the daemon listening on the socket, returns the response
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        with sock.makefile("rwb") as f:
+            f.write((json.dumps(request) + "\n").encode())
+            f.flush()
+            return json.loads(f.readline())
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="answer requests until a shutdown request (or the end of stdin)")
+    serve_parser.add_argument("--socket", nargs="?", const=SOCKET_PATH, default=None,
+                              help=f"listen on a Unix socket (default {SOCKET_PATH}) instead of stdin/stdout")
+    serve_parser.add_argument("--no-preload", action="store_true", help="import the day modules on first use")
+
+    ask_parser = commands.add_parser("ask", help="send a request to a daemon listening on a socket")
+    ask_parser.add_argument("day", nargs="?", type=int)
+    ask_parser.add_argument("part", nargs="?", type=int)
+    ask_parser.add_argument("--text", help="the input text (default: the default input of the day)")
+    ask_parser.add_argument("--input", help="path of the input file")
+    ask_parser.add_argument("--cmd", default="solve", choices=["solve", "stats", "shutdown"])
+    ask_parser.add_argument("--socket", default=SOCKET_PATH)
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    if args.command == "serve":
+        solver = WarmSolver()
+        if not args.no_preload:
+            solver.preload()
+        if args.socket:
+            serve_socket(solver, args.socket)
+        else:
+            serve_stdio(solver)
+
+    else:
+        request = {"cmd": args.cmd}
+        if args.cmd == "solve":
+            if args.day is None or args.part is None:
+                raise SystemExit("ask: give the day and the part")
+            request.update(day=args.day, part=args.part)
+            if args.text is not None:
+                request["input"] = args.text
+            elif args.input:
+                request["path"] = os.path.abspath(args.input)
+        print(json.dumps(ask(request, args.socket)))
+
+
+if __name__ == "__main__":
+    main()
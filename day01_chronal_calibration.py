@@ -3,38 +3,250 @@ Advent of code, 2018
 Day 01 chronal calibration
 """
 
-# Part 1:
-with open("data/day01.txt") as f:
-    changes = [int(line.strip()) for line in f]
-    
-print(sum(changes))
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Tuple
+
+INPUT_FILE = "data/day01.txt"
+
+STREAMING_PARTS = (1,)  # parts that take the changes in one pass (see streaming.py)
+
+# the original implementations kept next to the faster ones, see equivalence.py
+REFERENCE_IMPLEMENTATIONS = {"first_repeat_freq": "first_repeat_freq_reference"}
+
+
+def parse_line(line: str) -> int:
+    return int(line)
+
+
+def parse_puzzle(text: str) -> List[int]:
+    """
+    returns the frequency changes, one int per line
+    """
+    return [parse_line(line.strip()) for line in text.splitlines() if line.strip()]
 
 
 # Part 2:
-def first_repeat_freq(numbers):
+
+# A set of ints takes some 60 bytes (~500 bits) per frequency. The bitmap is only used while it takes at most
+# this many bits per frequency; over a wider range of frequencies the set is smaller
+MAX_BITMAP_BITS_PER_FREQ = 256
+
+
+class FrequencyBitmap():
+    """
+    set of the frequencies between lo and hi, one bit per frequency (offset by lo, so negative ones fit).
+    Its size is set by the range, not by the number of frequencies, see MAX_BITMAP_BITS_PER_FREQ
+    """
+    __slots__ = ("lo", "bits")
+
+    def __init__(self, lo: int, hi: int):
+        self.lo = lo
+        self.bits = bytearray((hi - lo) // 8 + 1)
+
+    def __contains__(self, freq: int) -> bool:
+        i = freq - self.lo
+        return self.bits[i >> 3] >> (i & 7) & 1 == 1
+
+    def add(self, freq: int):
+        i = freq - self.lo
+        self.bits[i >> 3] |= 1 << (i & 7)
+
+
+def first_repeat_freq(numbers: List[int], bitmap: bool = False) -> int:
+    """
+    Returns the first encountered repeating frequency, as if the list was looped over as many times as needed.
+    Only one pass: after the first one, each pass just shifts the frequencies of the first pass by the total drift.
+    With bitmap, the first pass keeps the frequencies seen in a FrequencyBitmap instead of a set, if the range
+    of the frequencies is narrow enough for it to be the smaller one. It saves memory, not time: the bit
+    operations in Python are slower than a set lookup, and the bounds need the whole first pass up front
+    """
+    # the first pass as is. Without drift, a frequency always repeats here (at the latest the 0 at the end)
+    first_pass = list(accumulate(numbers)) if bitmap else None  # the frequency after each change
+    if bitmap and first_pass and (max(0, max(first_pass)) - min(0, min(first_pass))
+                                  < MAX_BITMAP_BITS_PER_FREQ * len(first_pass)):
+        lo = min(0, min(first_pass))
+        bits = FrequencyBitmap(lo, max(0, max(first_pass))).bits
+        bits[-lo >> 3] |= 1 << (-lo & 7)  # the starting 0
+        for freq in first_pass:  # the bit tests of FrequencyBitmap, inlined
+            i = freq - lo
+            if bits[i >> 3] >> (i & 7) & 1:
+                return freq
+            bits[i >> 3] |= 1 << (i & 7)
+        del bits
+    else:
+        # the set stops at the first repeat, the frequencies are accumulated as they go
+        seen = {0}
+        for freq in first_pass or accumulate(numbers):
+            if freq in seen:
+                return freq
+            seen.add(freq)
+        del seen
+
+    if first_pass is None:  # no repeat within the first pass: all of it is needed from here on
+        first_pass = list(accumulate(numbers))
+    if not first_pass:
+        raise ValueError("No changes, no frequencies")
+
+    lo, hi = min(0, min(first_pass)), max(0, max(first_pass))
+    drift = first_pass[-1]
+
+    # On pass k (first pass k = 0), change i gives the frequency first_pass[i] + k * drift. It repeats when
+    # it reaches a frequency of the first pass, or the starting 0: one with the same remainder modulo the drift,
+    # ahead in the direction of the drift. The nearest one ahead is reached first.
+    # Group by the remainder, sort each group along the drift: the target of a frequency is the next one in its group.
+    # The remainder, the frequency along the drift and the change index are packed into one int per frequency
+    # (one sorted list of ints, not a tuple per frequency)
+    sign = 1 if drift > 0 else -1
+    step = abs(drift)
+    n = len(first_pass)
+    lo_along, span = (lo if sign > 0 else -hi), hi - lo + 1  # frequency along the drift - lo_along: 0..span-1
+    keys = [((freq % step) * span + sign * freq - lo_along) * (n + 1) + i for i, freq in enumerate(first_pass)]
+    keys.append(-lo_along * (n + 1) + n)  # the starting frequency (index n): a target, but not on the way to anything
+    keys.sort()
+
+    first_repeat = None  # (pass, change index, frequency), the smallest is the first in time
+    # each key decoded once, and compared with the one before it (its target, if of the same remainder)
+    prev_pos, prev_i, prev_remainder = None, n, None
+    for key in keys:
+        pos, i = divmod(key, n + 1)  # pos: the remainder and the frequency along the drift
+        remainder = pos // span
+        if prev_i != n and remainder == prev_remainder:
+            passes = (pos - prev_pos) // step
+            if first_repeat is None or passes < first_repeat[0] or (passes == first_repeat[0] and prev_i < first_repeat[1]):
+                first_repeat = (passes, prev_i, sign * (pos - remainder * span + lo_along))
+        prev_pos, prev_i, prev_remainder = pos, i, remainder
+
+    if first_repeat is None:
+        raise ValueError("No frequency ever repeats")
+
+    return first_repeat[2]
+
+
+def first_repeat_freq_reference(numbers):
     """
     Returns the first encountered repeating frequency
     Loops the list over as many times as needed
     """
     freq = 0
     seen = {freq}
-    
+
     # Loop the list many times over if needed
     while True:
         for change in numbers:
             freq += change
-            
+
             if freq in seen:
                 return freq
             else:
                 seen.add(freq)
-                
-        
-print(first_repeat_freq(changes))
 
 
-# Provided unit tests
-assert first_repeat_freq([1, -1]) == 0
-assert first_repeat_freq([3, 3, 4, -2, -4]) == 10
-assert first_repeat_freq([-6, 3, 8, 5, -6]) == 5
-assert first_repeat_freq([7, 7, -2, -7, -4]) == 14
+class FrequencyIndex():
+    """
+    index over the frequencies of the looped changes, for "at which step is frequency F first reached" queries.
+    Step 0 is the start (frequency 0), step t is the frequency after t changes (looping over the list)
+    """
+    def __init__(self, changes: List[int]):
+        self.first_pass = list(accumulate(changes))  # the frequency after each change
+        if not self.first_pass:
+            raise ValueError("No changes, no frequencies")
+        self.num_changes = len(self.first_pass)
+        self.drift = self.first_pass[-1]
+        self.sign = 1 if self.drift >= 0 else -1
+
+        # the first index of each frequency of the first pass
+        self.first_index: Dict[int, int] = {}
+        for i, freq in enumerate(self.first_pass):
+            self.first_index.setdefault(freq, i)
+
+        # Pass k reaches first_pass[i] + k * drift: a frequency is reached from those of the first pass with the
+        # same remainder modulo the drift, behind it along the drift (the nearest one first).
+        # By the remainder: those frequencies along the drift (times sign), sorted, and their first indexes
+        self.groups: Dict[int, Tuple[List[int], List[int]]] = {}
+        if self.drift:
+            for freq, i in sorted(self.first_index.items(), key=lambda item: self.sign * item[0]):
+                along_drift, indexes = self.groups.setdefault(freq % self.drift, ([], []))
+                along_drift.append(self.sign * freq)
+                indexes.append(i)
+
+    def frequency_at(self, step: int) -> int:
+        if step == 0:
+            return 0
+        num_passes, i = divmod(step - 1, self.num_changes)
+        return num_passes * self.drift + self.first_pass[i]
+
+    def first_reached(self, freq: int) -> Optional[int]:
+        """
+        the step at which the frequency is first reached, None if never. O(log n)
+        """
+        if freq == 0:
+            return 0
+
+        if not self.drift:  # every pass is the same as the first one
+            i = self.first_index.get(freq)
+            return None if i is None else i + 1
+
+        group = self.groups.get(freq % self.drift)
+        if group is None:
+            return None
+
+        along_drift, indexes = group
+        pos = bisect_right(along_drift, self.sign * freq) - 1  # the nearest one behind
+        if pos < 0:
+            return None
+
+        num_passes = (self.sign * freq - along_drift[pos]) // abs(self.drift)
+        return num_passes * self.num_changes + indexes[pos] + 1
+
+
+def part1(changes: Iterable[int]) -> int:
+    return sum(changes)
+
+
+def part2(changes: List[int]) -> int:
+    return first_repeat_freq(changes)
+
+
+def run_tests():
+    # Provided unit tests
+    for repeat_freq in (first_repeat_freq, first_repeat_freq_reference):
+        assert repeat_freq([1, -1]) == 0
+        assert repeat_freq([3, 3, 4, -2, -4]) == 10
+        assert repeat_freq([-6, 3, 8, 5, -6]) == 5
+        assert repeat_freq([7, 7, -2, -7, -4]) == 14
+
+    # negative drift, and a repeat of the starting 0 on a later pass
+    assert first_repeat_freq([-3, -3, -4, 2, 4]) == -10
+    assert first_repeat_freq([1, 1, -3]) == first_repeat_freq_reference([1, 1, -3]) == 0
+
+    for changes in ([1, -1], [3, 3, 4, -2, -4], [-6, 3, 8, 5, -6], [7, 7, -2, -7, -4], [-3, -3, -4, 2, 4], [1, 1, -3]):
+        assert first_repeat_freq(changes, bitmap=True) == first_repeat_freq(changes)
+
+        # the indexed queries against the looped changes, 100 steps of them
+        index = FrequencyIndex(changes)
+        first_steps = {}
+        for step in range(100):
+            first_steps.setdefault(index.frequency_at(step), step)
+        for freq in range(-40, 41):
+            if freq in first_steps:
+                assert index.first_reached(freq) == first_steps[freq]
+            else:
+                assert index.first_reached(freq) is None or index.first_reached(freq) >= 100
+
+
+def main():
+    run_tests()
+
+    with open(INPUT_FILE) as f:
+        changes = parse_puzzle(f.read())
+
+    # Part 1:
+    print(part1(changes))
+
+    # Part 2:
+    print(part2(changes))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,38 @@ Day 02 Inventory Management System
 """
 
 from collections import Counter
+from itertools import islice
+from typing import Iterable, List
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+INPUT_FILE = "data/day02.txt"
+
+STREAMING_PARTS = (1, 2)  # parts that take the ids in one pass (see streaming.py)
+
+# the original implementations kept next to the faster ones, see equivalence.py
+REFERENCE_IMPLEMENTATIONS = {"calc_checksum": "calc_checksum_reference"}
+
+CHUNK = 100_000  # ids at a time in the vectorized checksum
+# fewer ids than this are counted one by one: below it, the numpy import alone costs more than the counting
+MIN_VECTORIZED_IDS = 25_000
+
+
+def parse_line(line: str) -> str:
+    return line
+
+
+def parse_puzzle(text: str) -> List[str]:
+    """
+    returns the box ids, one per line
+    """
+    return [parse_line(line.strip()) for line in text.splitlines() if line.strip()]
 
-# Part 1:
-with open("data/day02.txt") as f:
-    ids = [line.strip() for line in f]
-    
-#print(ids[0])
 
-# ...counting the number (of ids) that have an ID containing exactly two of any letter 
-# and then separately counting those with exactly three of any letter. 
+# Part 1:
+# ...counting the number (of ids) that have an ID containing exactly two of any letter
+# and then separately counting those with exactly three of any letter.
 # (does not matter how many times these occur above 0/1 threshold)
 # You can multiply those two counts together to get a rudimentary checksum and compare it to what your device predicts.
 
@@ -20,42 +43,73 @@ def char_counts(word):
     """
     Given a word (str), returns the unique char counts in that word as a set
     """
-    
+
     char_counts = Counter(word)
     return set(char_counts.values())
 
-def calc_checksum(ids):
+def calc_checksum(ids: Iterable[str]) -> int:
+    """
+    calc_checksum_reference in bulk: CHUNK ids at a time as the rows of a uint8 array,
+    the letter counts of all the rows at once. A chunk of less than MIN_VECTORIZED_IDS ids, or with
+    non-ASCII chars (more than one byte per char), is counted one id at a time
     """
-    Returns 
+    num_twos = 0
+    num_threes = 0
+
+    ids = iter(ids)
+    while True:
+        chunk = list(islice(ids, CHUNK))
+        if not chunk:
+            break
+
+        if len(chunk) < MIN_VECTORIZED_IDS or not all(map(str.isascii, chunk)):
+            for id in chunk:
+                ccounts = char_counts(id)
+                num_twos += 2 in ccounts
+                num_threes += 3 in ccounts
+            continue
+
+        # the ids as rows of bytes (shorter ones padded with zero bytes)
+        width = max(map(len, chunk))
+        buffer = b"".join(id.encode("ascii").ljust(width, b"\0") for id in chunk)
+        rows = np.frombuffer(buffer, dtype=np.uint8).reshape(len(chunk), width)
+
+        # number the chars that occur (padding included) 0, 1, 2...: then row i, char c has bin i * num_chars + c,
+        # and one bincount gives the letter counts of every row
+        present = np.flatnonzero(np.bincount(rows.ravel(), minlength=256))
+        char_codes = np.zeros(256, dtype=np.intp)
+        char_codes[present] = np.arange(len(present))
+        bins = char_codes[rows] + np.arange(len(chunk))[:, np.newaxis] * len(present)
+        counts = np.bincount(bins.ravel(), minlength=len(chunk) * len(present)).reshape(len(chunk), len(present))
+        if present[0] == 0:
+            counts[:, 0] = 0  # the padding is not a char
+
+        num_twos += int((counts == 2).any(axis=1).sum())
+        num_threes += int((counts == 3).any(axis=1).sum())
+
+    return num_twos * num_threes
+
+
+def calc_checksum_reference(ids):
+    """
+    Returns
     (num ids with some (one or many) chars occuring exactly twice) * (num ids with some (one or many) chars occuring exactly three times)
     """
     num_twos = 0
     num_threes = 0
-    
+
     for id in ids:
         ccounts = char_counts(id)
-        
+
         if 2 in ccounts:
             num_twos += 1
         if 3 in ccounts:
             num_threes += 1
-        
-    return num_twos * num_threes
 
-# Provided unit tests
-assert calc_checksum([
-    "abcdef",
-    "bababc",
-    "abbcde",
-    "abcccd",
-    "aabcdd",
-    "abcdee",
-    "ababab"
-]) == 12
+    return num_twos * num_threes
 
-print(calc_checksum(ids))
 
-# Part 2:   
+# Part 2:
 # The boxes will have IDs which differ by exactly one character at the same position in both strings
 # What letters are common between the two correct box IDs?
 
@@ -73,25 +127,63 @@ def chars_in_common(ids):
         for i in range(len(id)):
             # for each id, remove each char
             id_one_char_removed = tuple(id[:i] + "_" + id[i+1:])  # tuple splits this str to chars
-            
+
             # increment the count
             ids_with_one_char_removed[id_one_char_removed] = ids_with_one_char_removed.get(id_one_char_removed, 0) + 1
-            
+
             if ids_with_one_char_removed[id_one_char_removed] == 2:
                 return "".join([char for char in id_one_char_removed if char != "_"])
 
 
-print(chars_in_common(ids))
+def part1(ids: Iterable[str]) -> int:
+    return calc_checksum(ids)
+
+
+def part2(ids: Iterable[str]) -> str:
+    return chars_in_common(ids)
+
+
+def run_tests():
+    # Provided unit tests
+    TEST_CHECKSUM_IDS = [
+        "abcdef",
+        "bababc",
+        "abbcde",
+        "abcccd",
+        "aabcdd",
+        "abcdee",
+        "ababab"
+    ]
+    assert calc_checksum(TEST_CHECKSUM_IDS) == 12
+    assert calc_checksum_reference(TEST_CHECKSUM_IDS) == 12
+    assert calc_checksum(["aab", "aabbbc", "ab", "b", "cccc"]) == calc_checksum_reference(["aab", "aabbbc", "ab", "b", "cccc"]) == 2
+    assert calc_checksum(["aé", "éé", "èèè"]) == calc_checksum_reference(["aé", "éé", "èèè"]) == 1
+    many_ids = ["aab", "aabbbc", "ab", "b", "cccc"] * (MIN_VECTORIZED_IDS // 5 + 1)  # vectorized
+    assert calc_checksum(many_ids) == calc_checksum_reference(many_ids)
+    assert calc_checksum(many_ids + ["éé"]) == calc_checksum_reference(many_ids + ["éé"])
+
+    TEST_IDS = [
+        "abcde",
+        "fghij",
+        "klmno",
+        "pqrst",
+        "fguij",
+        "axcye",
+        "wvxyz"
+    ]
+
+    assert chars_in_common(TEST_IDS) == "fgij"
+
+
+def main():
+    run_tests()
+
+    with open(INPUT_FILE) as f:
+        ids = parse_puzzle(f.read())
+
+    print(part1(ids))
+    print(part2(ids))
 
-# Provided unit tests
-TEST_IDS = [
-    "abcde",
-    "fghij",
-    "klmno",
-    "pqrst",
-    "fguij",
-    "axcye",
-    "wvxyz"
-]
 
-assert chars_in_common(TEST_IDS) == "fgij"
+if __name__ == "__main__":
+    main()
@@ -4,94 +4,145 @@ Day 3: No Matter How You Slice It
 """
 
 import re
-from collections import Counter
+from itertools import islice
+from typing import Iterable, Iterator, Tuple
+from lazy_import import lazy_import
+import bulk_parse
+
+np = lazy_import("numpy")
+
+INPUT_FILE = "data/day03.txt"
+
+STREAMING_PARTS = (1,)  # parts that take the claims in one pass (see streaming.py)
+CHUNK = 100_000  # claims at a time, when they are streamed
 
 regex = "#([0-9]+) @ ([0-9]+),([0-9]+): ([0-9]+)x([0-9]+)"  # to grab the data from claim string
 
-class Rectangle():
-    
-    def __init__(self, id, x_lo, y_lo, x_hi, y_hi):
-        self.id = id
-        self.x_lo = x_lo
-        self.y_lo = y_lo
-        self.x_hi = x_hi
-        self.y_hi = y_hi
-    
-    @staticmethod
-    def generate_from_claim(claim):
-        """
-        returns a Rectangle object, generated from a single claim string
-        """
-        id, x_lo, y_lo, width, height = (int(elem) for elem in re.match(regex, claim).groups())
-        return Rectangle(id, x_lo, y_lo, x_lo + width, y_lo + height)
-    
-    def yield_all_squares(self):
-        """
-        generator to yield all inch-by-inch coordinates (squares) of the Rectangle (the upper left corner coordinates of the square, actually)
-        """
-        for x in range(self.x_lo, self.x_hi):
-            for y in range(self.y_lo, self.y_hi):
-                yield(x,y)
-    
-
-def coverage(rectangles):
+# A claim is a row of 5 ints: id, x_lo, y_lo, width, height (e.g. "#1263 @ 488,932: 15x17")
+Claim = Tuple[int, int, int, int, int]
+
+
+def parse_line(line: str) -> Claim:
+    return tuple(int(elem) for elem in re.match(regex, line).groups())
+
+
+def collect_records(claims: Iterable[Claim]) -> "np.ndarray":
+    return bulk_parse.rows_to_array(claims, 5)
+
+
+def parse_puzzle(text: str) -> "np.ndarray":
+    """
+    returns the claims as an (N, 5) array, one row per line
+    data format: #1263 @ 488,932: 15x17
+    """
+    return bulk_parse.int_array(text, 5)
+
+
+def claim_chunks(claims) -> Iterator["np.ndarray"]:
     """
-    returns a Counter containing the num of squares at each coordinate (upper left corner coords)
+    the claims as (N, 5) arrays: an array as is, an iterable of claims CHUNK claims at a time
     """
-    counts = Counter()
-    
-    for rectangle in rectangles:
-        for coord in rectangle.yield_all_squares():
-            counts[coord] += 1  # default value of everything is zero
-    
-    return counts
-
-def num_squares_with_overlap(claims):
+    if isinstance(claims, np.ndarray):
+        yield claims
+        return
+
+    claims = iter(claims)
+    while True:
+        chunk = collect_records(islice(claims, CHUNK))
+        if not len(chunk):
+            return
+        yield chunk
+
+
+def coverage(claims) -> "np.ndarray":
     """
-    returns the num of squares with multiple overlapping claims
+    returns the num of claims covering each square, as an array indexed [y, x] (upper left corner coords)
     """
-    rectangles = [Rectangle.generate_from_claim(claim) for claim in claims]
-    counts = coverage(rectangles)
-    
-    return len([count for count in counts.values() if count >= 2])
+    # difference array: +1 at the upper left corner of a claim, -1 right of it and below it, +1 diagonally after it.
+    # Its running sums along both axes are the coverage
+    diff = np.zeros((1, 1), dtype=np.int32)
+
+    for chunk in claim_chunks(claims):
+        if not len(chunk):
+            continue
+        _, x_lo, y_lo, width, height = chunk.T
+        x_hi, y_hi = x_lo + width, y_lo + height
+
+        # grow to fit the claims (the extra row and column take the -1s of the claims at the edge)
+        grow_y, grow_x = int(y_hi.max()) + 1 - diff.shape[0], int(x_hi.max()) + 1 - diff.shape[1]
+        if grow_y > 0 or grow_x > 0:
+            diff = np.pad(diff, ((0, max(grow_y, 0)), (0, max(grow_x, 0))))
+
+        for ys, xs, change in ((y_lo, x_lo, 1), (y_lo, x_hi, -1), (y_hi, x_lo, -1), (y_hi, x_hi, 1)):
+            np.add.at(diff, (ys, xs), change)
 
+    return diff.cumsum(axis=0).cumsum(axis=1)[:-1, :-1]
 
-# Part 1:
-# data format: #1263 @ 488,932: 15x17
-with open("data/day03.txt") as f:
-    claims = [line.strip() for line in f]
 
-# How many square inches of fabric are within two or more claims?
-print(num_squares_with_overlap(claims))
+def num_squares_with_overlap(claims) -> int:
+    """
+    returns the num of squares with multiple overlapping claims
+    """
+    return int((coverage(claims) >= 2).sum())
 
 
 # Part 2:
 # exactly one claim doesn't overlap by even a single square inch of fabric with any other claim. Its id?
 
-def non_overlapping_claim(claims):
+def non_overlapping_claim(claims: "np.ndarray") -> int:
     """
     returns the id of the only entirely non-overlapping claim
     """
-    rectangles = [Rectangle.generate_from_claim(claim) for claim in claims]
-    counts = coverage(rectangles)
-    
-    
-    nonoverlapping_rectangle = [rectangle 
-                                for rectangle in rectangles 
-                                if all(counts[coord] == 1 for coord in rectangle.yield_all_squares())]
-    
-    assert len(nonoverlapping_rectangle) == 1
-    
-    return nonoverlapping_rectangle[0].id
-
-
-print(non_overlapping_claim(claims))
-
-# Unit test
-TEST_CLAIMS = [
-    "#1 @ 1,3: 4x4",
-    "#2 @ 3,1: 4x4",
-    "#3 @ 5,5: 2x2",
-    ]
-
-assert non_overlapping_claim(TEST_CLAIMS) == 3
\ No newline at end of file
+    counts = coverage(claims)
+
+    # running sums of the squares covered by exactly one claim (with a zero row and column first):
+    # the number of such squares within a claim is then four lookups, done for all the claims at once
+    once = np.zeros((counts.shape[0] + 1, counts.shape[1] + 1), dtype=np.int64)
+    once[1:, 1:] = (counts == 1).cumsum(axis=0).cumsum(axis=1)
+
+    ids, x_lo, y_lo, width, height = claims.T
+    x_hi, y_hi = x_lo + width, y_lo + height
+    covered_once = once[y_hi, x_hi] - once[y_lo, x_hi] - once[y_hi, x_lo] + once[y_lo, x_lo]
+
+    nonoverlapping = ids[covered_once == width * height]
+    assert len(nonoverlapping) == 1
+
+    return int(nonoverlapping[0])
+
+
+def part1(claims: Iterable[Claim]) -> int:
+    # How many square inches of fabric are within two or more claims?
+    return num_squares_with_overlap(claims)
+
+
+def part2(claims: "np.ndarray") -> int:
+    return non_overlapping_claim(claims)
+
+
+def run_tests():
+    # Unit test
+    TEST_CLAIMS = [
+        "#1 @ 1,3: 4x4",
+        "#2 @ 3,1: 4x4",
+        "#3 @ 5,5: 2x2",
+        ]
+
+    claims = parse_puzzle("\n".join(TEST_CLAIMS))
+    assert claims.tolist() == [list(parse_line(claim)) for claim in TEST_CLAIMS]
+    assert num_squares_with_overlap(claims) == 4
+    assert num_squares_with_overlap(parse_line(claim) for claim in TEST_CLAIMS) == 4  # streamed
+    assert non_overlapping_claim(claims) == 3
+
+
+def main():
+    run_tests()
+
+    with open(INPUT_FILE) as f:
+        claims = parse_puzzle(f.read())
+
+    print(part1(claims))
+    print(part2(claims))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,40 @@
 """
 Advent of code, 2018
-Day 5: Alchemical Reduction 
+Day 5: Alchemical Reduction
 """
 
+INPUT_FILE = "data/day05.txt"
+
+# the original implementations kept next to the faster ones, see equivalence.py
+REFERENCE_IMPLEMENTATIONS = {"reduce_polymer": "reduce_polymer_reference"}
+
+
+def reduce_polymer(polymer: str) -> str:
+    """
+    one pass with a stack: a unit reacts with the last unit left on the stack, or is pushed on it.
+    (The reactions can happen in any order, the fully reacted polymer is the same)
+    """
+    stack = []
+    for unit in polymer:
+        if stack and stack[-1] != unit and stack[-1].swapcase() == unit:  # same type, opposite polarity -> reacts
+            stack.pop()
+        else:
+            stack.append(unit)
+
+    return "".join(stack)
+
+
 # alternative... regex?
 
-# seems recursive, but (naive implementation) runs over the set max depth 
+# seems recursive, but (naive implementation) runs over the set max depth
 # so lets just loop...
-def reduce_polymer(polymer):
+def reduce_polymer_reference(polymer):
     id = 0
     reduced_polymer = polymer
-    
+
     while id < len(reduced_polymer) - 1:
         if reduced_polymer[id].upper() == reduced_polymer[id+1].upper():    # same char, maybe different size
-            
+
             if reduced_polymer[id] == reduced_polymer[id+1]:    ## same size as well -> does not react
                 id += 1
                 continue
@@ -23,49 +44,71 @@ def reduce_polymer(polymer):
                 id = max(id - 1, 0)   # handle the case of running into negative indexes
                 continue
         id += 1
-    
-    
-    return reduced_polymer
-        
 
 
-#How many units remain after fully reacting the polymer you scanned?
-
-with open("data/day05.txt") as f:
-    polymer = f.read()
-    
-reduced = reduce_polymer(polymer)
-
-# this is the answer:
-print(len(reduced))
+    return reduced_polymer
 
-# unit test
-TEST_POLYMER = "dabAcCaCBAcCcaDA"
 
-assert reduce_polymer(TEST_POLYMER) == "dabCBAcaDA"
-assert len(reduce_polymer(TEST_POLYMER)) == 10
 
+def parse_puzzle(text: str) -> str:
+    return text.strip()
 
 
 #########
 # Part B:
-# One of the unit types is causing problems; it's preventing the polymer from collapsing as much as it should. 
-# Your goal is to figure out which unit type is causing the most problems, remove all instances of it (regardless of polarity), 
+# One of the unit types is causing problems; it's preventing the polymer from collapsing as much as it should.
+# Your goal is to figure out which unit type is causing the most problems, remove all instances of it (regardless of polarity),
 # fully react the remaining polymer, and measure its length.
 
-diff_chars = set(polymer.upper())
+def shortest_polymer_with_one_unit_removed(polymer: str) -> int:
+    """
+    returns the length of the shortest reduced polymer obtainable by removing all instances of one unit type
+    """
+    diff_chars = set(polymer.upper())
+
+    poly_lengths = dict()
+
+    # Strategy: remove each char (case insensitive) one by one, reduce polymer, log the length of the resulting polymer
+    for rem_char in diff_chars:
+        manipulated_polymer = polymer.replace(rem_char, "").replace(rem_char.lower(), "")
+        reduced_polymer = reduce_polymer(manipulated_polymer)
+        poly_lengths[rem_char] = len(reduced_polymer)
+
+    # the best char to rem, that results into shorters polymer, is:
+    best_char_to_remove = min(poly_lengths, key=poly_lengths.get)  # returns the key
+
+    # resulting reduced polymer length:
+    return poly_lengths[best_char_to_remove]
+
+
+def part1(polymer: str) -> int:
+    #How many units remain after fully reacting the polymer you scanned?
+    return len(reduce_polymer(polymer))
+
+
+def part2(polymer: str) -> int:
+    return shortest_polymer_with_one_unit_removed(polymer)
+
+
+def run_tests():
+    # unit test
+    TEST_POLYMER = "dabAcCaCBAcCcaDA"
+
+    assert reduce_polymer(TEST_POLYMER) == "dabCBAcaDA"
+    assert reduce_polymer_reference(TEST_POLYMER) == "dabCBAcaDA"
+    assert len(reduce_polymer(TEST_POLYMER)) == 10
+    assert shortest_polymer_with_one_unit_removed(TEST_POLYMER) == 4
+
 
-poly_lengths = dict()
+def main():
+    run_tests()
 
-# Strategy: remove each char (case insensitive) one by one, reduce polymer, log the length of the resulting polymer
-for rem_char in diff_chars:
-    manipulated_polymer = polymer.replace(rem_char, "").replace(rem_char.lower(), "")
-    reduced_polymer = reduce_polymer(manipulated_polymer)
-    poly_lengths[rem_char] = len(reduced_polymer)
+    with open(INPUT_FILE) as f:
+        polymer = parse_puzzle(f.read())
 
+    print(part1(polymer))
+    print(part2(polymer))
 
-# the best char to rem, that results into shorters polymer, is:
-best_char_to_remove = min(poly_lengths, key=poly_lengths.get)  # returns the key
 
-# resulting reduced polymer length:
-print(poly_lengths[best_char_to_remove])
+if __name__ == "__main__":
+    main()
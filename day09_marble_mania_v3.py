@@ -1,12 +1,20 @@
 """
 Advent of code, 2018
-Day 8: Marble Mania
+Day 9: Marble Mania
 """
 
 # Performance-wise, the way to go is to use deque, rotate the circle and pop/append items
 
+from array import array
 from typing import Tuple, NamedTuple
 from collections import Counter, deque
+import checkpoint
+import progress
+
+INPUT_FILE = "data/day09.txt"
+
+debug = progress.channel("day09")
+checkpoints = checkpoint.store("day09", every=1_000_000)  # marbles
 
 # Circular buffer kind of thing
 
@@ -20,37 +28,58 @@ class Marbles():
         """
         self.num_players = num_players
         self.total_num_marbles = total_num_marbles
-        
+
         #self.marbles = [0]  # contains marble ids in their respective "slots" on the circle. First element 0 <=> Opening "move" played
         # Time complexities for Python lists
         # set O(1)
-        # remove/delete O(n) 
-        # --> this causes slowdown with large n 
+        # remove/delete O(n)
+        # --> this causes slowdown with large n
         # --> USE deque and rotates with pop/append instead!
-        
+
         self.marbles = deque([0])  # this is the circle
         self.player_in_turn = 1   # first player starts... player ids from 1 to num_players
-        
+
         self.scores = Counter()   # store scores for each player. Player id as a key
-    
-        
+
+
+    def snapshot(self, next_marble_id: int) -> tuple:
+        """
+        the state of the game for a checkpoint (the circle as an array: compact, and quick to pickle)
+        """
+        return next_marble_id, array("q", self.marbles), self.player_in_turn, dict(self.scores)
+
+
+    def restore(self, state: tuple) -> int:
+        """
+        continues from a snapshot, returns the id of the next marble to play
+        """
+        next_marble_id, marbles, self.player_in_turn, scores = state
+        self.marbles = deque(marbles)
+        self.scores = Counter(scores)
+        return next_marble_id
+
+
     def play(self):
         """
         Plays the game of marbles until finish. Returns scores Counter
         """
-        # 
-        
-        for marble_id in range(1, self.total_num_marbles + 1):
-            if marble_id % 100000 == 0:
-                print(marble_id)
-            
+        key = f"{self.num_players} players, {self.total_num_marbles} marbles"
+        saved = checkpoints.load(key) if checkpoints.enabled else None
+        first_marble_id = self.restore(saved) if saved is not None else 1
+
+        for marble_id in range(first_marble_id, self.total_num_marbles + 1):
+            if debug.enabled and marble_id % 100000 == 0:
+                debug(marble_id)
+            if checkpoints.enabled and marble_id % checkpoints.every == 0:
+                checkpoints.save(key, self.snapshot(marble_id))
+
             # the special case where marble number is multiple of 23
             if marble_id % 23 == 0:
                 self.marbles.rotate(7)
-                # the current player keeps the marble they would have placed, adding it to their score. 
+                # the current player keeps the marble they would have placed, adding it to their score.
                 # Plus the marble seven steps to the left, which is removed
                 self.scores[self.player_in_turn] += marble_id + self.marbles.pop()     # pops from the right end
-                self.marbles.rotate(-1) 
+                self.marbles.rotate(-1)
             else:
                 self.marbles.rotate(-1)  # move left by one, then the right end is the right place to append the new marble
                 self.marbles.append(marble_id)   # append to the right end
@@ -61,41 +90,66 @@ class Marbles():
         return self.scores
 
 
-# unit tests:
-"""10 players; last marble is worth 1618 points: high score is 8317
-13 players; last marble is worth 7999 points: high score is 146373
-17 players; last marble is worth 1104 points: high score is 2764
-21 players; last marble is worth 6111 points: high score is 54718
-30 players; last marble is worth 5807 points: high score is 37305
-"""
-assert Marbles(10, 1618).play().most_common(1)[0][1] == 8317
-assert Marbles(13, 7999).play().most_common(1)[0][1] == 146373
-assert Marbles(17, 1104).play().most_common(1)[0][1] == 2764
-assert Marbles(21, 6111).play().most_common(1)[0][1] == 54718
-assert Marbles(30, 5807).play().most_common(1)[0][1] == 37305
+def parse_puzzle(text: str) -> Tuple[int, int]:
+    """
+    returns the number of players and the number (points) of the last marble
+    Input format: 455 players; last marble is worth 71223 points
+    """
+    players_part, marbles_part = text.split(";")
 
+    num_players = int(players_part.split(" ")[0])
+    num_marbles = int(marbles_part.split(" ")[-2])
 
-# Input:
-# 455 players; last marble is worth 71223 points
-with open("data/day09.txt") as f:
-    input = f.read().split(";")
+    return num_players, num_marbles
 
-num_players = int(input[0].split(" ")[0])
-num_marbles = int(input[1].split(" ")[-2])
 
+def high_score(num_players: int, num_marbles: int) -> int:
+    """
+    plays the game, returns the winning Elf's score
+    """
+    return Marbles(num_players, num_marbles).play().most_common(1)[0][1]
 
-game = Marbles(num_players, num_marbles)
-scores = game.play()
-#print(scores)
-print("The resulting max score is", scores.most_common(1)[0][1])
-# Right answer: 384288
 
+def part1(game_setup: Tuple[int, int]) -> int:
+    num_players, num_marbles = game_setup
+    return high_score(num_players, num_marbles)
+    # Right answer: 384288
 
-###################3
+
+###################
 # Part B:
 # What would the new winning Elf's score be if the number of the last marble were 100 times larger?
-new_game = Marbles(num_players, 100*num_marbles)
-new_scores = new_game.play()  # slow with list-based implementation. Fast with deque + rotates
-#print(new_scores)
-print("The resulting max score is", new_scores.most_common(1)[0][1])
-# Right answer: 3189426841
+def part2(game_setup: Tuple[int, int]) -> int:
+    num_players, num_marbles = game_setup
+    return high_score(num_players, 100*num_marbles)  # slow with list-based implementation. Fast with deque + rotates
+    # Right answer: 3189426841
+
+
+def run_tests():
+    # unit tests:
+    """10 players; last marble is worth 1618 points: high score is 8317
+    13 players; last marble is worth 7999 points: high score is 146373
+    17 players; last marble is worth 1104 points: high score is 2764
+    21 players; last marble is worth 6111 points: high score is 54718
+    30 players; last marble is worth 5807 points: high score is 37305
+    """
+    assert Marbles(10, 1618).play().most_common(1)[0][1] == 8317
+    assert Marbles(13, 7999).play().most_common(1)[0][1] == 146373
+    assert Marbles(17, 1104).play().most_common(1)[0][1] == 2764
+    assert Marbles(21, 6111).play().most_common(1)[0][1] == 54718
+    assert Marbles(30, 5807).play().most_common(1)[0][1] == 37305
+    assert part1(parse_puzzle("10 players; last marble is worth 1618 points")) == 8317
+
+
+def main():
+    run_tests()
+
+    with open(INPUT_FILE) as f:
+        game_setup = parse_puzzle(f.read())
+
+    print("The resulting max score is", part1(game_setup))
+    print("The resulting max score is", part2(game_setup))
+
+
+if __name__ == "__main__":
+    main()
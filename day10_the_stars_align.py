@@ -4,11 +4,19 @@ Day 10: The stars align
 """
 
 import re
-import numpy as np
-from typing import List, Tuple
+from lazy_import import lazy_import
+from typing import Iterable, Tuple
+import bulk_parse
+import progress
+
+np = lazy_import("numpy")
+
+INPUT_FILE = "data/day10.txt"
+
+debug = progress.channel("day10")
 
 #Input format: position=<-31492,  42429> velocity=< 3, -4>
-rgx = "position=<([- ]\d+), ([- ]\d+)> velocity=<([- ]\d+), ([- ]\d+)>"
+rgx = r"position=<([- ]\d+), ([- ]\d+)> velocity=<([- ]\d+), ([- ]\d+)>"
 
 
 # given enough time, those positions and velocities will move the points into a cohesive message!
@@ -18,91 +26,116 @@ rgx = "position=<([- ]\d+), ([- ]\d+)> velocity=<([- ]\d+), ([- ]\d+)>"
 # Probably when the bounding box of the points is the smallest! (Assumption is that all the points participate in forming the message)
 
 
+# The points are an (N, 4) array of x, y, vx, vy; one point is a tuple
+Point = Tuple[int, int, int, int]
 
-class Point():
+
+def parse_line(line: str) -> Point:
     """
-    coordinates,
-    velocity
-    step() method to take one step, update location
-    from_line static method to create
+    parses the line of input, returns the x, y, vx, vy of the point
     """
-    x: int
-    y: int
-    vx: int
-    vy: int
-    
-    def __init__(self, x, y, vx, vy):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-    
-    
-    def step(self, num_steps: int = 1):
-        """
-        take one step
-        """
-        self.x += num_steps*self.vx
-        self.y += num_steps*self.vy
-        
-    @staticmethod
-    def from_line(line: str) -> 'Point':
-        """
-        parses the line of input, returns corresponding point object
-        """
-        x,y,vx,vy = map(int, re.match(rgx, line).groups())   # re.match anchored to the start of the string... re.search not
-        return Point(x,y,vx,vy)
- 
- 
-class Sky():  
-    def __init__(self, points: List[Point], time: int = 0):
+    return tuple(map(int, re.match(rgx, line).groups()))   # re.match anchored to the start of the string... re.search not
+
+
+def collect_records(points: Iterable[Point]) -> "np.ndarray":
+    return bulk_parse.rows_to_array(points, 4)
+
+
+class Sky():
+    def __init__(self, points: "np.ndarray", time: int = 0):
         self.time = time
-        self.points = points
+        self.positions = points[:, :2].astype(np.int64)  # a copy, moved by timestep
+        self.velocities = points[:, 2:].astype(np.int64)
         self.update_bounding_box()
         self.min_bb_area = self.bb_area
-        
-    
+
+
     def timestep(self, num_steps: int = 1):
         self.time += num_steps
-        for point in self.points:
-            point.step(num_steps)
+        self.positions += num_steps * self.velocities
         self.update_bounding_box()
-        
+
     def draw(self, output_file: str = "adventofcode2018_day10_pic.txt") -> int:
         """
-        return the time when the message appears        
+        return the time when the message appears
         """
         x_range = self.bb_coords[2] - self.bb_coords[0] + 1
         y_range = self.bb_coords[3] - self.bb_coords[1] + 1
-        print("Ranges:", x_range, y_range)
-        
+        if debug.enabled: debug("Ranges:", x_range, y_range)
+
         self.pic = np.chararray((y_range, x_range), unicode=True)
         self.pic[:] = "."
-        
-        for point in self.points:
-            self.pic[point.y - self.bb_coords[1], point.x - self.bb_coords[0]] = "#"
-                
+        self.pic[self.positions[:, 1] - self.bb_coords[1], self.positions[:, 0] - self.bb_coords[0]] = "#"
+
         with open(output_file, "w") as f:
             for row in self.pic:
                 add_line = "".join(row.tolist()) + "\n"
                 f.write(add_line)
 
-        
-        
-        
+
+
+
+    def render(self) -> str:
+        """
+        returns the points within the bounding box as a string, "#" for a point and "." for empty space
+        """
+        min_x, min_y, max_x, max_y = self.bb_coords
+        occupied = set(map(tuple, self.positions.tolist()))
+
+        return "\n".join("".join("#" if (x, y) in occupied else "." for x in range(min_x, max_x + 1))
+                         for y in range(min_y, max_y + 1))
+
     def update_bounding_box(self):
-        min_x = min(point.x for point in self.points)
-        min_y = min(point.y for point in self.points)
-        max_x = max(point.x for point in self.points)
-        max_y = max(point.y for point in self.points)
-        
+        min_x, min_y = self.positions.min(axis=0).tolist()
+        max_x, max_y = self.positions.max(axis=0).tolist()
+
         self.bb_coords = (min_x, min_y, max_x, max_y)
         self.bb_area = (max_x - min_x + 1) * (max_y - min_y + 1)
 
-   
 
-# reformatted just slightly to match the actual input
-INPUT_RAW = """position=< 9,  1> velocity=< 0,  2>
+
+def find_message(points: "np.ndarray") -> Sky:
+    """
+    steps the sky until the bounding box of the points is the smallest, i.e. the message has appeared.
+    The given points are not modified
+    """
+    sky = Sky(points, time=0)
+
+    # do not draw before we are at the minimum bbox
+    while True:
+        sky.timestep()
+        if sky.bb_area > sky.min_bb_area:  # starts to drift apart
+            sky.timestep(-1)
+            return sky
+        else:
+            sky.min_bb_area = sky.bb_area
+
+
+def parse_puzzle(text: str) -> "np.ndarray":
+    """
+    returns the points as an (N, 4) array of x, y, vx, vy, one per line
+    """
+    return bulk_parse.int_array(text, 4)
+
+
+def part1(points: "np.ndarray") -> str:
+    """
+    returns the message as it appears in the sky
+    """
+    return find_message(points).render()
+    # Your puzzle answer was NBHEZHCJ.
+
+
+# Part B:
+# timestep when the msg appeared
+def part2(points: "np.ndarray") -> int:
+    return find_message(points).time
+    # Answer: 10558
+
+
+def run_tests():
+    # reformatted just slightly to match the actual input
+    INPUT_RAW = """position=< 9,  1> velocity=< 0,  2>
 position=< 7,  0> velocity=<-1,  0>
 position=< 3, -2> velocity=<-1,  1>
 position=< 6,  10> velocity=<-2, -1>
@@ -134,46 +167,34 @@ position=< 5,  9> velocity=< 1, -2>
 position=< 14,  7> velocity=<-2,  0>
 position=<-3,  6> velocity=< 2, -1>"""
 
+    TEST_MESSAGE = """#...#..###
+#...#...#.
+#...#...#.
+#####...#.
+#...#...#.
+#...#...#.
+#...#...#.
+#...#..###"""
 
-INPUT_TEST = INPUT_RAW.split("\n")
-print(INPUT_TEST)
-points_test = [Point.from_line(line) for line in INPUT_TEST]
-print(points_test)
-
-sky_test = Sky(points_test, time=0)
-
-while True:
-    sky_test.draw(output_file = "adventofcode2018_day10_unittest_pic.txt")  # inefficient but okay with the unit test case
-    sky_test.timestep()
-    if sky_test.bb_area > sky_test.min_bb_area:  # starts to drift apart
-        print("Finished")
-        break
-    else:
-        sky_test.min_bb_area = sky_test.bb_area
+    points_test = parse_puzzle(INPUT_RAW)
+    assert points_test.tolist() == [list(parse_line(line)) for line in INPUT_RAW.splitlines()]
+    sky_test = find_message(points_test)
 
+    assert sky_test.time == 3
+    assert sky_test.render() == TEST_MESSAGE
 
 
-with open("data/day10.txt") as f:
-    input = [line.strip() for line in f]
-    
-points = [Point.from_line(line) for line in input]
+def main():
+    run_tests()
 
-sky = Sky(points, time=0)
+    with open(INPUT_FILE) as f:
+        points = parse_puzzle(f.read())
 
-# Now the larger one: do not draw before we are at the minimum bbox
-while True:
-    sky.timestep()
-    if sky.bb_area > sky.min_bb_area:
-        print("Finished")
-        sky.timestep(-1)
-        sky.draw()
-        print("Timestep when the msg appeared:", sky.time)
-        break
-    else:
-        sky.min_bb_area = sky.bb_area
+    sky = find_message(points)
+    sky.draw()
+    print(sky.render())
+    print("Timestep when the msg appeared:", sky.time)
 
-# Your puzzle answer was NBHEZHCJ.
 
-# Part B:
-# timestep when the msg appeared
-# Answer: 10558
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -5,69 +5,52 @@ Not that great performancewise. Would be better to represent plants/state in som
 E.g. state as a set of plant location integer indexes, getting rid of string operations + rebuilding strings
 """
 
-from typing import Dict
+from itertools import product
+from typing import Dict, Tuple
+import metrics
 
-NUM_GENERATIONS = 20
-RULE_LEN = 5
-
-# TEST DATA (should implement this "parse" as a function
-RAW = """initial state: #..#.#..##......###...###
-
-...## => #
-..#.. => #
-.#... => #
-.#.#. => #
-.#.## => #
-.##.. => #
-.#### => #
-#.#.# => #
-#.### => #
-##.#. => #
-##.## => #
-###.. => #
-###.# => #
-####. => #"""
-
-INPUT_TEST = [line.strip("\n").strip() for line in RAW.split("\n")]
+INPUT_FILE = "data/day12.txt"
 
-initial_state_test = INPUT_TEST[0].replace("initial state: ", "")
-rules_test = {}
-for rule in INPUT_TEST[2:]:
-    left, right = rule.split(" => ")
-    rules_test[left] = right
+counts = metrics.counters("day12")
 
+NUM_GENERATIONS = 20
+RULE_LEN = 5
+STABLE_GENS = 10  # part B: extrapolate once the score delta has stayed constant this many generations
 
-# ACTUAL PROBLEM DATA
-with open("data/day12.txt") as f:
-    input = [line.strip("\n").strip() for line in f]
-
-
-initial_state = input[0].replace("initial state: ", "")
-print("init state: ", initial_state)
-
-rules = {}
-for rule in input[2:]:
-    left, right = rule.split(" => ")
-    rules[left] = right
-
+# the original implementations kept next to the faster ones, see equivalence.py
+REFERENCE_IMPLEMENTATIONS = {"Plantation.evolve": "Plantation.evolve_reference"}
 
 # Part A:
 # After 20 generations, what is the sum of the numbers of all pots which contain a plant?
 
-class Plantation():       
+class Plantation():
     def __init__(self, state: str, rules: Dict[str, str]):
         self.left_idx = 0
         self.generation = 0
         self.rules = rules
-        
-        self.state = state 
+
+        self.state = state
         self.next_state = None
         self.pad_state()
-        
+
     def evolve(self, num_gens: int = 1):
-            
+        for _ in range(num_gens):
+            state = self.state
+            # each pot with two pots on both sides gets the replacement of its pattern (kept if there is no rule for it),
+            # the two leftmost and the three rightmost pots stay (like in evolve_reference)
+            self.state = (state[:2]
+                          + "".join([self.rules.get(state[i:i+RULE_LEN], state[i+2]) for i in range(len(state) - RULE_LEN)])
+                          + state[len(state) - 3:])
+            self.pad_state()
+            self.generation += 1
+            if counts.enabled:
+                counts["generations"] += 1
+
+
+    def evolve_reference(self, num_gens: int = 1):
+        for _ in range(num_gens):
             next_state = self.state
-            
+
             # Start from the left. Apply all filters. When match, replace and move one step to right
             for i in range(len(self.state) - RULE_LEN):
                 block = self.state[i:i+RULE_LEN]
@@ -76,24 +59,26 @@ class Plantation():
                         #replace and break
                         next_state = next_state[:i+2] + replacement + next_state[i+3:]
                         break  # break the pattern matching for this location
-                        
+
             self.state = next_state
             self.pad_state()
-            self.generation += 1    
-                
-            
+            self.generation += 1
+            if counts.enabled:
+                counts["generations"] += 1
+
+
     def __repr__(self):
         return f"gen:{self.generation}, left_idx:{self.left_idx}\n{self.state}"
-        
-        
+
+
     def get_score(self):
         score = 0
         for i, char in enumerate(self.state):
             if char == "#":
                 score += i + self.left_idx
-        
+
         return score
-        
+
 
     def pad_state(self):
         """
@@ -102,60 +87,115 @@ class Plantation():
         # Left hand side
         first_plant_idx = self.state.find("#")  # index in the list... not as in problem... 1
         pad_amount_left = 5 - first_plant_idx if first_plant_idx <= 4 else 0
-        
+
         # right hand side
         last_plant_idx = self.state.rfind("#")
         pad_amount_right = 6 + last_plant_idx - len(self.state) if len(self.state) - last_plant_idx < 6 else 0
-        
+
         # update
         self.state = ("." * pad_amount_left) + self.state + ("." * pad_amount_right)
         self.left_idx -= pad_amount_left
 
 
-#p_test = Plantation(state=initial_state_test, rules=rules_test)
-#print(p_test)
-#p_test.evolve(2)
-#print(p_test)
+def parse_puzzle(text: str) -> Tuple[str, Dict[str, str]]:
+    """
+    returns the initial state and the rules (pattern -> replacement) dict
+    Patterns not listed in the input produce an empty pot, so those are added as "." rules
+    (Plantation.evolve only replaces the pots for which some rule matches)
+    """
+    lines = [line.strip("\n").strip() for line in text.splitlines()]
+
+    initial_state = lines[0].replace("initial state: ", "")
+
+    rules = {}
+    for rule in lines[2:]:
+        if not rule:
+            continue
+        left, right = rule.split(" => ")
+        rules[left] = right
+
+    for pattern in product(".#", repeat=RULE_LEN):
+        rules.setdefault("".join(pattern), ".")
+
+    return initial_state, rules
+
+
+def score_after(initial_state: str, rules: Dict[str, str], num_gens: int) -> int:
+    """
+    returns the sum of the numbers of all pots which contain a plant after num_gens generations.
 
+    Simulating 50 billion generations is never going to finish, not even with a faster implementation...
+    There gotta be a pattern to be found: looking at the score over time, starting from some generation
+    the score delta per generation becomes constant (78 with the actual input, starting from gen 100).
+    So evolve until the delta has stayed the same for STABLE_GENS generations, then extrapolate.
+    """
+    p = Plantation(state=initial_state, rules=rules)
+    score = p.get_score()
+    delta = None
+    num_same_deltas = 0
 
-p = Plantation(state = initial_state, rules = rules) 
-#print(p.state)
-#print(p)
-p.evolve(20)
+    while p.generation < num_gens:
+        p.evolve()
+        new_score = p.get_score()
+        new_delta = new_score - score
+        num_same_deltas = num_same_deltas + 1 if new_delta == delta else 0
+        score, delta = new_score, new_delta
 
-print(p.left_idx)
-print(p.state)
+        if num_same_deltas >= STABLE_GENS:
+            return score + (num_gens - p.generation) * delta
 
-score = p.get_score()
-print(score)
-# 3738 is the right answer
+    return score
+
+
+def part1(puzzle: Tuple[str, Dict[str, str]]) -> int:
+    # After 20 generations, what is the sum of the numbers of all pots which contain a plant?
+    initial_state, rules = puzzle
+    p = Plantation(state=initial_state, rules=rules)
+    p.evolve(NUM_GENERATIONS)
+
+    return p.get_score()
+    # 3738 is the right answer
 
 
 # PART B:
 # After fifty billion (50000000000) generations, what is the sum of the numbers of all pots which contain a plant?
-# Okay, that's newer gonna finish. Not with the current implementation, and not even with a faster implementation...
-# There gotta be a pattern to be found
-
-p_b = Plantation(state = initial_state, rules = rules) 
-
-# TRY TO FIND THE PATTERN!
-
-# Possibilities could include:
-# We see the exact same state again --> deterministic --> would start to loop
-# There is some pretty clear pattern in how the new plants emerge, or how the score changes over time
-
-# Lets see what happens to the score over time. Get score and delta score per generation
-
-scores = {}
-scores[p_b.generation] = p_b.get_score()
-for _ in range(300):
-    p_b.evolve()
-    scores[p_b.generation] = p_b.get_score()
-    print(p_b.generation, p_b.get_score(), "score delta: ", scores[p_b.generation] - scores[p_b.generation - 1])
-    
-# We find that starting from gen 100, the score delta is constant 78
-# At gen 1000, score is 80467
-# Now, after 50 bil gens the score will be:
-# 80467 + (50_000_000_000 - 1_000) * 78
-print("Score after 50 billion generations:", str(80467 + (50_000_000_000 - 1_000) * 78))
-# Answer is: 3900000002467
+def part2(puzzle: Tuple[str, Dict[str, str]]) -> int:
+    initial_state, rules = puzzle
+    return score_after(initial_state, rules, 50_000_000_000)
+    # Answer is: 3900000002467
+
+
+def run_tests():
+    RAW = """initial state: #..#.#..##......###...###
+
+...## => #
+..#.. => #
+.#... => #
+.#.#. => #
+.#.## => #
+.##.. => #
+.#### => #
+#.#.# => #
+#.### => #
+##.#. => #
+##.## => #
+###.. => #
+###.# => #
+####. => #"""
+
+    # Provided unit test
+    assert part1(parse_puzzle(RAW)) == 325
+
+
+def main():
+    run_tests()
+
+    with open(INPUT_FILE) as f:
+        puzzle = parse_puzzle(f.read())
+
+    print(part1(puzzle))
+    print("Score after 50 billion generations:", part2(puzzle))
+
+
+if __name__ == "__main__":
+    main()
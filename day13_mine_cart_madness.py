@@ -3,111 +3,123 @@ Advent of code, 2018
 Day 13: Mine Cart Madness
 """
 
-from typing import List, Dict, Tuple
+from typing import List
+from grid import Grid
+import progress
+import metrics
 
+INPUT_FILE = "data/day13.txt"
+
+debug = progress.channel("day13")
+counts = metrics.counters("day13")
 
-# Possible cart symbols (at specific location, indicating the direction of the cart)
-CART_SYMBOLS = {"<", ">", "^", "v"}  # left, right, up, down
 
-# Dict to get the where the cart will turn at the next crossroads (cycles left-ahead-right)
-NEXT_TURN_MAP = {"left": "ahead", "ahead": "right", "right": "left"}
+# Cart directions as small ints, clockwise: turning right is +1, turning left is -1 (mod 4)
+UP, RIGHT, DOWN, LEFT = range(4)
+
+# Possible cart symbols (at specific location, indicating the direction of the cart)
+CART_SYMBOLS = {"^": UP, ">": RIGHT, "v": DOWN, "<": LEFT}
 
-# Dict. Given current cart direction, turn direction at the crossroads  --> new cart direction after the crossroads
-XROADS_TURNS = {("<", "left"): "v", (">", "left"): "^", ("^", "left"): "<", ("v", "left"): ">",
-                ("<", "ahead"): "<", (">", "ahead"): ">", ("^", "ahead"): "^", ("v", "ahead"): "v",
-                ("<", "right"): "^", (">", "right"): "v", ("^", "right"): ">", ("v", "right"): "<"}
+# The turn at the next crossroads (cycles left-ahead-right): the direction changes by next_turn - 1
+TURN_LEFT, GO_AHEAD, TURN_RIGHT = range(3)
 
-# Dict. Given current cart direction and type of curve --> new cart direction
-NEW_DIR_AFTER_CURVE = {("<", "/"): "v", ("<", "\\"): "^",
-                        (">", "/"): "^", (">", "\\"): "v",
-                        ("^", "/"): ">", ("^", "\\"): "<",
-                        ("v", "/"): "<", ("v", "\\"): ">"}
+# Track pieces, as the bytes of the track grid
+CROSSROADS = ord("+")
+# Given the type of curve, indexed by the current cart direction --> new cart direction
+NEW_DIR_AFTER_CURVE = {ord("/"): (RIGHT, UP, LEFT, DOWN),
+                       ord("\\"): (LEFT, DOWN, RIGHT, UP)}
 
-# Dict giving the coordinate delta (delta_x, delta_y) based on the direction the cart is going
-DIRECTION_TO_COORD_DELTA_MAP = {"<": (-1, 0), ">": (1, 0), "^": (0, -1), "v":(0, 1)}   # direction x, y
+# The coordinate delta (delta_x, delta_y), indexed by the direction the cart is going
+DIRECTION_TO_COORD_DELTA = ((0, -1), (1, 0), (0, 1), (-1, 0))
 
 # Part A:
-# After following their respective paths for a while, the carts eventually crash. 
-# To help prevent crashes, you'd like to know the location of the first crash. 
+# After following their respective paths for a while, the carts eventually crash.
+# To help prevent crashes, you'd like to know the location of the first crash.
 # Locations are given in X,Y coordinates, where the furthest left column is X=0 and the furthest top row is Y=0
 
 
 class Cart():
-    def __init__(self, id: int, x: int, y: int, direction: str, next_turn: str = "left"):
+    __slots__ = ("id", "x", "y", "direction", "next_turn")
+
+    def __init__(self, id: int, x: int, y: int, direction: int, next_turn: int = TURN_LEFT):
         self.id = id
         self.x = x
         self.y = y
         self.direction = direction
         self.next_turn = next_turn
-        
+
     def step(self):
         self.x, self.y = self.get_next_coords()
-          
+
     def get_next_coords(self):
-        delta_x, delta_y = DIRECTION_TO_COORD_DELTA_MAP[self.direction]
+        delta_x, delta_y = DIRECTION_TO_COORD_DELTA[self.direction]
         new_x, new_y = self.x + delta_x, self.y + delta_y
-        
+
         return (new_x, new_y)
-      
+
 
 
 class CartTrack():
-    def __init__(self, track: Dict[Tuple[int, int], str,], carts: List[Cart]):
+    def __init__(self, track: Grid, carts: List[Cart]):
         self.tick = 0
-        self.track = track  # dict giving the track. (x,y) as key, track character as value
+        self.track = track  # grid of the track characters (" " where there is no track), (0,0) at the top left
         self.carts = carts  # list of carts
         self.cart_pos = {(cart.x, cart.y) for cart in carts}
-        print(f"Started with {len(self.carts)} carts")
-        
-        
+        self.first_collision = None  # (x,y) of the first crash, set by step()
+        if debug.enabled: debug(f"Started with {len(self.carts)} carts")
+
+
     def print_track_only(self, x_max: int = 150, y_max: int = 150):
         """
         just for debug purposes. Print out the parsed track (with the carts replaced by the track pieces under them)
         """
-        for y in range(y_max):
-            line = ""
-            for x in range(x_max):
-                line += self.track.get((x,y), " ")
-            print(line)
-        
-        
+        for y in range(min(y_max, self.track.height)):
+            print(self.track.row(y)[:x_max])
+
+
     def step(self, num_ticks: int = 1):
         """
-        Update num_ticks steps of the simulation. 
+        Update num_ticks steps of the simulation.
         Used to step until the first crash (part A). Does not remove and handle destroyed carts
         """
         for _ in range(num_ticks):
             self.tick += 1
-            print("tick:", self.tick)
-            
+            if debug.enabled: debug("tick:", self.tick)
+            if counts.enabled:
+                counts["ticks"] += 1
+
             # determine the order to move
-            self.carts.sort(key = lambda cart: (cart.y, cart.x)) 
-            
+            self.carts.sort(key = lambda cart: (cart.y, cart.x))
+            cells, width = self.track.cells, self.track.width
+
             # move carts
             for cart in self.carts:
                 self.cart_pos.remove((cart.x, cart.y))
                 cart.step()
-                
+
                 # did I collide?
                 if (cart.x, cart.y) in self.cart_pos:
-                    print("COLLISION at:", (cart.x, cart.y), "tick:", self.tick)
+                    if debug.enabled: debug("COLLISION at:", (cart.x, cart.y), "tick:", self.tick)
+                    if counts.enabled:
+                        counts["collisions"] += 1
+                    self.first_collision = (cart.x, cart.y)
                     return True
                 else:  # update cart location set
                     self.cart_pos.add((cart.x, cart.y))
-                    
+
                 # update direction etc
-                trackpart = self.track[(cart.x, cart.y)]
-                
-                if trackpart == "+":  # crossroads
-                    cart.direction = XROADS_TURNS[(cart.direction, cart.next_turn)]
-                    cart.next_turn = NEXT_TURN_MAP[cart.next_turn]
-                    
-                elif trackpart in ("/", "\\"):  ## curves... escape backslashes...
-                    cart.direction = NEW_DIR_AFTER_CURVE[(cart.direction, trackpart)]       
-                
+                trackpart = cells[cart.y * width + cart.x]
+
+                if trackpart == CROSSROADS:
+                    cart.direction = (cart.direction + cart.next_turn - 1) % 4
+                    cart.next_turn = (cart.next_turn + 1) % 3
+
+                elif trackpart in NEW_DIR_AFTER_CURVE:  # curves
+                    cart.direction = NEW_DIR_AFTER_CURVE[trackpart][cart.direction]
+
                 #else:  # nothing to do
-                
-                
+
+
     def step_until_one_cart(self):
         """
         Update one tick of the cart simulation
@@ -117,112 +129,154 @@ class CartTrack():
         for _ in range(num_ticks):
             ids_destroyed = set()  # cart ids for the destroyed carts
             self.tick += 1
-            
-            if self.tick % 100 == 0:
-                print("tick:", self.tick)
-            
-            
+            if counts.enabled:
+                counts["ticks"] += 1
+
+            if debug.enabled and self.tick % 100 == 0:
+                debug("tick:", self.tick)
+
+
             # determine the order to move
             self.carts.sort(key = lambda cart: (cart.y, cart.x))  # ascending
-            
+            cells, width = self.track.cells, self.track.width
+
             # move
             for cart in self.carts:
                 if cart.id in ids_destroyed:
                     continue  # to next cart
                 self.cart_pos.remove((cart.x, cart.y))  # kept for the "collided_to" carts -> further cols during the same tick are accounted for
                 cart.step()
-                             
+
                 # did I collide?
                 if (cart.x, cart.y) in self.cart_pos:
-                    print("COLLISION at:", (cart.x, cart.y), "tick:", self.tick)
+                    if debug.enabled: debug("COLLISION at:", (cart.x, cart.y), "tick:", self.tick)
+                    if counts.enabled:
+                        counts["collisions"] += 1
                     # remove both carts
                     for cart_b in self.carts:
                         if cart_b.x == cart.x and cart_b.y == cart.y:  # collided
                             ids_destroyed.add(cart_b.id)
                     continue  # to the next cart
-                    
+
                 else:  # update cart location set
                     self.cart_pos.add((cart.x, cart.y))
-                    
+
                 # update direction etc
-                trackpart = self.track[(cart.x, cart.y)]
-                
-                if trackpart == "+":  # crossroads
-                    cart.direction = XROADS_TURNS[(cart.direction, cart.next_turn)]
-                    cart.next_turn = NEXT_TURN_MAP[cart.next_turn]
-                    
-                elif trackpart in ("/", "\\"):  ## curves... backslashes...
-                    cart.direction = NEW_DIR_AFTER_CURVE[(cart.direction, trackpart)]       
-                
+                trackpart = cells[cart.y * width + cart.x]
+
+                if trackpart == CROSSROADS:
+                    cart.direction = (cart.direction + cart.next_turn - 1) % 4
+                    cart.next_turn = (cart.next_turn + 1) % 3
+
+                elif trackpart in NEW_DIR_AFTER_CURVE:  # curves
+                    cart.direction = NEW_DIR_AFTER_CURVE[trackpart][cart.direction]
+
                 #else:  # nothing to do
-            
+
             # end of tick:
-            
+
             # Rebuild carts list and the cart positions set (without the destroyed ones)
             self.carts = [cart for cart in self.carts if cart.id not in ids_destroyed]
             self.cart_pos = {(cart.x, cart.y) for cart in self.carts}
             if len(ids_destroyed) > 0:
-                print(f"After cart destruction, there are {len(self.carts)} carts left!")
-            
+                if debug.enabled: debug(f"After cart destruction, there are {len(self.carts)} carts left!")
+
             if len(self.carts) == 1:
-                print("Only on cart remains! Location:", self.carts[0].x, self.carts[0].y)
+                if debug.enabled: debug("Only on cart remains! Location:", self.carts[0].x, self.carts[0].y)
                 return True
 
-       
+
     @staticmethod
     def parse_from_input(input: str) -> 'CartTrack':
         """
         given the input string (without splitting it in any way), get the CartTrack object
         """
-        lines = input.split("\n")
+        track = Grid.from_text(input, fill=" ")  # everything is track, except the carts
 
         num_carts = 0
         carts = []
-        track = {}
-        
-        for y, line in enumerate(lines):
-            for x, elem in enumerate(line):
-                if elem.isspace():  # no track, no cart
-                    continue
-                elif elem in CART_SYMBOLS:  # track and cart
-                    # get the cart
-                    carts.append(Cart(id=num_carts, x=x, y=y, direction=elem))
-                    num_carts += 1
-                    
-                    # get the underlying piece of track
-                    trackpart = "|" if elem in ("^", "v") else "-"
-                    track[(x,y)] = trackpart
-                    
-                else:  # just piece of track
-                    track[(x,y)] = elem
-    
+
+        for (x, y), elem in track.items():
+            if elem in CART_SYMBOLS:  # track and cart
+                # get the cart
+                carts.append(Cart(id=num_carts, x=x, y=y, direction=CART_SYMBOLS[elem]))
+                num_carts += 1
+
+                # get the underlying piece of track
+                trackpart = "|" if elem in ("^", "v") else "-"
+                track[x, y] = trackpart
+
         return CartTrack(track, carts)
 
 
-# Get the input data
-with open ("data/day13.txt") as f:
-    input = f.read()  # .split("\n")
- 
+def parse_puzzle(text: str) -> str:
+    """
+    the track is parsed into a CartTrack separately for each part, as the simulation modifies it
+    """
+    return text.rstrip("\n")
 
-ct = CartTrack.parse_from_input(input)
-#ct.print_track_only()
-#ct.step()
 
-while True:
-    collision = ct.step()
-    if collision:
-        break
-# 100,21 is the right answer
+def part1(track_input: str) -> str:
+    """
+    returns the location of the first crash as "x,y"
+    """
+    ct = CartTrack.parse_from_input(track_input)
 
+    while True:
+        collision = ct.step()
+        if collision:
+            break
+
+    return "{},{}".format(*ct.first_collision)
+    # 100,21 is the right answer
 
 
 #########################
 # PART B
 # What is the location of the last cart at the end of the first tick where it is the only cart left?
-ct_b = CartTrack.parse_from_input(input)
+def part2(track_input: str) -> str:
+    ct_b = CartTrack.parse_from_input(track_input)
+
+    while True:
+        one_remains = ct_b.step_until_one_cart()
+        if one_remains:
+            break
+
+    last_cart = ct_b.carts[0]
+    return f"{last_cart.x},{last_cart.y}"
+    # 113,109 is the right answer
+
+
+def run_tests():
+    TEST_TRACK = r"""/->-\
+|   |  /----\
+| /-+--+-\  |
+| | |  | v  |
+\-+-/  \-+--/
+  \------/   """
+
+    TEST_TRACK_B = r"""/>-<\
+|   |
+| /<+-\
+| | | v
+\>+</ |
+  |   ^
+  \<->/"""
+
+    # Provided unit tests
+    assert part1(TEST_TRACK) == "7,3"
+    assert part2(TEST_TRACK_B) == "6,4"
+
+
+def main():
+    run_tests()
+
+    with open(INPUT_FILE) as f:
+        track_input = parse_puzzle(f.read())
+
+    print(part1(track_input))
+    print(part2(track_input))
+
 
-while True:
-    one_remains = ct_b.step_until_one_cart()
-    if one_remains:
-        break
-# 113,109 is the right answer
+if __name__ == "__main__":
+    main()
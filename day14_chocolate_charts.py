@@ -2,71 +2,85 @@
 Advent of code, 2018
 Day 14: Chocolate charts
 """
-from typing import List
+import checkpoint
+import progress
 
-# puzzle input:
-INPUT = 554401
+INPUT_FILE = "data/day14.txt"  # puzzle input: number of recipes
 
-class Recipe():
-    def __init__(self, score):
-        self.score = score
+debug = progress.channel("day14")
+checkpoints = checkpoint.store("day14", every=2_000_000)  # steps (1 or 2 new recipes each)
+
+# the new recipes created from the sum of the current scores (0..18): its digits, as scores
+SUM_DIGITS = [bytes(int(digit) for digit in str(rec_sum)) for rec_sum in range(19)]
+
+
+def scores_to_str(scores: bytes) -> str:
+    return "".join(map(str, scores))
 
 
 class Recipes():
-    def __init__(self, recipes: List[Recipe]):
-        self.recipes = recipes  # this is also the scoreboard
-        self.current_recipes = [(i, i, recipe.score) for i, recipe in enumerate(self.recipes)]  # elf id, recipe index, score
-        print(self.current_recipes)
+    def __init__(self, recipes: bytearray):
+        self.recipes = recipes  # the scores of the recipes, one byte each: this is also the scoreboard
+        self.current_recipes = [(i, i, score) for i, score in enumerate(self.recipes)]  # elf id, recipe index, score
+        if debug.enabled: debug(self.current_recipes)
 
 
     def create_recipes(self, max_num_of_recipes: int, return_last_n: int = 10) -> str:
         """Create given amount of recipes, return the scores of the last n recipes as a concatenated string
-        
+
         Arguments:
             max_num_of_recipes {int} -- [loop until this many recipes has been created]
-        
+
         Keyword Arguments:
             return_last_n {int} -- [how many scores to return] (default: {10})
-        
+
         Returns:
             str -- [the return_last_n nbr of recipe scores joined as a string]
         """
 
         while True:
             rec_sum = sum(score for _, __, score in self.current_recipes)
-            num_recipes_to_add = min(max_num_of_recipes - len(self.recipes), len(str(rec_sum)))
-            for digit in str(rec_sum)[:num_recipes_to_add]:
-                self.recipes.append(Recipe(int(digit)))
+            num_recipes_to_add = min(max_num_of_recipes - len(self.recipes), len(SUM_DIGITS[rec_sum]))
+            self.recipes += SUM_DIGITS[rec_sum][:num_recipes_to_add]
 
             # then update the indexes
             for elf_id, rec_idx, score in self.current_recipes[:num_recipes_to_add+1]:   # slicing creates a new copy
                 steps_to_take = 1 + score
                 num_recipes = len(self.recipes)
                 new_rec_idx = (rec_idx + steps_to_take) % num_recipes
-                self.current_recipes[elf_id] = (elf_id, new_rec_idx, self.recipes[new_rec_idx].score)
-            
+                self.current_recipes[elf_id] = (elf_id, new_rec_idx, self.recipes[new_rec_idx])
+
             if len(self.recipes) >= max_num_of_recipes:
-                last_n = "".join([str(recipe.score) for recipe in r.recipes[-return_last_n:]])
+                last_n = scores_to_str(self.recipes[-return_last_n:])
                 return last_n
 
 
     def get_num_recipes_before(self, before_recipe_string: str) -> int:
         """Calc how many recipes are generated before given recipe score string is met
-        
+
         Arguments:
             before_recipe_string {str} -- [create new recipes until this string of successive recipe scores is encountered]
-        
+
         Returns:
             int -- [how many recipes there were before the recipe string was encountered for the first time]
         """
 
         recipe_str_len = len(before_recipe_string)
-        
+        before_scores = bytes(int(digit) for digit in before_recipe_string)
+
+        key = f"recipes before {before_recipe_string}, from {self.snapshot()[:2]}"  # the search, from this initial state
+        saved = checkpoints.load(key) if checkpoints.enabled else None
+        step = self.restore(saved) if saved is not None else 0
+
         while True:
+            step += 1
+            if checkpoints.enabled and step % checkpoints.every == 0:
+                checkpoints.save(key, self.snapshot(step - 1))  # the steps taken so far
+
             rec_sum = sum(score for _, __, score in self.current_recipes)
-            for digit in str(rec_sum):
-                self.recipes.append(Recipe(int(digit)))
-                if "".join([str(recipe.score) for recipe in self.recipes[-recipe_str_len:]]) == before_recipe_string:
+            for score in SUM_DIGITS[rec_sum]:
+                self.recipes.append(score)
+                if self.recipes.endswith(before_scores):
                     return len(self.recipes) - recipe_str_len
 
 
@@ -75,53 +89,130 @@ class Recipes():
                 steps_to_take = 1 + score
                 num_recipes = len(self.recipes)
                 new_rec_idx = (rec_idx + steps_to_take) % num_recipes
-                self.current_recipes[elf_id] = (elf_id, new_rec_idx, self.recipes[new_rec_idx].score)
+                self.current_recipes[elf_id] = (elf_id, new_rec_idx, self.recipes[new_rec_idx])
 
 
+    def snapshot(self, step: int = 0) -> tuple:
+        """
+        the state of the scoreboard for a checkpoint
+        """
+        return bytes(self.recipes), tuple(self.current_recipes), step
 
-# Part A:
-# What are the scores of the ten recipes immediately after the number of recipes in your puzzle input?
 
-# Unit tests
-r = Recipes(recipes=[Recipe(3), Recipe(7)])
-assert r.create_recipes(19) == "5158916779"
+    def restore(self, state: tuple) -> int:
+        """
+        continues from a snapshot, returns its step
+        """
+        scores, current_recipes, step = state
+        self.recipes = bytearray(scores)
+        self.current_recipes = list(current_recipes)
+        return step
+
 
-r = Recipes(recipes=[Recipe(3), Recipe(7)])
-assert r.create_recipes(15) == "0124515891"
+    def extend_to(self, num_recipes: int):
+        """
+        takes whole steps (all digits added, all elves moved) until there are at least num_recipes recipes.
+        Unlike create_recipes and get_num_recipes_before, leaves the scoreboard in a state it can be extended from
+        """
+        while len(self.recipes) < num_recipes:
+            rec_sum = sum(score for _, __, score in self.current_recipes)
+            self.recipes += SUM_DIGITS[rec_sum]
 
-r = Recipes(recipes=[Recipe(3), Recipe(7)])
-assert r.create_recipes(28) == "9251071085"
+            num_recipes_now = len(self.recipes)
+            for elf_id, rec_idx, score in self.current_recipes[:]:
+                new_rec_idx = (rec_idx + 1 + score) % num_recipes_now
+                self.current_recipes[elf_id] = (elf_id, new_rec_idx, self.recipes[new_rec_idx])
 
-r = Recipes(recipes=[Recipe(3), Recipe(7)])
-assert r.create_recipes(2028) == "5941429882"
 
-# Then with the prob input:
-r = Recipes(recipes=[Recipe(3), Recipe(7)])
-print(r.create_recipes(INPUT+10))
-# Answer is 3610281143
+class GrowingScoreboard():
+    """
+    a scoreboard kept between queries (see daemon.py): a query only creates the recipes that are not there yet
+    """
+    def __init__(self, chunk: int = 1_000_000):
+        self.scoreboard = new_scoreboard()
+        self.chunk = chunk  # how many recipes to add at a time when searching
+
+    def __len__(self):
+        return len(self.scoreboard.recipes)
+
+    def scores_after(self, num_recipes: int, n: int = 10) -> str:
+        """
+        the scores of the n recipes after the first num_recipes recipes (part A)
+        """
+        self.scoreboard.extend_to(num_recipes + n)
+        return scores_to_str(self.scoreboard.recipes[num_recipes:num_recipes + n])
+
+    def num_recipes_before(self, before_recipe_string: str) -> int:
+        """
+        how many recipes there are before the first occurrence of the given scores (part B)
+        """
+        before_scores = bytes(int(digit) for digit in before_recipe_string)
+        searched = 0  # no match starts before this
+        while True:
+            found = self.scoreboard.recipes.find(before_scores, searched)
+            if found >= 0:
+                return found
+            searched = max(len(self) - len(before_scores) + 1, 0)
+            self.scoreboard.extend_to(len(self) + self.chunk)
+
+
+def new_scoreboard() -> Recipes:
+    """
+    returns the scoreboard in its initial state: two recipes with scores 3 and 7
+    """
+    return Recipes(recipes=bytearray([3, 7]))
+
+
+def parse_puzzle(text: str) -> int:
+    return int(text.strip())
+
+
+# Part A:
+# What are the scores of the ten recipes immediately after the number of recipes in your puzzle input?
+def part1(num_recipes: int) -> str:
+    return new_scoreboard().create_recipes(num_recipes + 10)
+    # Answer is 3610281143
 
 
 ################
 # Part B
 
-# As it turns out, you got the Elves' plan backwards. 
-# #They actually want to know how many recipes appear on the scoreboard to the left of the first recipes 
-# # whose scores are the digits from your puzzle input.
+# As it turns out, you got the Elves' plan backwards.
+# They actually want to know how many recipes appear on the scoreboard to the left of the first recipes
+# whose scores are the digits from your puzzle input.
+def part2(num_recipes: int) -> int:
+    return new_scoreboard().get_num_recipes_before(str(num_recipes))
+    # Right answer is: 20211326
+
+
+def run_tests():
+    # Unit tests
+    assert new_scoreboard().create_recipes(19) == "5158916779"
+    assert new_scoreboard().create_recipes(15) == "0124515891"
+    assert new_scoreboard().create_recipes(28) == "9251071085"
+    assert new_scoreboard().create_recipes(2028) == "5941429882"
+
+    assert new_scoreboard().get_num_recipes_before("51589") == 9
+    assert new_scoreboard().get_num_recipes_before("01245") == 5
+    assert new_scoreboard().get_num_recipes_before("92510") == 18
+    assert new_scoreboard().get_num_recipes_before("59414") == 2018
+
+    growing = GrowingScoreboard(chunk=10)
+    assert growing.scores_after(2018) == "5941429882"
+    assert growing.scores_after(9) == "5158916779"
+    assert growing.num_recipes_before("59414") == 2018
+    assert growing.num_recipes_before("92510") == 18
+
 
-# unit tests
-r = Recipes(recipes=[Recipe(3), Recipe(7)])
-assert r.get_num_recipes_before("51589") == 9
+def main():
+    run_tests()
 
-r = Recipes(recipes=[Recipe(3), Recipe(7)])
-assert r.get_num_recipes_before("01245") == 5
+    with open(INPUT_FILE) as f:
+        num_recipes = parse_puzzle(f.read())
 
-r = Recipes(recipes=[Recipe(3), Recipe(7)])
-assert r.get_num_recipes_before("92510") == 18
+    print(part1(num_recipes))
+    print(part2(num_recipes))
 
-r = Recipes(recipes=[Recipe(3), Recipe(7)])
-assert r.get_num_recipes_before("59414") == 2018
 
-# then with actual input
-r = Recipes(recipes=[Recipe(3), Recipe(7)])
-print(r.get_num_recipes_before(str(INPUT)))
-# Right answer is: 20211326
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,24 @@ data I managed to found. However, it does not give the correct answer for my inp
 Could be some extreme corner case that I am missing.
 """
 
-import networkx as nx
-
+from lazy_import import lazy_import
 from typing import Dict, List, Tuple, NamedTuple, Set
+from grid import Grid
+import checkpoint
+import progress
+import metrics
+
+nx = lazy_import("networkx")
+
+INPUT_FILE = "data/day15.txt"
+
+# map squares as they are stored in the grid cells (bytes)
+OPEN = ord(".")
+START_TERRAINS = b".GE"  # squares a move can start from
+
+debug = progress.channel("day15")
+counts = metrics.counters("day15")
+checkpoints = checkpoint.store("day15", every=10)  # rounds
 
 
 class Pos(NamedTuple):
@@ -25,13 +40,15 @@ class Pos(NamedTuple):
 
 
 class Creature:
+    __slots__ = ("id", "species", "att_pwr", "hp", "pos", "dead")
+
     def __init__(self, id: int, species: str, pos: Pos, att_pwr: int = 3, hp: int = 200):
         self.id = id
         self.species = species
         self.att_pwr = att_pwr
         self.hp = hp
         self.pos = pos
-        self.dead = False  
+        self.dead = False
 
     def attack(self, other: "Creature"):
         other.hp -= self.att_pwr
@@ -49,10 +66,10 @@ class Creature:
 
 
 class Battle():
-    def __init__(self, _map: Dict[Pos, str], creatures: List[Creature]):
-        self._map = _map
-        self.x_max = max(position.x for position in self._map.keys())
-        self.y_max = max(position.y for position in self._map.keys())
+    def __init__(self, _map: Grid, creatures: List[Creature]):
+        self._map = _map  # walls, open squares and creatures, (0,0) at the top left
+        self.x_max = self._map.x_hi
+        self.y_max = self._map.y_hi
         self.creatures = creatures
         self.round = 0
         self.generate_graph()
@@ -67,16 +84,18 @@ class Battle():
         # there really isnt need to rebuild the graph every time from scratch... but this will do for now
         G = nx.DiGraph()
 
-        for pos, terrain in self._map.items():
-            x, y = pos.x, pos.y
-            if terrain in (".", "G", "E"):  # start node
-                if x+1 <= self.x_max and self._map[Pos(x+1, y)] == ".":
+        cells, width = self._map.cells, self._map.width
+        for i, terrain in enumerate(cells):
+            if terrain in START_TERRAINS:  # start node
+                pos = Pos(*self._map.position(i))
+                x, y = pos.x, pos.y
+                if x+1 <= self.x_max and cells[i+1] == OPEN:
                     G.add_edge(pos, Pos(x+1, y))
-                if x-1 >= 0 and self._map[Pos(x-1, y)] == ".":
+                if x-1 >= 0 and cells[i-1] == OPEN:
                     G.add_edge(pos, Pos(x-1, y))
-                if y+1 <= self.y_max and self._map[Pos(x, y+1)] == ".":
+                if y+1 <= self.y_max and cells[i+width] == OPEN:
                     G.add_edge(pos, Pos(x, y+1))
-                if y-1 >= 0 and self._map[Pos(x, y-1)] == ".":
+                if y-1 >= 0 and cells[i-width] == OPEN:
                     G.add_edge(pos, Pos(x, y-1))
 
         self.graph = G
@@ -85,13 +104,15 @@ class Battle():
     def step(self, num_rounds: int = 1):
         for _ in range(num_rounds):
             self.round += 1
-            #print(f"============================\nRound {self.round} begins!") 
+            if counts.enabled:
+                counts["rounds"] += 1
+            #print(f"============================\nRound {self.round} begins!")
 
             # determine the order
             self.creatures.sort(key = lambda creature: (creature.pos.y, creature.pos.x))
 
             for curr_creature in self.creatures:
-                print(f"{curr_creature.species} Creature {curr_creature.id} starts turn", curr_creature)
+                if debug.enabled: debug(f"{curr_creature.species} Creature {curr_creature.id} starts turn", curr_creature)
 
                 if curr_creature.dead:
                     #print("...killed creature does not do anything")
@@ -99,10 +120,10 @@ class Battle():
 
                 # identify alive opponent targets
                 targets = [c for c in self.creatures if c.species != curr_creature.species and not c.dead]
-                
+
                 # if no targets, combat ends
                 if len(targets) == 0:
-                    print("NO TARGETS - BATTLE ENDS!")
+                    if debug.enabled: debug("NO TARGETS - BATTLE ENDS!")
                     return True
 
                 # Am I already in attack range for some target? If yes, do not move, ATTACK
@@ -122,17 +143,19 @@ class Battle():
                         continue
 
                     # If open squares adj to target, unit tries to move to one of those
-                    # Which in-range square can be reached with fewest steps? Choose that to target. 
+                    # Which in-range square can be reached with fewest steps? Choose that to target.
                     # If no cannot be reached, do not move
 
                     # Rebuild graph
                     self.generate_graph()
+                    if counts.enabled:
+                        counts["graph rebuilds"] += 1
 
                     #print("Seaching for the shortest paths")
-                    
+
                     # sort possible_destinations by naive manhattan distance (to asc order)
                     possible_destinations.sort(key=lambda dest_pos: curr_creature.pos.manhattan_dist(dest_pos))
-                    
+
                     len_shortest_path = float("Inf")  # shortest path found so far
                     paths = []
 
@@ -143,19 +166,24 @@ class Battle():
                     # Use this to get the shortest path lenght for that destination.
                     # Then only for destination(s) that actually have the shortest path, get all shortest paths
                     # and get the one matching the "reading order" condition
-                    
+
                     sp_to_dest_poss = []  # tuple of dest_pos, path_len
                     for dest_pos in possible_destinations:
+                        if counts.enabled:
+                            counts["shortest path searches"] += 1
+                            # not counted by the search itself: the size of the graph, which a BFS expands at most.
+                            # An upper bound on the expanded nodes, the actual searches often stop sooner
+                            counts["BFS nodes, upper bound (graph size per search)"] += self.graph.number_of_nodes()
                         if dest_pos in self.graph and nx.has_path(self.graph, curr_creature.pos, dest_pos):
                             sp_to_dest_poss.append((dest_pos, len(nx.shortest_path(self.graph, curr_creature.pos, dest_pos))))
                             # some shortest path... though not really path length here, because first element is the start pos
-                    
+
                     if len(sp_to_dest_poss) == 0: continue   # couldnt move, couldn yet attack
 
                     # get the shortest path(s) lenght
                     sp_to_dest_poss.sort(key=lambda x: x[1])
                     min_sp_dist = sp_to_dest_poss[0][1]
-                    
+
                     # generate the set of destinations positions for which we need all shortest paths
                     candidate_pos_for_further_sp_analysis = [pos for (pos, dist) in sp_to_dest_poss if dist <= min_sp_dist]
 
@@ -164,8 +192,12 @@ class Battle():
                         dest_pos in self.graph
                         and nx.has_path(self.graph, curr_creature.pos, dest_pos)):
 
-                            paths.extend(list(nx.all_shortest_paths(self.graph, curr_creature.pos, dest_pos)))
-                            
+                            new_paths = list(nx.all_shortest_paths(self.graph, curr_creature.pos, dest_pos))
+                            paths.extend(new_paths)
+                            if counts.enabled:
+                                counts["all shortest paths enumerations"] += 1
+                                counts["paths enumerated"] += len(new_paths)
+
                             # this shortest path tracking / prefiltering is unnecessary here - it has been taken care already
                             min_len = min(map(len, paths))
                             if min_len < len_shortest_path:
@@ -175,7 +207,7 @@ class Battle():
                     #print("Done seaching for the shortest paths")
 
                     if len(paths) < 1:
-                        print("Nowhere to go")
+                        if debug.enabled: debug("Nowhere to go")
                         # do not move
                         continue
 
@@ -209,14 +241,35 @@ class Battle():
         return False
 
 
+    def snapshot(self) -> tuple:
+        """
+        the state of the battle for a checkpoint (the graph is rebuilt from the map)
+        """
+        return self._map, self.creatures, self.round
+
+
+    def restore(self, state: tuple):
+        self._map, self.creatures, self.round = state
+        self.generate_graph()
+
+
     def fight_until_end(self):
+        # the battle is told apart by its initial state
+        key = self._map.render() + "\n" + repr([(c.species, c.pos, c.att_pwr, c.hp) for c in self.creatures])
+        saved = checkpoints.load(key) if checkpoints.enabled else None
+        if saved is not None:
+            self.restore(saved)
+
         while True:
+            if checkpoints.enabled and self.round and self.round % checkpoints.every == 0:
+                checkpoints.save(key, self.snapshot())
             if self.step(): break
 
-        print(f"Battle end after {self.round-1} full rounds")
-        print(self.creatures)
-        print("Sum HP left:", self.sum_hp_left())
-        print("Outcome:", self.get_outcome())
+        if debug.enabled:
+            debug(f"Battle end after {self.round-1} full rounds")
+            debug(self.creatures)
+            debug("Sum HP left:", self.sum_hp_left())
+            debug("Outcome:", self.get_outcome())
 
         return self.get_outcome()
 
@@ -225,15 +278,7 @@ class Battle():
         """
         prints the current map (including creatures)
         """
-        map_str = ""
-        for y in range(self.y_max+1):
-            line = ""
-            for x in range(self.x_max+1):
-                line += self._map[Pos(x,y)]
-            line += "\n"
-            map_str += line
-
-        print(map_str)
+        print(self._map.render() + "\n")
 
 
     def show_terrain_map(self):
@@ -244,7 +289,7 @@ class Battle():
         for y in range(self.y_max):
             line = ""
             for x in range(self.x_max):
-                line += self._map[Pos(x,y)] if self._map[Pos(x,y)] not in ("G", "E") else "."
+                line += self._map[x, y] if self._map[x, y] not in ("G", "E") else "."
             line += "\n"
             map_str += line
 
@@ -253,42 +298,36 @@ class Battle():
 
     @staticmethod
     def parse_initial_state(init_input: str) -> "Battle":
-        lines = [line for line in init_input.splitlines()]
         # top left = Pos(0,0)
-        _map = {Pos(x, y): elem
-                for y, line in enumerate(lines)
-                for x, elem in enumerate(line)
-               }
+        _map = Grid.from_text(init_input)
 
         creatures = [(elem, Pos(x,y))
-                    for y, line in enumerate(lines)
-                    for x, elem in enumerate(line) if elem in ("G", "E")
+                    for (x, y), elem in _map.items() if elem in ("G", "E")
                     ]
         creatures = [Creature(id, *creature) for id, creature in enumerate(creatures)]
 
         return Battle(_map=_map, creatures=creatures)
 
 
-with open("data/day15.txt") as f:
-    init_input = f.read()
+def parse_puzzle(text: str) -> str:
+    """
+    the map is parsed into a Battle when fighting, as the battle modifies it
+    """
+    return text.rstrip("\n")
 
 
-# Movement test:
-RAW = """#########
-#G..G..G#
-#.......#
-#.......#
-#G..E..G#
-#.......#
-#.......#
-#G..G..G#
-#########"""
+def part1(init_input: str) -> int:
+    b = Battle.parse_initial_state(init_input)
+    return b.fight_until_end()
+    # Outcome: 201411  -- too high!
+    # THERE IS SOMETHING THAT I DID NOT CATCH / SOMETHING MYSTIC WITH MY OWN INPUT...
+    # the solution seems to work for every other case
 
-tb = Battle.parse_initial_state(RAW)
 
-# UNIT TESTS:
+def run_tests():
+    # UNIT TESTS:
 
-RAW2 = """#######
+    RAW2 = """#######
 #.G...#
 #...EG#
 #.#.#G#
@@ -296,12 +335,11 @@ RAW2 = """#######
 #.....#
 #######"""
 
+    # Unit tests:
+    tb2 = Battle.parse_initial_state(RAW2)
+    assert tb2.fight_until_end() == 27730
 
-# Unit tests:
-tb2 = Battle.parse_initial_state(RAW2)
-assert tb2.fight_until_end() == 27730
-
-RAW3 = """#######
+    RAW3 = """#######
 #G..#E#
 #E#E.E#
 #G.##.#
@@ -309,11 +347,11 @@ RAW3 = """#######
 #...E.#
 #######"""
 
-tb3 = Battle.parse_initial_state(RAW3)
-assert tb3.fight_until_end() == 36334
+    tb3 = Battle.parse_initial_state(RAW3)
+    assert tb3.fight_until_end() == 36334
 
 
-RAW4 = """#######
+    RAW4 = """#######
 #E..EG#
 #.#G.E#
 #E.##E#
@@ -321,11 +359,11 @@ RAW4 = """#######
 #..E#.#
 #######"""
 
-tb4 = Battle.parse_initial_state(RAW4)
-assert tb4.fight_until_end() == 39514
+    tb4 = Battle.parse_initial_state(RAW4)
+    assert tb4.fight_until_end() == 39514
 
 
-RAW5 = """#######
+    RAW5 = """#######
 #E.G#.#
 #.#G..#
 #G.#.G#
@@ -333,11 +371,11 @@ RAW5 = """#######
 #...E.#
 #######"""
 
-tb5 = Battle.parse_initial_state(RAW5)
-assert tb5.fight_until_end() == 27755
+    tb5 = Battle.parse_initial_state(RAW5)
+    assert tb5.fight_until_end() == 27755
 
 
-RAW6 = """#######
+    RAW6 = """#######
 #.E...#
 #.#..G#
 #.###.#
@@ -345,11 +383,11 @@ RAW6 = """#######
 #...#G#
 #######"""
 
-tb6 = Battle.parse_initial_state(RAW6)
-assert tb6.fight_until_end() == 28944
+    tb6 = Battle.parse_initial_state(RAW6)
+    assert tb6.fight_until_end() == 28944
 
 
-RAW7 = """#########
+    RAW7 = """#########
 #G......#
 #.E.#...#
 #..##..G#
@@ -359,40 +397,42 @@ RAW7 = """#########
 #.....G.#
 #########"""
 
-tb7 = Battle.parse_initial_state(RAW7)
-assert tb7.fight_until_end() == 18740
+    tb7 = Battle.parse_initial_state(RAW7)
+    assert tb7.fight_until_end() == 18740
+
+    # All unit test pass!
 
+    # Other input data found on the web
+    #with open("data/day15_other.txt") as f:
+    #    some_other_test_case = f.read()
 
-# All unit test pass!
+    #ob = Battle.parse_initial_state(some_other_test_case)
+    #outcome = ob.fight_until_end()
+    #print("Outcome:", outcome)
+    # Outcome: 246176  after 98 full rounds.
+    # So, SOLUTION OK FOR THIS PROBLEM INPUT AS WELL!
 
-# Other input data found on the web
-#with open("data/day15_other.txt") as f:
-#    some_other_test_case = f.read()
 
-#ob = Battle.parse_initial_state(some_other_test_case)
-#outcome = ob.fight_until_end()
-#print("Outcome:", outcome)
-# Outcome: 246176  after 98 full rounds. 
-# So, SOLUTION OK FOR THIS PROBLEM INPUT AS WELL!
+    # Yet another full problem input
+    #with open("data/day15_other2.txt") as f:
+    #    some_other_test_case2 = f.read()
 
+    #ob2 = Battle.parse_initial_state(some_other_test_case2)
+    #outcome2 = ob2.fight_until_end()
+    #print("Outcome:", outcome2)
+    # Fight over at round 71, goblins won with 2775 pts remaining, result = 197025.
+    # OK, GOT THIS AS WELL!
 
-# Yet another full problem input
-with open("data/day15_other2.txt") as f:
-    some_other_test_case2 = f.read()
 
-#ob2 = Battle.parse_initial_state(some_other_test_case2)
-#outcome2 = ob2.fight_until_end()
-#print("Outcome:", outcome2)
-# Fight over at round 71, goblins won with 2775 pts remaining, result = 197025.
-# OK, GOT THIS AS WELL!
+def main():
+    run_tests()
 
+    # Then the actual input:
+    with open(INPUT_FILE) as f:
+        init_input = parse_puzzle(f.read())
 
+    print("Outcome:", part1(init_input))
 
-# Then the actual input:
-b = Battle.parse_initial_state(init_input)
-outcome = b.fight_until_end()
-print("Outcome:", outcome)
-# Outcome: 201411  -- too high!
-# THERE IS SOMETHING THAT I DID NOT CATCH / SOMETHING MYSTIC WITH MY OWN INPUT...
-# the solution seems to work for every other case
 
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,9 @@ Day 16: Chronal Classification
 
 # Unfortunately, while the manual gives the name of each opcode, it doesn't seem to indicate the number
 
-from typing import NamedTuple, List
+from typing import NamedTuple, List, Set, Dict, Tuple
+
+INPUT_FILE = "data/day16.txt"
 
 Registers = List[int]
 
@@ -65,19 +67,19 @@ class Instruction(NamedTuple):
         #seti (set immediate) stores value A into register C. (Input B is ignored.)
         elif self.op == "seti":
             out[self.c] = self.a
-        
+
         #Greater-than testing:
-        #gtir (greater-than immediate/register) sets register C to 1 if value A is greater than register B. 
+        #gtir (greater-than immediate/register) sets register C to 1 if value A is greater than register B.
         # Otherwise, register C is set to 0.
         elif self.op == "gtir":
             out[self.c] = 1 if self.a > out[self.b] else 0
-        
-        #gtri (greater-than register/immediate) sets register C to 1 if register A is greater than value B. 
+
+        #gtri (greater-than register/immediate) sets register C to 1 if register A is greater than value B.
         # Otherwise, register C is set to 0.
         elif self.op == "gtri":
             out[self.c] = 1 if out[self.a] > self.b else 0
-        
-        #gtrr (greater-than register/register) sets register C to 1 if register A is greater than register B. 
+
+        #gtrr (greater-than register/register) sets register C to 1 if register A is greater than register B.
         # Otherwise, register C is set to 0.
         elif self.op == "gtrr":
             out[self.c] = 1 if out[self.a] > out[self.b] else 0
@@ -86,11 +88,11 @@ class Instruction(NamedTuple):
         #eqir (equal immediate/register) sets register C to 1 if value A is equal to register B. Otherwise, register C is set to 0.
         elif self.op == "eqir":
             out[self.c] = 1 if self.a == out[self.b] else 0
-        
+
         #eqri (equal register/immediate) sets register C to 1 if register A is equal to value B. Otherwise, register C is set to 0.
         elif self.op == "eqri":
             out[self.c] = 1 if out[self.a] == self.b else 0
-        
+
         #eqrr (equal register/register) sets register C to 1 if register A is equal to register B. Otherwise, register C is set to 0.
         elif self.op == "eqrr":
             out[self.c] = 1 if out[self.a] == out[self.b] else 0
@@ -101,31 +103,6 @@ class Instruction(NamedTuple):
         return out   # this is the register state after the instruction is applied on the previous register state
 
 
-# PART A:
-# Ignoring the opcode numbers, how many samples in your puzzle input behave like three or more opcodes?
-# Go thru all of them, apply all operations to them, check how many gives the correct output
-
-
-# Test case:
-reg_before = [3, 2, 1, 1]
-valid_ops = []
-reg_expected = [3, 2, 2, 1]
-
-for op in OPERATIONS:
-    instr = Instruction(op, 2, 1, 2)
-    registers_after = instr.process(reg_before)
-    if registers_after == reg_expected:
-        valid_ops.append(op)
-
-# Unit tests for the test case
-assert len(valid_ops) == 3
-assert set(valid_ops) == set(["mulr", "addi", "seti"])
-
-
-# READ IN THE INSTRUCTION DATA:
-with open("data/day16_ops.txt") as f:
-    lines = f.readlines()
-
 def parse_input(lines: str):
     """
     given lines of input (as list), returns examples
@@ -149,79 +126,134 @@ def parse_input(lines: str):
 
     return inputs
 
-examples = parse_input(lines)
 
-# Go thru all inputdata elements.
-num_samples_with_min_3_opcodes = 0   # we need to solve this
+def parse_puzzle(text: str) -> Tuple[List[List[Registers]], List[List[int]]]:
+    """
+    returns the examples (see parse_input) and the instructions of the test program
+    The samples and the test program are separated by empty lines in the input
+    """
+    samples_text, program_text = text.split("\n\n\n\n")
+
+    examples = parse_input(samples_text.splitlines(keepends=True))
+    test_prog_instructions = [[int(elem) for elem in line.strip().split()]
+                              for line in program_text.splitlines() if line.strip()]
+
+    return examples, test_prog_instructions
+
 
-for example in examples:
-    reg_before, instr_inputs, reg_expected = example
-    valid_ops = []
+def valid_ops_for(reg_before: Registers, instr_inputs: List[int], reg_expected: Registers) -> Set[str]:
+    """
+    returns the operations (names) that turn reg_before into reg_expected with the given instruction inputs
+    """
+    valid_ops = set()
     # apply every operation
     for op in OPERATIONS:
         instr = Instruction(op, *instr_inputs[1:])
         registers_after = instr.process(reg_before)
         if registers_after == reg_expected:
-            valid_ops.append(op)
-    
-    if len(valid_ops) >= 3:
-        num_samples_with_min_3_opcodes += 1
+            valid_ops.add(op)
+
+    return valid_ops
 
-print("PART 1: ", num_samples_with_min_3_opcodes, " samples behaved like three or more opcodes\n")
-# 596 --> the right answer!
+
+# PART A:
+# Ignoring the opcode numbers, how many samples in your puzzle input behave like three or more opcodes?
+# Go thru all of them, apply all operations to them, check how many gives the correct output
+def count_samples_with_min_3_opcodes(examples: List[List[Registers]]) -> int:
+    num_samples_with_min_3_opcodes = 0
+
+    # Go thru all inputdata elements.
+    for reg_before, instr_inputs, reg_expected in examples:
+        if len(valid_ops_for(reg_before, instr_inputs, reg_expected)) >= 3:
+            num_samples_with_min_3_opcodes += 1
+
+    return num_samples_with_min_3_opcodes
 
 
 #########
 # PART 2:
 # Using the samples you collected, work out the number of each opcode and execute the test program (the second section of your puzzle input).
-print("PART 2:")
-# for every opcode (int), set of possible ops (strings) that it could match to.
-possible_ops = {i: set(OPERATIONS) for i in range(len(OPERATIONS))}
+def resolve_opcodes(examples: List[List[Registers]]) -> Dict[int, str]:
+    """
+    returns the opcode (int) -> operation name mapping
+    """
+    # for every opcode (int), set of possible ops (strings) that it could match to.
+    possible_ops = {i: set(OPERATIONS) for i in range(len(OPERATIONS))}
 
-# Possible mappings after examples
-for example in examples:
-    reg_before, instr_inputs, reg_expected = example
-    valid_ops = set()
-    # apply every operation
-    for op in OPERATIONS:
-        instr = Instruction(op, *instr_inputs[1:])
-        registers_after = instr.process(reg_before)
-        if registers_after == reg_expected:
-            valid_ops.add(op)
-    
-    # set intersection (remove those that are not common between...)
-    possible_ops[instr_inputs[0]] = possible_ops[instr_inputs[0]] & valid_ops
+    # Possible mappings after examples
+    for reg_before, instr_inputs, reg_expected in examples:
+        valid_ops = valid_ops_for(reg_before, instr_inputs, reg_expected)
 
-# Then iteratively find the matches. Find such possible_ops that have only one possibility. Found!
-# Freeze that, remove the just found op from the rest of the possible_ops. Repeat the process
+        # set intersection (remove those that are not common between...)
+        possible_ops[instr_inputs[0]] = possible_ops[instr_inputs[0]] & valid_ops
 
-op_to_opcode_map = dict()
+    # Then iteratively find the matches. Find such possible_ops that have only one possibility. Found!
+    # Freeze that, remove the just found op from the rest of the possible_ops. Repeat the process
 
-while True:
-    maxlen = max(len(possible) for possible in possible_ops.values())
-    if maxlen < 1:  # all found
-        break
+    op_to_opcode_map = dict()
 
-    for opcode, pops in possible_ops.items():
-        if len(pops) == 1:
-            resolved_op = pops.pop()
-            op_to_opcode_map[opcode] = resolved_op
+    while True:
+        maxlen = max(len(possible) for possible in possible_ops.values())
+        if maxlen < 1:  # all found
             break
-    # remove resolved_op from all sets in possible_ops
-    for opcode, pops in possible_ops.items():
-        pops.discard(resolved_op)
 
-print(op_to_opcode_map)
+        for opcode, pops in possible_ops.items():
+            if len(pops) == 1:
+                resolved_op = pops.pop()
+                op_to_opcode_map[opcode] = resolved_op
+                break
+        else:
+            raise ValueError("The samples do not resolve the opcodes unambiguously")
+
+        # remove resolved_op from all sets in possible_ops
+        for opcode, pops in possible_ops.items():
+            pops.discard(resolved_op)
+
+    return op_to_opcode_map
+
+
+def run_test_program(test_prog_instructions: List[List[int]], op_to_opcode_map: Dict[int, str]) -> Registers:
+    registers = [0, 0, 0, 0]
+    for instr_params in test_prog_instructions:
+        registers = Instruction(op_to_opcode_map[instr_params[0]], *instr_params[1:]).process(registers)
+
+    return registers
+
+
+def part1(puzzle: Tuple[List[List[Registers]], List[List[int]]]) -> int:
+    examples, _ = puzzle
+    return count_samples_with_min_3_opcodes(examples)
+    # 596 --> the right answer!
+
 
 # What value is contained in register 0 after executing the test program?
-# Load the test prog:
-with open("data/day16_test_prog.txt") as f:
-    test_prog_instructions = [[int(elem) for elem in line.strip().split()]
-                                for line in f.readlines()]
+def part2(puzzle: Tuple[List[List[Registers]], List[List[int]]]) -> int:
+    examples, test_prog_instructions = puzzle
+    op_to_opcode_map = resolve_opcodes(examples)
+
+    return run_test_program(test_prog_instructions, op_to_opcode_map)[0]
+    # 554 - correct answer
+
+
+def run_tests():
+    # Test case:
+    valid_ops = valid_ops_for([3, 2, 1, 1], [9, 2, 1, 2], [3, 2, 2, 1])
+
+    # Unit tests for the test case
+    assert len(valid_ops) == 3
+    assert set(valid_ops) == set(["mulr", "addi", "seti"])
+
+
+def main():
+    run_tests()
+
+    # READ IN THE INSTRUCTION DATA:
+    with open(INPUT_FILE) as f:
+        puzzle = parse_puzzle(f.read())
+
+    print("PART 1: ", part1(puzzle), " samples behaved like three or more opcodes\n")
+    print("PART 2:", part2(puzzle))
 
-registers = [0, 0, 0, 0]
-for instr_params in test_prog_instructions:
-    registers = Instruction(op_to_opcode_map[instr_params[0]], *instr_params[1:]).process(registers)
 
-print("Register state after processing: ", registers)
-# 554 - correct answer
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -2,57 +2,71 @@
 Advent of code, 2018
 Day 17: Reservoir Research
 ---
-This ended up being a bit more involved. This proceeds naively, starting each time from the water source. 
+This ended up being a bit more involved. This proceeds naively, starting each time from the water source.
 Before some late stage changes I had a logic that set the source for new block of water to be closer to the frontier.
 Did not care to rewrite it
 """
 
-RAW_TEST = """x=495, y=2..7
-y=7, x=495..501
-x=501, y=3..7
-x=498, y=2..4
-x=506, y=1..2
-x=498, y=10..13
-x=504, y=10..13
-y=13, x=498..504"""
+import hashlib
+from typing import Tuple
+from grid import Grid
+from lazy_import import lazy_import
+import bulk_parse
+import checkpoint
+import progress
+import metrics
 
-import re
-from typing import Tuple, Dict
+INPUT_FILE = "data/day17.txt"
+
+debug = progress.channel("day17")
+counts = metrics.counters("day17")
+checkpoints = checkpoint.store("day17", every=2000)  # water units
+
+np = lazy_import("numpy")
 
 CLAY = "#"
 WATER_SPRING = (500, 0)  # x, y
 
+# the map characters as they are stored in the grid cells (bytes), see flow_one
+SAND, CLAY_CELL, STANDING, FALLING, RUNNING, BLOCK = b".#~|/b"
+
 # Type hints:
 Pos = Tuple[int, int]  # x and y
-Grid = Dict[Pos, str]  # position -> what the "map" looks like. Map is sparse, not containing sand "."
 
 # input format: x or y = something, other = something1...something2
-rgx = "([xy])=(\d+), ([xy])=(\d+)..(\d+)"
+# read in bulk, with the axes as numbers: "x=495, y=2..7" -> 0 495 1 2 7
+AXES = (("x=", " 0 "), ("y=", " 1 "))
 
 def generate_grid(inp:str) -> Grid:
     """
     Arguments:
         inp {str} -- THe raw unsplitted test giving the "map"
-    
+
     Returns:
-        Grid -- where Pos (XY) is the key, value: the corresponding char on the map
+        Grid -- the map, sand "." where there is nothing else.
+                From the spring down to one row below the lowest clay (where the water leaves the grid),
+                with 2 columns of sand on both sides (the water can overflow the outermost clay by one column)
     """
-    # grid has sparse representation. Not storing the sand "." positions
-    grid = {}
-
-    lines = inp.splitlines()
-
-    for line in lines:
-        lname, lval, rname, rightlo, righthi = re.match(rgx, line).groups()
-        
-        if lname == "x" and rname == "y":
-            for rval in range(int(rightlo), int(righthi)+1):
-                grid[(int(lval), rval)] = CLAY
-        elif lname == "y" and rname == "x":
-            for rval in range(int(rightlo), int(righthi)+1):
-                grid[(rval, int(lval))] = CLAY
-        else:
-            raise ValueError("Unexpected input")
+    lname, lval, rname, rightlo, righthi = bulk_parse.int_array(inp, 5, replacements=AXES).T
+    if (lname == rname).any() or ((lname != 0) & (lname != 1)).any():
+        raise ValueError("Unexpected input")
+
+    # (x_lo, x_hi, y_lo, y_hi) of each clay vein: a vertical vein has its x first
+    vertical = lname == 0
+    veins = np.stack([np.where(vertical, lval, rightlo), np.where(vertical, lval, righthi),
+                      np.where(vertical, rightlo, lval), np.where(vertical, righthi, lval)], axis=1)
+
+    spring_x, spring_y = WATER_SPRING
+    grid = Grid(x_lo=int(veins[:, 0].min(initial=spring_x)) - 2,
+                y_lo=int(veins[:, 2].min(initial=spring_y)),
+                x_hi=int(veins[:, 1].max(initial=spring_x)) + 2,
+                y_hi=int(veins[:, 3].max(initial=spring_y)) + 1)
+
+    # fill in the veins as slices of a 2D view of the grid cells
+    cells = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.height, grid.width)
+    for x_lo, x_hi, y_lo, y_hi in (veins - (grid.x_lo, grid.x_lo, grid.y_lo, grid.y_lo)).tolist():
+        cells[y_lo:y_hi + 1, x_lo:x_hi + 1] = CLAY_CELL
+    del cells  # releases the grid cells (a bytearray cannot be resized while viewed)
 
     # There is also a spring of water ("+") near the surface at x=500, y=0
     grid[WATER_SPRING] = "+"
@@ -61,33 +75,28 @@ def generate_grid(inp:str) -> Grid:
 
 
 def show(grid: Grid) -> str:
-    x_lo = min(x for x, y in grid.keys())
-    x_hi = max(x for x, y in grid.keys())
-    y_lo = min(y for x, y in grid.keys())
-    y_hi = max(y for x, y in grid.keys())
+    return "\n".join(row + f"\t{rowno}" for rowno, row in enumerate(grid.rows()))
 
-    # if position does not contain anything in the grid, it's sand "."
-    rows = [[grid.get((x, y), '.') 
-            for x in range(x_lo, x_hi + 1)]
-            for y in range(y_lo, y_hi + 1)]
 
-    return "\n".join(''.join(row) + f"\t{rowno}" for rowno, row in enumerate(rows))
+def clay_rows(grid: Grid) -> Tuple[int, int]:
+    """
+    the y of the highest and the lowest clay
+    """
+    return grid.find(CLAY)[1], grid.rfind(CLAY)[1]
 
 
 def count_squares_reached_by_water(grid: Grid) -> int:
     # Need to consider only between those y for which we had those probing results (i.e. CLAY)
-    y_low  = min(y for (x, y), val in grid.items() if val == CLAY)
-    y_high = max(y for (x, y), val in grid.items() if val == CLAY)
+    y_low, y_high = clay_rows(grid)
 
-    return len([v for (x,y), v in grid.items() if v in ("~", "|", "b", "/") and y >= y_low and y <= y_high])
+    return sum(grid.count(v, y_low, y_high) for v in ("~", "|", "b", "/"))
 
 
 def count_squares_with_standing_water(grid: Grid) -> int:
     # Need to consider only between those y for which we had those probing results (i.e. CLAY)
-    y_low  = min(y for (x, y), val in grid.items() if val == CLAY)
-    y_high = max(y for (x, y), val in grid.items() if val == CLAY)
-    
-    return len([v for (x,y), v in grid.items() if v == "~" and y >= y_low and y <= y_high])
+    y_low, y_high = clay_rows(grid)
+
+    return grid.count("~", y_low, y_high)
 
 # define a func for the water flow.
 # rules. Put one unit in:
@@ -97,22 +106,32 @@ def count_squares_with_standing_water(grid: Grid) -> int:
 
 # determine when to stop: when new unit is put in and it falls out of the grid
 
-def flow(grid: Grid, units=None) -> None:
+def flow(grid: Grid, y_lo: int, y_hi: int, units=None) -> None:
     """
     flow water units one by one until finished.
+    Water that flows above y_lo or below y_hi has left the grid
     """
     seq = 0  # water unit nbr, for printing of progress
 
     if not units:
+        # the flow is told apart by the grid it starts from
+        key = f"y {y_lo}..{y_hi}, grid {hashlib.sha256(grid.cells).hexdigest()}"
+        saved = checkpoints.load(key) if checkpoints.enabled else None
+        if saved is not None:
+            cells, seq = saved
+            grid.cells[:] = cells  # the water so far, in place
+
         continue_pos = None  # NO LONGER IN USE. restart the flow closer to the frontier
         while True:
-            if seq % 100 == 0: print(seq)
+            if debug.enabled and seq % 100 == 0: debug(seq)
+            if checkpoints.enabled and seq and seq % checkpoints.every == 0:
+                checkpoints.save(key, (bytes(grid.cells), seq))
 
-            ret = flow_one(grid, start_pos=continue_pos)
+            ret = flow_one(grid, y_lo, y_hi, start_pos=continue_pos)
             if ret == True:
-                show(grid)
+                if debug.enabled: debug("\n" + show(grid))
                 break
-            
+
             #continue_pos = ret[1] if ret[1] is not None else None
             seq += 1
 
@@ -120,53 +139,68 @@ def flow(grid: Grid, units=None) -> None:
     else:  # pour in just "units" units of water
         continue_pos = None  # not in use
         for unit in range(units):
-            if unit % 100 == 0: print(unit)
-            ret = flow_one(grid, start_pos=continue_pos)
+            if debug.enabled and unit % 100 == 0: debug(unit)
+            ret = flow_one(grid, y_lo, y_hi, start_pos=continue_pos)
 
             #if len(ret) > 1:
             #    continue_pos = ret[1] if ret[1] is not None else None
 
 
-def set_slash_ifnot_bar(grid: Grid, pos: Pos):
+def set_slash_ifnot_bar(cells: bytearray, i: int):
     # do not replace "|" with "/"... for the internal logic to work
-    if grid.get(pos, ".") != "|":
-        grid[pos] = "/"
+    if cells[i] != FALLING:
+        cells[i] = RUNNING
 
 
-def flow_one(grid: Grid, start_pos:Pos = None):
+def flow_one(grid: Grid, y_lo: int, y_hi: int, start_pos:Pos = None):
     """
-    
+
     Arguments:
         grid {Grid} -- [grid]
-    
+        y_lo {int} -- [the top of the grid, water above this has left the grid]
+        y_hi {int} -- [the bottom of the grid, water below this has left the grid]
+
     Keyword Arguments:
         start_pos {Pos} -- [where to start the water flow. NO LONGER USED] (default: {None})
-    
+
     Returns:
         True -- When all is done, water has made every point wet that it can
-        (xi,yi), (xs,ys)  --  tuple of the location where the water unit ended up, 
+        (xi,yi), (xs,ys)  --  tuple of the location where the water unit ended up,
                                 tuple with new start position for the next water unit (NO LONGER USED)
 
     "~" denotes standing water
     "|" denotes falling water / also the place where the falling water hits obstacle
     "/" denotes running water (water that cannot / has not settled)
-    "b" denote running water, but it also means "block", a direction where we do not need to go 
+    "b" denote running water, but it also means "block", a direction where we do not need to go
         (exhausted direction, where water will just pour out of the grid without touching any new points)
         "b" also ensure that flowing water end up going both left and right
+
+    The water moves in the flat grid cells: i is the index of the current position,
+    i - 1 and i + 1 are left and right of it, i + width below it.
     """
 
+    if counts.enabled:
+        counts["flow_one calls"] += 1
+
     # Where to start (NO LONGER IN USE; start from the water source each time)
     if not start_pos:
-        curr_x, curr_y = WATER_SPRING
+        curr_pos = WATER_SPRING
     else:
         if grid.get(start_pos, ".") != "~":
-            curr_x, curr_y = start_pos
+            curr_pos = start_pos
         else:
-            curr_x, curr_y = WATER_SPRING
+            curr_pos = WATER_SPRING
+    if counts.enabled and curr_pos == WATER_SPRING:
+        counts["restarts from WATER_SPRING"] += 1
 
+    cells, width = grid.cells, grid.width
+    i = grid.index(*curr_pos)
+    # water at an index outside of i_top...i_bottom - 1 (the rows y_lo...y_hi) has left the grid
+    i_top = grid.index(grid.x_lo, y_lo)
+    i_bottom = grid.index(grid.x_lo, y_hi + 1)
 
     # NO LONGER IN USE
-    suggested_start_pos = [None, (curr_x, curr_y)]  # use instead of WATER_SPRING to save unnecessary compute
+    suggested_start_pos = [None, curr_pos]  # use instead of WATER_SPRING to save unnecessary compute
 
     num_bouncebacks = 0  # how many times the water has bounced back from obstacle (within the same level y)
     direction = "down"
@@ -188,107 +222,114 @@ def flow_one(grid: Grid, start_pos:Pos = None):
 
     # take one step at a time
     while True:
+        if counts.enabled:
+            counts["water steps"] += 1
         # case out of grid
-        if curr_y > y_hi or curr_y < y_lo:
+        if i >= i_bottom or i < i_top:
             # water flowed out of the grid... block the prev turn location with "b" so that we do not end up here any more
-            print("OUT OF BOUNDS", curr_x, curr_y)
-            print("Setting b on", prev_turn_loc)
-            if not prev_turn_loc:
+            if debug.enabled:
+                debug("OUT OF BOUNDS", *grid.position(i))
+                debug("Setting b on", prev_turn_loc if prev_turn_loc is None else grid.position(prev_turn_loc))
+            if prev_turn_loc is None:
                 # this is the "finished" criterion. This will happen at the top of the grid. -> whole grid exhausted
-                return True 
+                return True
             else:
-                grid[prev_turn_loc] = "b"
-                return (curr_x, curr_y), suggested_start_pos[0]
+                cells[prev_turn_loc] = BLOCK
+                return grid.position(i), suggested_start_pos[0]
+
+        below = cells[i + width]
 
         # case water can fall down
-        if grid.get((curr_x, curr_y+1), ".") in (".", "|", "/"):
+        if below in (SAND, FALLING, RUNNING):
             if direction != "down":  # just started to go down
                 suggested_start_pos.pop(0)  # remove leftmost
-                suggested_start_pos.append((curr_x, curr_y+1))   # NO LONGER IN USE
-            grid[(curr_x, curr_y+1)] = "|"
-            curr_x, curr_y = curr_x, curr_y+1
+                suggested_start_pos.append(grid.position(i + width))   # NO LONGER IN USE
+            cells[i + width] = FALLING
+            i += width
             num_bouncebacks = 0  # this is level-specific -> reset
             direction = "down"
             continue
 
         # case goind down but there is a flowing water with a block "b" below
-        if direction == "down" and grid.get((curr_x, curr_y+1), ".") == "b":
+        if direction == "down" and below == BLOCK:
             # no need to continue. Already processed appropriately
-            if not prev_turn_loc:
+            if prev_turn_loc is None:
                 # finished criterion
-                return True 
+                return True
             else:
                 # set block to the previous turn
-                grid[prev_turn_loc] = "b"
-                return (curr_x, curr_y), None  # start from beginning
+                cells[prev_turn_loc] = BLOCK
+                return grid.position(i), None  # start from beginning
+
+        left, right = cells[i - 1], cells[i + 1]
 
-        # case was falling down, blocked below and from both sides, with at least on side with "b" 
+        # case was falling down, blocked below and from both sides, with at least on side with "b"
         # --> then all water will just pour out of the grid. Set block "b" to prev turn
         if (direction == "down"
-            and grid.get((curr_x, curr_y+1), ".") not in (".", "|")
-            and grid.get((curr_x-1, curr_y), ".") in (CLAY, "~", "b")
-            and grid.get((curr_x+1, curr_y), ".") in (CLAY, "~", "b")
-            and (grid.get((curr_x-1, curr_y), ".") == "b" or grid.get((curr_x+1, curr_y), ".") == "b")):
+            and below not in (SAND, FALLING)
+            and left in (CLAY_CELL, STANDING, BLOCK)
+            and right in (CLAY_CELL, STANDING, BLOCK)
+            and (left == BLOCK or right == BLOCK)):
 
-            if not prev_turn_loc:
+            if prev_turn_loc is None:
                 # all done
                 return True
             else:
-                grid[prev_turn_loc] = "b"
+                cells[prev_turn_loc] = BLOCK
 
-            return (curr_x, curr_y), None  # start from beginning
+            return grid.position(i), None  # start from beginning
 
         # case was going down, now down direction is blocked
-        if direction == "down" and grid.get((curr_x, curr_y+1), ".") not in (".", "|"):
+        if direction == "down" and below not in (SAND, FALLING):
             # case blocked from both sides"
-            if grid.get((curr_x-1, curr_y), ".") in (CLAY, "~") and grid.get((curr_x+1, curr_y), ".") in (CLAY, "~"):  # oli "b"
+            if left in (CLAY_CELL, STANDING) and right in (CLAY_CELL, STANDING):  # oli "b"
                 # blocked from both sides --> "|" becomes "~"
-                grid[(curr_x, curr_y)] = "~"
-                return (curr_x, curr_y), suggested_start_pos[0]
-            elif grid.get((curr_x-1, curr_y), ".") in (CLAY, "~", "b"):
+                cells[i] = STANDING
+                return grid.position(i), suggested_start_pos[0]
+            elif left in (CLAY_CELL, STANDING, BLOCK):
                 # left blocked, go right
-                if grid.get((curr_x-1, curr_y), ".") == "b": 
+                if left == BLOCK:
                     max_bouncebacks = 99  # essentially: cannot become standing water as there is route to out of grid
-                else: 
+                else:
                     max_bouncebacks = 0  # when encounters next obstacle, can form standing water
                 direction = "right"
-                prev_turn_loc = (curr_x+1, curr_y)
-                set_slash_ifnot_bar(grid, (curr_x+1, curr_y))
-                curr_x, curr_y = curr_x+1, curr_y
-            elif grid.get((curr_x+1, curr_y), ".") in (CLAY, "~", "b"):
+                prev_turn_loc = i + 1
+                set_slash_ifnot_bar(cells, i + 1)
+                i += 1
+            elif right in (CLAY_CELL, STANDING, BLOCK):
                 # right blocked, go left
-                if grid.get((curr_x+1, curr_y), ".") == "b":
+                if right == BLOCK:
                     max_bouncebacks = 99  # essentially: cannot become standing water as there is route to out of grid
                 else:
                     max_bouncebacks = 0  # when encounters next obstacle, can form standing water
                 direction = "left"
-                prev_turn_loc = (curr_x-1, curr_y)
-                set_slash_ifnot_bar(grid, (curr_x-1, curr_y))
-                curr_x, curr_y = curr_x-1, curr_y
-           
+                prev_turn_loc = i - 1
+                set_slash_ifnot_bar(cells, i - 1)
+                i -= 1
+
             # else go left and require bounceback (do not form standing water when obstacle is encountered, switch dir instead)
             else:
                 max_bouncebacks = 1
                 direction = "left"
-                prev_turn_loc = (curr_x-1, curr_y)
-                set_slash_ifnot_bar(grid, (curr_x-1, curr_y))
-                curr_x, curr_y = curr_x-1, curr_y
-            
+                prev_turn_loc = i - 1
+                set_slash_ifnot_bar(cells, i - 1)
+                i -= 1
+
             continue
 
         # going left, can continue
-        if direction == "left" and grid.get((curr_x-1, curr_y), ".") not in (CLAY, "~"):
-            set_slash_ifnot_bar(grid, (curr_x-1, curr_y))
-            curr_x, curr_y = curr_x-1, curr_y
+        if direction == "left" and left not in (CLAY_CELL, STANDING):
+            set_slash_ifnot_bar(cells, i - 1)
+            i -= 1
             continue
 
         # going left but blocked
-        if direction == "left" and grid.get((curr_x-1, curr_y), ".") in (CLAY, "~"):
+        if direction == "left" and left in (CLAY_CELL, STANDING):
             # depends on max_bouncebacks
             if num_bouncebacks >= max_bouncebacks:
                 # okay, forms standing water
-                grid[(curr_x, curr_y)] = "~"
-                return (curr_x, curr_y), suggested_start_pos[0]
+                cells[i] = STANDING
+                return grid.position(i), suggested_start_pos[0]
             else:
                 # bounce back, do not yet form standing water
                 num_bouncebacks += 1
@@ -296,17 +337,17 @@ def flow_one(grid: Grid, start_pos:Pos = None):
                 continue
 
         # going right, can continue
-        if direction == "right" and grid.get((curr_x+1, curr_y), ".") not in (CLAY, "~"):
-            set_slash_ifnot_bar(grid, (curr_x+1, curr_y))
-            curr_x, curr_y = curr_x+1, curr_y
+        if direction == "right" and right not in (CLAY_CELL, STANDING):
+            set_slash_ifnot_bar(cells, i + 1)
+            i += 1
             continue
 
         # going right but blocked
-        if direction == "right" and grid.get((curr_x+1, curr_y), ".") in (CLAY, "~"):
+        if direction == "right" and right in (CLAY_CELL, STANDING):
             if num_bouncebacks >= max_bouncebacks:
                 # form standing water
-                grid[(curr_x, curr_y)] = "~"
-                return (curr_x, curr_y), suggested_start_pos[0]
+                cells[i] = STANDING
+                return grid.position(i), suggested_start_pos[0]
             else:
                 # do not yet form standing water but switch direction
                 num_bouncebacks += 1
@@ -315,41 +356,69 @@ def flow_one(grid: Grid, start_pos:Pos = None):
 
 
 
-# UNIT TEST CASE:
-grid = generate_grid(RAW_TEST)
-
-# Only consider what happens between:
-y_lo = min(y for x, y in grid.keys())
-y_hi = max(y for x, y in grid.keys())
+def simulate(grid: Grid) -> Grid:
+    """
+    flows the water through a copy of the given grid until finished, returns the copy
+    """
+    grid = grid.copy()
 
-flow(grid)
-print(show(grid))
-print("Water count: ", count_squares_reached_by_water(grid))
-assert count_squares_reached_by_water(grid) == 57
-assert count_squares_with_standing_water(grid) == 29
+    # Only consider what happens between (from the spring down to the lowest clay):
+    y_lo = grid.y_lo
+    y_hi = clay_rows(grid)[1]
 
+    flow(grid, y_lo, y_hi)
 
-# PART 1:
-# How many tiles can the water reach within the range of y values in your scan?
+    return grid
 
-with open("data/day17.txt") as f:
-    actual_input = f.read()
 
-act_grid = generate_grid(actual_input)
+def parse_puzzle(text: str) -> Grid:
+    return generate_grid(text)
 
-# Only consider what happens between:
-y_lo = min(y for x, y in act_grid.keys())
-y_hi = max(y for x, y in act_grid.keys())
 
-flow(act_grid)
-print(show(act_grid))
-print("Water count (wet tiles): ", count_squares_reached_by_water(act_grid))
-# Your puzzle answer was 31383
+# PART 1:
+# How many tiles can the water reach within the range of y values in your scan?
+def part1(grid: Grid) -> int:
+    return count_squares_reached_by_water(simulate(grid))
+    # Your puzzle answer was 31383
 
 
 ####################
 # PART 2:
 # how many tiles contain water after the fountain runs out of water
 # --> only those ~ will stay
-print("Stading water count: ", count_squares_with_standing_water(act_grid))
-# Your puzzle answer was 25376
\ No newline at end of file
+def part2(grid: Grid) -> int:
+    return count_squares_with_standing_water(simulate(grid))
+    # Your puzzle answer was 25376
+
+
+def run_tests():
+    RAW_TEST = """x=495, y=2..7
+y=7, x=495..501
+x=501, y=3..7
+x=498, y=2..4
+x=506, y=1..2
+x=498, y=10..13
+x=504, y=10..13
+y=13, x=498..504"""
+
+    # UNIT TEST CASE:
+    grid = simulate(generate_grid(RAW_TEST))
+
+    assert count_squares_reached_by_water(grid) == 57
+    assert count_squares_with_standing_water(grid) == 29
+
+
+def main():
+    run_tests()
+
+    with open(INPUT_FILE) as f:
+        grid = parse_puzzle(f.read())
+
+    act_grid = simulate(grid)
+    print(show(act_grid))
+    print("Water count (wet tiles): ", count_squares_reached_by_water(act_grid))
+    print("Stading water count: ", count_squares_with_standing_water(act_grid))
+
+
+if __name__ == "__main__":
+    main()
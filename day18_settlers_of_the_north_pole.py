@@ -3,88 +3,72 @@ Advent of code, 2018
 Day 18: Settlers of The North Pole
 """
 
-from typing import Dict, Tuple
-from collections import Counter, defaultdict
+import hashlib
+from typing import Dict, List, Tuple
+from collections import Counter
+from grid import Grid, Pos, NEIGHBORS_8
+import checkpoint
 
-Pos = Tuple[int, int]
-Grid = Dict[Pos, str]
+INPUT_FILE = "data/day18.txt"
 
-# given test case
-RAW = """.#.#...|#.
-.....#|##|
-.|..|...#.
-..|#.....#
-#.#|||#|#|
-...#.||...
-.|....|...
-||...#|.#|
-|.||||..|.
-...#.|..|."""
+checkpoints = checkpoint.store("day18", every=100)  # minutes
 
-def parse_initial_state(string:str) -> Grid:
-    lines = string.splitlines()
-    grid = {(x,y): char for y, line in enumerate(lines) for x, char in enumerate(line)}
+# the acre contents as they are stored in the grid cells (bytes)
+OPEN, TREES, LUMBERYARD = b".|#"
 
-    return grid
+def parse_initial_state(string:str) -> Grid:
+    return Grid.from_text(string)
 
 
 def show(grid:Grid, do_print=True) -> None:
-    x_lo = min(x for x, y in grid.keys())
-    x_hi = max(x for x, y in grid.keys())
-    y_lo = min(y for x, y in grid.keys())
-    y_hi = max(y for x, y in grid.keys())
-
-    rows = [[grid.get((x, y)) 
-            for x in range(x_lo, x_hi + 1)]
-            for y in range(y_lo, y_hi + 1)]
-
-    string = "\n".join(''.join(row) for rowno, row in enumerate(rows))
+    string = grid.render()
     if do_print:
         print(string)
-    
+
     return string
 
 
 def get_adjacent_counts(grid: Grid, pos: Pos) -> Dict[str, int]:  # outputs a Counter
-    xp, yp = pos
-    adj_counts = Counter([grid.get((x,y)) 
-                            for x in range(xp-1, xp+2) 
-                            for y in range(yp-1, yp+2) 
-                            if (x,y) != (xp,yp)])  # except x,y itself
+    adj_counts = Counter([grid[neighbor] for neighbor in grid.neighbors(pos, NEIGHBORS_8)])
 
     return adj_counts
 
 
 def get_resource_value(grid: Grid) -> int:
-    num_wooden = sum(1 for content in grid.values() if content == "|")
-    num_lumberyard = sum(1 for content in grid.values() if content == "#")
+    num_wooden = grid.count("|")
+    num_lumberyard = grid.count("#")
 
     return num_wooden * num_lumberyard
 
 
-def step(grid: Grid, num_minutes: int = 1, show_grid=True) -> Grid:
+def step(grid: Grid, num_minutes: int = 1, show_grid=True, neighbors: List[Tuple[int, ...]] = None) -> Grid:
+    # neighbors: the neighbor indexes of each cell, the same every minute (pass them in when stepping one minute at a time)
+    if neighbors is None:
+        neighbors = grid.neighbor_indexes(NEIGHBORS_8)
+
     for rnd in range(num_minutes):
         new_grid = grid.copy()
+        cells, new_cells = grid.cells, new_grid.cells
 
-        for pos, content in grid.items():
-            adj_counts = get_adjacent_counts(grid, pos)
+        for i, content in enumerate(cells):
+            adjacent = [cells[j] for j in neighbors[i]]
             # An open acre will become filled with trees if three or more adjacent acres contained trees
             # Otherwise, nothing happens.
-            if content == ".":
-                if adj_counts["|"] >= 3:
-                    new_grid[pos] = "|"
+            if content == OPEN:
+                if adjacent.count(TREES) >= 3:
+                    new_cells[i] = TREES
 
-            # An acre filled with trees will become a lumberyard if three or more adjacent acres were lumberyards. 
+            # An acre filled with trees will become a lumberyard if three or more adjacent acres were lumberyards.
             # Otherwise, nothing happens.
-            elif content == "|":
-                if adj_counts["#"] >= 3:
-                    new_grid[pos] = "#"
+            elif content == TREES:
+                if adjacent.count(LUMBERYARD) >= 3:
+                    new_cells[i] = LUMBERYARD
 
-            # An acre containing a lumberyard will remain a lumberyard if it was adjacent to at least one other lumberyard 
+            # An acre containing a lumberyard will remain a lumberyard if it was adjacent to at least one other lumberyard
             # and at least one acre containing trees. Otherwise, it becomes open.
-            elif content == "#":
-                if not (adj_counts["#"] >= 1 and adj_counts["|"] >= 1):
-                    new_grid[pos] = "."
+            elif content == LUMBERYARD:
+                if not (LUMBERYARD in adjacent and TREES in adjacent):
+                    new_cells[i] = OPEN
 
         grid = new_grid  # apply all changes at the same time
 
@@ -95,11 +79,79 @@ def step(grid: Grid, num_minutes: int = 1, show_grid=True) -> Grid:
     return grid
 
 
-# Test case with unit tests
-test_grid = parse_initial_state(RAW)
+def resource_value_after(grid: Grid, num_minutes: int) -> int:
+    """
+    returns the total resource value after num_minutes minutes.
+
+    Stepping 1_000_000_000 minutes would take infeasibly long. There probably is a repeating state -> starts to cycle -> can skip ahead.
+    The process is deterministic. If we see some state again, we know we will be cycling between the start and end state indefinitely.
+    (With the actual input we see the same setup at i= 416, 444,... i.e. a cycle of 28 minutes)
+    """
+    seen_dict = dict()  # the grid cells (as bytes) as key, minute as value
+    neighbors = grid.neighbor_indexes(NEIGHBORS_8)
+
+    first_minute = 0
+    key = f"{num_minutes} minutes from {grid!r} {hashlib.sha256(grid.cells).hexdigest()}"
+    saved = checkpoints.load(key) if checkpoints.enabled else None
+    if saved is not None:
+        # only the state is saved, not the history: the cycle shows up again within one period of the resumed run
+        cells, first_minute = saved
+        grid = grid.copy()
+        grid.cells[:] = cells
+
+    for minute in range(first_minute, num_minutes):
+        state = bytes(grid.cells)
+        if checkpoints.enabled and minute and minute % checkpoints.every == 0:
+            checkpoints.save(key, (state, minute))
+
+        if state in seen_dict:
+            cycle_start = seen_dict[state]
+            cycle_len = minute - cycle_start
+            # skip all full cycles, then take the remaining steps
+            remaining = (num_minutes - minute) % cycle_len
+            return get_resource_value(step(grid, remaining, show_grid=False, neighbors=neighbors))
+
+        seen_dict[state] = minute
+        grid = step(grid, 1, show_grid=False, neighbors=neighbors)
+
+    return get_resource_value(grid)
+
+
+def parse_puzzle(text: str) -> Grid:
+    return parse_initial_state(text)
 
-test_grid = step(test_grid, 10)
-assert show(test_grid) == """.||##.....
+
+def part1(grid: Grid) -> int:
+    return get_resource_value(step(grid, 10, show_grid=False))
+    # 384416 was the right answer
+
+
+###############
+# PART TWO:
+# What will the total resource value of the lumber collection area be after 1_000_000_000 minutes?
+def part2(grid: Grid) -> int:
+    return resource_value_after(grid, 1_000_000_000)
+    # 195776 is the right answer
+
+
+def run_tests():
+    # given test case
+    RAW = """.#.#...|#.
+.....#|##|
+.|..|...#.
+..|#.....#
+#.#|||#|#|
+...#.||...
+.|....|...
+||...#|.#|
+|.||||..|.
+...#.|..|."""
+
+    # Test case with unit tests
+    test_grid = parse_initial_state(RAW)
+
+    test_grid = step(test_grid, 10, show_grid=False)
+    assert show(test_grid, do_print=False) == """.||##.....
 ||###.....
 ||##......
 |##.....##
@@ -110,55 +162,19 @@ assert show(test_grid) == """.||##.....
 ||||#|||||
 ||||||||||"""
 
-assert get_resource_value(test_grid) == 1147
+    assert get_resource_value(test_grid) == 1147
 
 
-# Read in actual problem input:
-with open("data/day18.txt") as f:
-    grid_init = parse_initial_state(f.read())
+def main():
+    run_tests()
 
-grid = step(grid_init, 10)
-print("Total res. value after 10 rounds: ", get_resource_value(grid))
-# 384416 was the right answer
+    # Read in actual problem input:
+    with open(INPUT_FILE) as f:
+        grid_init = parse_puzzle(f.read())
 
+    print("Total res. value after 10 rounds: ", part1(grid_init))
+    print("Resource value after 1000000000 minutes: ", part2(grid_init))
 
-###############
-# PART TWO:
-# What will the total resource value of the lumber collection area be after 1_000_000_000 minutes?
-# Would take infeasibly long. There probably is a repeating state -> starts to cycle -> can skip ahead.
-
-# the process is deterministic. If we see some state again, we know we will be cycling between the start and end state indefinitely
-
-FIND_CYCLE = False
-
-if FIND_CYCLE:
-    seen = set()
-    seen_dict = defaultdict(list) # str representation of the state as key, iteration# as values
-
-    grid = grid_init
-    for i in range(10000):
-        grid = step(grid, 1, show_grid=False)
-        print(f"Total res. value after {i+1} rounds: ", get_resource_value(grid))
-        grid_str = show(grid, do_print=False)
-        seen_dict[grid_str].append(i)
-        if grid_str in seen:
-            print("seen the following setup before:")
-            print(show(grid))
-            print("\nseen_dict:")
-            print(seen_dict[grid_str])
-            break
-        else:
-            seen.add(grid_str)
-
-# We will see the same setup at i= 416, 444,... (i starts at zero)
-
-# thus we can first take 416 steps, then skip quite a lot
-# 416 + x*28 = 1_000_000_000
-# x = (1_000_000_000 - 416) / 28 = 35714270.85714286
-# the decimal part corresponds to 24 steps
-# so take 416 + 24 = 440 steps and then check the resource value. This should match to res.value after 1_000_000_000 minutes
-
-print("\n\nGetting resource value after 1000000000 minutes...")
-grid = step(grid_init, 440, show_grid=False)
-print("Resource value after 1000000000 minutes: ", get_resource_value(grid))
-# 195776 is the right answer
+
+if __name__ == "__main__":
+    main()
@@ -5,19 +5,14 @@ Part Two was... different.
 """
 
 from day16_chronal_classification import Instruction
-from typing import List
+from typing import List, Tuple
+import metrics
 
-Registers = List[int]
+INPUT_FILE = "data/day19.txt"
 
+counts = metrics.counters("day19")
 
-RAW = """#ip 0
-seti 5 0 1
-seti 6 0 2
-addi 0 1 0
-addr 1 2 3
-setr 1 0 0
-seti 8 0 4
-seti 9 0 5"""
+Registers = List[int]
 
 
 def parse_input(input_str: str):
@@ -48,6 +43,8 @@ def run_prog_until_halt(registers: Registers, instructions: List[Instruction], i
         instruction = instructions[instruction_idx]
         registers = instruction.process(registers)
         registers[ip] += 1
+        if counts.enabled:
+            counts[("instructions at pc", instruction_idx)] += 1
 
     return registers
 
@@ -64,46 +61,64 @@ def run_prog_one_step(registers: Registers, instructions: List[Instruction], ip:
     instruction = instructions[instruction_idx]
     registers = instruction.process(registers)
     registers[ip] += 1
+    if counts.enabled:
+        counts[("instructions at pc", instruction_idx)] += 1
 
     if verbose: print("After:\t", instruction_idx, registers)
 
     return registers
 
 
-# With test input
-ip, instrs = parse_input(RAW)
-registers = [0, 0, 0, 0, 0, 0]
+def get_factors(n:int) -> List[int]:
+    factors = []
+    for i in range(1, n+1):
+        if n % i == 0: factors.append(i)
+
+    return factors
+
 
-registers = run_prog_until_halt(registers, instrs, ip)
-assert registers[0] == 7
+def find_target_number(registers: Registers, instructions: List[Instruction], ip: int) -> int:
+    """
+    runs the setup part of the program (the jump to the end of the program and back to instruction 1),
+    returns the number whose factors the main loop of the program sums up (the largest register value)
+    """
+    registers = run_prog_one_step(registers, instructions, ip)
+    while registers[ip] != 1:
+        registers = run_prog_one_step(registers, instructions, ip)
 
+    return max(registers)
 
-# Then with actual input
-# PART ONE:
-# What value is left in register 0 when the background process halts?
 
-with open("data/day19.txt") as f:
-    inp = f.read()
+def parse_puzzle(text: str) -> Tuple[int, List[Instruction]]:
+    return parse_input(text)
 
-ip, instrs = parse_input(inp)
-registers = [0, 0, 0, 0, 0, 0]
 
-registers = run_prog_until_halt(registers, instrs, ip)
-print("Part One: value left in register 0 when the background process halts: ", registers[0])
-# 960 is the right answer
+# PART ONE:
+# What value is left in register 0 when the background process halts?
+def part1(puzzle: Tuple[int, List[Instruction]]) -> int:
+    ip, instrs = puzzle
+    registers = [0, 0, 0, 0, 0, 0]
+
+    registers = run_prog_until_halt(registers, instrs, ip)
+    return registers[0]
+    # 960 is the right answer
 
 
 ################
 # Part Two
-#A new background process immediately spins up in its place. 
+#A new background process immediately spins up in its place.
 #It appears identical, but on closer inspection, you notice that this time, register 0 started with the value 1.
 
 # What value is left in register 0 when this new background process halts?
-registers = [1, 0, 0, 0, 0, 0]
+def part2(puzzle: Tuple[int, List[Instruction]]) -> int:
+    ip, instrs = puzzle
+    registers = [1, 0, 0, 0, 0, 0]
 
+    #registers = run_prog_until_halt(registers, instrs, ip, verbose=True)
+    # Takes ages... the answer is the sum of all factors of the number the setup part leaves in r[4] (see notes below)
+    return sum(get_factors(find_target_number(registers, instrs, ip)))
+    # Correct answer: 10750428
 
-#registers = run_prog_until_halt(registers, instrs, ip, verbose=True)
-#print("Part Two: value left in register 0 when the background process halts: ", registers[0])
 
 # Takes ages... need to reason the solution
 # Figure out what the "assembly code" does and how the program will run
@@ -111,7 +126,7 @@ registers = [1, 0, 0, 0, 0, 0]
 """
 # instruction pointer is bound to the last register (id 5)
 
-start register values before starts looping: 
+start register values before starts looping:
 
 At the beginning we do:
 0 [1, 0, 0, 0, 0, 0]
@@ -190,10 +205,10 @@ r[1] += 1
 When will this lead to breaking out of the cycle?
 
 # Reduced:
-3   mulr 2 1 3      r[3] = r[2]*r[1] 
+3   mulr 2 1 3      r[3] = r[2]*r[1]
 4   eqrr 3 4 3      r[3] = 1 if r[3] == 10551293 else r[3] = 0
 
-    
+
 5   addr 3 5 5      r[5] += r[3]
 6   addi 5 1 5      r[5] += 1
 8   addi 1 1 1      r[1] += 1
@@ -267,7 +282,7 @@ r[2]*r[1] == 10551293. Then we increment r[0] by r[2].
 4   eqrr 3 4 3      r[3] = 1 if r[3] == 10551293 else r[3] = 0
     ## check this case when r[2] is increased...
     ## when r[2] and r[1] are factors of 10551293
-        r[3] = 1 --> 
+        r[3] = 1 -->
         --> next op 5: addr 3 5 5      r[5] += r[3]--> r[5] = 7
         --> op 7: addr 2 0 0    r[0] += r[2]
 
@@ -277,13 +292,33 @@ After these the program will hit operation r[5] = r[5]*r[5] which will throw op
 """
 
 
-def get_factors(n:int) -> List[int]:
-    factors = []
-    for i in range(1, n+1):
-        if n % i == 0: factors.append(i)
+def run_tests():
+    RAW = """#ip 0
+seti 5 0 1
+seti 6 0 2
+addi 0 1 0
+addr 1 2 3
+setr 1 0 0
+seti 8 0 4
+seti 9 0 5"""
+
+    # With test input
+    ip, instrs = parse_input(RAW)
+    registers = [0, 0, 0, 0, 0, 0]
+
+    registers = run_prog_until_halt(registers, instrs, ip)
+    assert registers[0] == 7
+
+
+def main():
+    run_tests()
+
+    with open(INPUT_FILE) as f:
+        puzzle = parse_puzzle(f.read())
+
+    print("Part One: value left in register 0 when the background process halts: ", part1(puzzle))
+    print("Part Two: value left in register 0 when the new background process halts: ", part2(puzzle))
 
-    return factors
 
-print("Part Two")
-print("The answer should be:", sum(get_factors(10551293)))
-# Correct answer: 10750428
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Advent of code, 2018
+Reference vs fast: solves each part with the original implementations and with the faster ones, checks that
+the answers match and reports the speedup
+
+A day module that gets a faster implementation of something keeps the original one next to it, and names
+the pairs (fast -> reference, functions or methods) in REFERENCE_IMPLEMENTATIONS:
+    REFERENCE_IMPLEMENTATIONS = {"reduce_polymer": "reduce_polymer_reference"}
+    REFERENCE_IMPLEMENTATIONS = {"Plantation.evolve": "Plantation.evolve_reference"}
+The parts use the fast ones. Here every part of such a day is solved twice on the same input: as is, and
+with the reference implementations swapped in for the fast ones. Any difference in the answers is reported
+(and the exit code is 1). Besides the input of the day, the parts can be checked on synthetic inputs of
+different sizes (generators.py, --sizes), so that the check covers more than the one input that happens to be at hand.
+Both implementations are run once untimed first (lazy imports, first calls), then timed --repeat times in turns,
+and the speedup is that of the best times.
+
+Usage:
+    python equivalence.py                      # every day with REFERENCE_IMPLEMENTATIONS, its own input
+    python equivalence.py 5 --sizes 1000 5000 --seeds 3
+"""
+
+import argparse
+import contextlib
+import sys
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Tuple
+
+import generators
+import puzzles
+
+REPEAT = 3  # timed runs of each implementation
+
+
+class Comparison(NamedTuple):
+    day: int
+    part: int
+    input: str  # "day input" or "size N seed S"
+    fast_answer: Any
+    reference_answer: Any
+    fast_s: float
+    reference_s: float
+
+    @property
+    def match(self) -> bool:
+        return self.fast_answer == self.reference_answer
+
+    @property
+    def speedup(self) -> float:
+        return self.reference_s / self.fast_s if self.fast_s > 0 else float("inf")
+
+
+def reference_implementations(day: int) -> Dict[str, str]:
+    return getattr(puzzles.load_module(day), "REFERENCE_IMPLEMENTATIONS", {})
+
+
+def days_with_references() -> List[int]:
+    return [day for day in puzzles.DAY_MODULES if reference_implementations(day)]
+
+
+def _resolve(module: ModuleType, dotted_name: str) -> Tuple[Any, str]:
+    """
+    "Plantation.evolve" -> (the Plantation class, "evolve")
+    """
+    *owner_names, attr = dotted_name.split(".")
+    owner = module
+    for name in owner_names:
+        owner = getattr(owner, name)
+
+    return owner, attr
+
+
+@contextlib.contextmanager
+def reference_engines(day: int) -> Iterator[None]:
+    """
+    within the with block, the fast implementations of the day are replaced by the reference ones
+    """
+    module = puzzles.load_module(day)
+    originals = []
+    try:
+        for fast_name, reference_name in reference_implementations(day).items():
+            owner, attr = _resolve(module, fast_name)
+            reference_owner, reference_attr = _resolve(module, reference_name)
+            originals.append((owner, attr, vars(owner)[attr]))
+            setattr(owner, attr, vars(reference_owner)[reference_attr])
+        yield
+    finally:
+        for owner, attr, original in reversed(originals):
+            setattr(owner, attr, original)
+
+
+def _timed(solver: Callable[[Any], Any], puzzle: Any) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    answer = solver(puzzle)
+    return answer, time.perf_counter() - start
+
+
+def compare_part(day: int, part: int, puzzle: Any, input_name: str, repeat: int = REPEAT) -> Comparison:
+    solver = puzzles.get_solver(day, part)
+
+    def reference_solver(puzzle: Any) -> Any:
+        with reference_engines(day):
+            return solver(puzzle)
+
+    # untimed warmup, so that neither one is charged for the lazy imports and the first calls
+    fast_answer, reference_answer = solver(puzzle), reference_solver(puzzle)
+
+    # the best of the timed runs, taken in turns so that neither one always runs on the other's leftovers
+    fast_s = reference_s = float("inf")
+    for i in range(repeat):
+        for implementation in ((solver, reference_solver) if i % 2 == 0 else (reference_solver, solver)):
+            seconds = _timed(implementation, puzzle)[1]
+            if implementation is solver:
+                fast_s = min(fast_s, seconds)
+            else:
+                reference_s = min(reference_s, seconds)
+
+    return Comparison(day=day, part=part, input=input_name, fast_answer=fast_answer, reference_answer=reference_answer,
+                      fast_s=fast_s, reference_s=reference_s)
+
+
+def inputs(day: int, sizes: List[int], seeds: int) -> Iterator[Tuple[str, Any]]:
+    """
+    (name, parsed puzzle): the input of the day, then the synthetic ones
+    """
+    yield "day input", puzzles.read_puzzle(day)
+    for size in sizes:
+        for seed in range(seeds):
+            yield f"size {size} seed {seed}", puzzles.parse_text(day, generators.generate(day, size, seed), use_cache=False)
+
+
+def compare_day(day: int, sizes: List[int] = (), seeds: int = 1, repeat: int = REPEAT) -> Iterator[Comparison]:
+    for input_name, puzzle in inputs(day, sizes, seeds):
+        for part in puzzles.available_parts(day):
+            yield compare_part(day, part, puzzle, input_name, repeat)
+
+
+def format_row(c: Comparison) -> str:
+    status = "ok" if c.match else f"MISMATCH: fast {c.fast_answer!r}, reference {c.reference_answer!r}"
+    return f"{c.day:>3} {c.part:>4}  {c.input:<20} {c.reference_s:>11.4f} {c.fast_s:>9.4f} {c.speedup:>8.1f}x  {status}"
+
+
+HEADER = f"{'day':>3} {'part':>4}  {'input':<20} {'reference s':>11} {'fast s':>9} {'speedup':>9}  answers"
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("days", nargs="*", type=int, help="days to check (default: every day with REFERENCE_IMPLEMENTATIONS)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[], help="also check on synthetic inputs of these sizes")
+    parser.add_argument("--seeds", type=int, default=1, help="number of synthetic inputs of each size")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="timed runs of each implementation, best one counts")
+    return parser
+
+
+def main(argv: List[str] = None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+
+    days = args.days or days_with_references()
+    for day in days:
+        if day not in puzzles.DAY_MODULES:
+            parser.error(f"No solution for day {day}")
+        if not reference_implementations(day):
+            parser.error(f"Day {day} has no REFERENCE_IMPLEMENTATIONS, nothing to compare")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    print(HEADER)
+    mismatches = 0
+    for day in days:
+        print(f"    (day {day}: " + ", ".join(f"{fast} vs {reference}"
+                                          for fast, reference in reference_implementations(day).items()) + ")")
+        for comparison in compare_day(day, args.sizes, args.seeds, args.repeat):
+            mismatches += not comparison.match
+            print(format_row(comparison), flush=True)
+
+    if mismatches:
+        print(f"{mismatches} mismatch(es)", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
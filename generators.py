@@ -0,0 +1,455 @@
+"""
+Advent of code, 2018
+Synthetic puzzle input generators
+
+One generator per day. A generator takes a size and a random.Random and returns the input text,
+in the same format as the actual puzzle inputs in data/, such that both parts of the solution terminate.
+What "size" means depends on the day, see SIZE_UNITS.
+
+Usage:
+    python generators.py DAY SIZE [--seed N]   # prints the input
+"""
+
+import argparse
+import random
+import string
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+# what the size of the generated input means, per day
+SIZE_UNITS = {
+    1: "frequency changes",
+    2: "box ids",
+    3: "claims",
+    4: "guard shifts",
+    5: "polymer units",
+    6: "coordinates",
+    7: "step requirements",
+    8: "tree nodes",
+    9: "marbles",
+    10: "points of light",
+    11: "(grid is always 300x300, size is ignored)",
+    12: "pots in the initial state",
+    13: "track loops",
+    14: "recipes",
+    15: "cave width and height",
+    16: "samples (and test program instructions)",
+    17: "clay veins",
+    18: "area width and height",
+    19: "number whose factors the program sums (runtime is quadratic in it)",
+    20: "directions in the route regex",
+}
+
+# sizes for the benchmark ladders: small enough that the smallest size is quick even for the slow solutions
+DEFAULT_SIZES = {
+    1: [1_000, 4_000, 16_000, 64_000],
+    2: [1_000, 4_000, 16_000, 64_000],
+    3: [250, 1_000, 4_000, 16_000],
+    4: [250, 1_000, 4_000, 16_000],
+    5: [5_000, 20_000, 80_000, 320_000],
+    6: [50, 100, 200, 400],
+    7: [50, 100, 200, 400],
+    8: [1_000, 4_000, 16_000, 64_000],
+    9: [10_000, 40_000, 160_000, 640_000],
+    10: [100, 400, 1_600, 6_400],
+    11: [300],
+    12: [100, 200, 400, 800],
+    13: [4, 16, 64, 256],
+    14: [1_000, 10_000, 100_000, 500_000],
+    15: [8, 12, 16, 24],
+    16: [250, 1_000, 4_000, 16_000],
+    17: [12, 24, 48, 96],
+    18: [10, 20, 40, 80],
+    19: [100, 200, 400, 800],
+    20: [500, 2_000, 8_000, 32_000],
+}
+
+
+def day01(size: int, rng: random.Random) -> str:
+    """
+    random changes with a small positive total drift. With more changes than the drift,
+    two prefix sums share a residue modulo the drift, so a frequency is guaranteed to repeat
+    """
+    changes = [rng.choice([-1, 1]) * rng.randint(1, 20) for _ in range(size - 1)]
+    drift = max(1, size // 10)
+    last = drift - sum(changes)
+    changes.append(last if last != 0 else drift)
+
+    return "\n".join(f"{change:+d}" for change in changes)
+
+
+def day02(size: int, rng: random.Random) -> str:
+    """
+    random ids of 26 lowercase letters, with one pair of ids that differ by exactly one character
+    """
+    ids = ["".join(rng.choice(string.ascii_lowercase) for _ in range(26)) for _ in range(size - 1)]
+
+    # the pair: copy an id and change one character
+    original = rng.choice(ids)
+    pos = rng.randrange(26)
+    other_char = rng.choice([char for char in string.ascii_lowercase if char != original[pos]])
+    ids.insert(rng.randrange(len(ids) + 1), original[:pos] + other_char + original[pos+1:])
+
+    return "\n".join(ids)
+
+
+def day03(size: int, rng: random.Random) -> str:
+    """
+    claims come in overlapping pairs, scattered over the fabric,
+    plus exactly one claim that is off to the side and does not overlap any other
+    """
+    side = max(100, int(15 * size ** 0.5))
+    claims = []
+    while len(claims) < size - 1:
+        x, y = rng.randrange(side), rng.randrange(side)
+        w, h = rng.randint(5, 30), rng.randint(5, 30)
+        claims.append((x, y, w, h))
+        claims.append((x + rng.randint(0, w - 1), y + rng.randint(0, h - 1), rng.randint(5, 30), rng.randint(5, 30)))
+    claims = claims[:size - 1]
+    if len(claims) % 2:  # the last pair was cut in half, pair it with its predecessor instead
+        x, y, w, h = claims[-2]
+        claims[-1] = (x + 1, y + 1, w, h)
+
+    rng.shuffle(claims)
+    claims.insert(rng.randrange(len(claims) + 1), (side + 100, 0, rng.randint(5, 30), rng.randint(5, 30)))
+
+    return "\n".join(f"#{id} @ {x},{y}: {w}x{h}" for id, (x, y, w, h) in enumerate(claims, start=1))
+
+
+def day04(size: int, rng: random.Random) -> str:
+    """
+    one shift per day. Each guard falls asleep at least once during the shift. Lines are shuffled, as in the actual input
+    """
+    guards = [rng.randint(10, 3500) for _ in range(max(2, int(size ** 0.5)))]
+    start = datetime(1518, 1, 1)
+
+    lines = []
+    for day in range(size):
+        date = start + timedelta(days=day)
+        begins = date - timedelta(minutes=rng.randint(1, 10)) if rng.random() < 0.7 else date + timedelta(minutes=rng.randint(0, 5))
+        lines.append(f"[{begins:%Y-%m-%d %H:%M}] Guard #{rng.choice(guards)} begins shift")
+
+        minutes = sorted(rng.sample(range(6, 60), 2 * rng.randint(1, 3)))
+        for asleep, awake in zip(minutes[::2], minutes[1::2]):
+            lines.append(f"[{date + timedelta(minutes=asleep):%Y-%m-%d %H:%M}] falls asleep")
+            lines.append(f"[{date + timedelta(minutes=awake):%Y-%m-%d %H:%M}] wakes up")
+
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+def day05(size: int, rng: random.Random) -> str:
+    """
+    random units from ten unit types, both polarities
+    """
+    unit_types = string.ascii_lowercase[:10]
+    return "".join(rng.choice(unit_types) if rng.random() < 0.5 else rng.choice(unit_types).upper()
+                   for _ in range(size))
+
+
+def day06(size: int, rng: random.Random) -> str:
+    """
+    distinct random coordinates, spread roughly as densely as in the actual input (50 points on a 300x300 area)
+    """
+    side = max(10, int(45 * size ** 0.5))
+    points = set()
+    while len(points) < max(2, size):
+        points.add((rng.randrange(side), rng.randrange(side)))
+
+    return "\n".join(f"{x}, {y}" for x, y in points)
+
+
+def day07(size: int, rng: random.Random) -> str:
+    """
+    random acyclic requirements between single character steps (upper and lower case letters)
+    """
+    steps = list(string.ascii_uppercase + string.ascii_lowercase)
+    rng.shuffle(steps)  # a random topological order
+
+    all_reqs = [(steps[i], steps[j]) for i in range(len(steps)) for j in range(i + 1, len(steps))]
+    reqs = rng.sample(all_reqs, min(size, len(all_reqs)))
+
+    return "\n".join(f"Step {before} must be finished before step {after} can begin." for before, after in reqs)
+
+
+def day08(size: int, rng: random.Random) -> str:
+    """
+    random tree of size nodes. Metadata entries are 1..9, so that they can refer to children
+    """
+    numbers = []
+    # (node budget) stack, the tree is generated depth first iteratively. Each item: budget of the subtree
+    stack = [("node", size)]
+    while stack:
+        kind, value = stack.pop()
+        if kind == "meta":
+            numbers.extend(rng.randint(1, 9) for _ in range(value))
+            continue
+
+        budget = value - 1  # nodes for the children subtrees
+        num_children = min(budget, rng.randint(1, 5)) if budget > 0 else 0
+        cuts = sorted(rng.sample(range(1, budget), num_children - 1)) if num_children > 1 else []
+        child_budgets = [hi - lo for lo, hi in zip([0] + cuts, cuts + [budget])] if num_children else []
+
+        num_metadata = rng.randint(1, 5)
+        numbers.extend((num_children, num_metadata))
+
+        # metadata comes after the children
+        stack.append(("meta", num_metadata))
+        stack.extend(("node", child_budget) for child_budget in reversed(child_budgets))
+
+    return " ".join(map(str, numbers))
+
+
+def day09(size: int, rng: random.Random) -> str:
+    return f"{rng.randint(10, 500)} players; last marble is worth {size} points"
+
+
+def day10(size: int, rng: random.Random) -> str:
+    """
+    points that converge into a small "message" area at time 10000, from far away
+    """
+    message_time = 10_000
+    lines = []
+    for _ in range(size):
+        x, y = rng.randrange(60), rng.randrange(10)
+        vx, vy = rng.choice([-5, -4, -3, -2, -1, 1, 2, 3, 4, 5]), rng.choice([-5, -4, -3, -2, -1, 1, 2, 3, 4, 5])
+        # the sign or a space in front of every number, like in the actual input
+        lines.append(f"position=<{x - message_time * vx: d}, {y - message_time * vy: d}> velocity=<{vx: d}, {vy: d}>")
+
+    return "\n".join(lines)
+
+
+def day11(size: int, rng: random.Random) -> str:
+    """
+    the input is just a grid serial number; the grid is always 300x300
+    """
+    return str(rng.randint(1, 10_000))
+
+
+def day12(size: int, rng: random.Random) -> str:
+    """
+    random initial state, with rules that move every plant one pot to the right each generation
+    (so the score delta is constant from the first generation on and part 2 can extrapolate)
+    """
+    state = "".join(rng.choice(".#") for _ in range(size))
+    patterns = ["".join(pattern) for pattern in _product(".#", 5)]
+
+    lines = [f"initial state: {state}", ""]
+    lines.extend(f"{pattern} => {pattern[1]}" for pattern in patterns)
+
+    return "\n".join(lines)
+
+
+def _product(chars: str, repeat: int) -> List[str]:
+    if repeat == 0:
+        return [""]
+    return [char + rest for char in chars for rest in _product(chars, repeat - 1)]
+
+
+def day13(size: int, rng: random.Random) -> str:
+    """
+    size separate rectangular loops. Every loop has two carts heading towards each other on its top side,
+    except one loop that has a single cart: that is the cart that remains in part 2
+    """
+    per_row = max(1, int(size ** 0.5))
+    cell = 14  # each loop fits in a cell x cell area
+    num_rows = (size + per_row - 1) // per_row
+    canvas = [[" "] * (per_row * cell) for _ in range(num_rows * cell)]
+
+    single_cart_loop = rng.randrange(size)
+    for loop in range(size):
+        x0, y0 = (loop % per_row) * cell + rng.randint(0, 2), (loop // per_row) * cell + rng.randint(0, 2)
+        width, height = rng.randint(5, cell - 3), rng.randint(3, cell - 3)
+        x1, y1 = x0 + width, y0 + height
+
+        for x in range(x0 + 1, x1):
+            canvas[y0][x] = canvas[y1][x] = "-"
+        for y in range(y0 + 1, y1):
+            canvas[y][x0] = canvas[y][x1] = "|"
+        canvas[y0][x0], canvas[y0][x1], canvas[y1][x0], canvas[y1][x1] = "/", "\\", "\\", "/"
+
+        left, right = sorted(rng.sample(range(x0 + 1, x1), 2))
+        canvas[y0][left] = ">"
+        if loop != single_cart_loop:
+            canvas[y0][right] = "<"
+
+    return "\n".join("".join(row) for row in canvas)
+
+
+def day14(size: int, rng: random.Random) -> str:
+    """
+    a number of about size whose digits also show up on the scoreboard soon enough (within 20 * size recipes),
+    so that part 2 terminates in a time comparable to part 1
+    """
+    # the scoreboard, as digit characters
+    scores = bytearray(b"37")
+    elf1, elf2 = 0, 1
+    while len(scores) < 20 * size + 100:
+        score1, score2 = scores[elf1] - 48, scores[elf2] - 48
+        scores.extend(str(score1 + score2).encode())
+        elf1 = (elf1 + 1 + score1) % len(scores)
+        elf2 = (elf2 + 1 + score2) % len(scores)
+
+    num_recipes = size + rng.randrange(max(1, size // 10))
+    while str(num_recipes).encode() not in scores:
+        num_recipes += 1
+
+    return str(num_recipes)
+
+
+def day15(size: int, rng: random.Random) -> str:
+    """
+    size x size cave surrounded by walls. Inside, pillars at every fourth square keep the cave connected,
+    so the battle always ends. About one creature per row, half goblins half elves
+    """
+    cave = [["#"] * size for _ in range(size)]
+    for y in range(1, size - 1):
+        for x in range(1, size - 1):
+            cave[y][x] = "#" if x % 4 == 0 and y % 4 == 0 else "."
+
+    open_squares = [(x, y) for y in range(size) for x in range(size) if cave[y][x] == "."]
+    num_creatures = max(2, min(size, len(open_squares)))
+    for i, (x, y) in enumerate(rng.sample(open_squares, num_creatures)):
+        cave[y][x] = "G" if i % 2 else "E"
+
+    return "\n".join("".join(row) for row in cave)
+
+
+def day16(size: int, rng: random.Random) -> str:
+    """
+    samples of a random opcode numbering, then a test program of size instructions.
+    At least 12 samples per opcode, so that the opcodes resolve
+    """
+    # imported here: day 16 is only needed for generating its own input
+    from day16_chronal_classification import OPERATIONS, Instruction
+
+    ops = OPERATIONS[:]
+    rng.shuffle(ops)  # ops[opcode] is the operation of the opcode
+
+    blocks = []
+    for i in range(max(size, 12 * len(ops))):
+        opcode = i % len(ops)
+        before = [rng.randint(0, 3) for _ in range(4)]
+        a, b, c = rng.randint(0, 3), rng.randint(0, 3), rng.randint(0, 3)
+        after = Instruction(ops[opcode], a, b, c).process(before)
+        blocks.append(f"Before: {before}\n{opcode} {a} {b} {c}\nAfter:  {after}")
+    rng.shuffle(blocks)
+
+    program = [f"{rng.randrange(len(ops))} {rng.randint(0, 3)} {rng.randint(0, 3)} {rng.randint(0, 3)}"
+               for _ in range(size)]
+
+    return "\n\n".join(blocks) + "\n\n\n\n" + "\n".join(program)
+
+
+def day17(size: int, rng: random.Random) -> str:
+    """
+    clay buckets (three veins each: two walls and a floor) and shelves (one vein),
+    stacked down from the spring at x=500 so that they do not overlap
+    """
+    veins = []
+    y = rng.randint(2, 5)
+    while len(veins) < size:
+        width = rng.randint(3, 15)
+        x_lo = 500 + rng.randint(-width - 10, 10)
+        x_hi = x_lo + width
+        depth = rng.randint(2, 8)
+
+        if size - len(veins) >= 3 and rng.random() < 0.8:  # bucket
+            veins.append(f"x={x_lo}, y={y}..{y + depth}")
+            veins.append(f"x={x_hi}, y={y + rng.randint(0, depth - 1)}..{y + depth}")
+            veins.append(f"y={y + depth}, x={x_lo}..{x_hi}")
+        else:  # shelf
+            veins.append(f"y={y + depth}, x={x_lo}..{x_hi}")
+
+        y += depth + rng.randint(3, 6)
+
+    return "\n".join(veins)
+
+
+def day18(size: int, rng: random.Random) -> str:
+    return "\n".join("".join(rng.choices(".|#", weights=(4, 4, 2), k=size)) for _ in range(size))
+
+
+def day19(size: int, rng: random.Random) -> str:
+    """
+    the actual program's main loop (sums the factors of register 4), with a setup that just sets register 4 to size
+    """
+    return "\n".join([
+        "#ip 5",
+        "addi 5 16 5",  # 0: jump to the setup
+        "seti 1 1 2",
+        "seti 1 8 1",
+        "mulr 2 1 3",
+        "eqrr 3 4 3",
+        "addr 3 5 5",
+        "addi 5 1 5",
+        "addr 2 0 0",
+        "addi 1 1 1",
+        "gtrr 1 4 3",
+        "addr 5 3 5",
+        "seti 2 6 5",
+        "addi 2 1 2",
+        "gtrr 2 4 3",
+        "addr 3 5 5",
+        "seti 1 2 5",
+        "mulr 5 5 5",  # 16: halt
+        f"seti {size} 0 4",  # 17: setup
+        "seti 0 0 0",
+        "seti 0 0 5",  # back to instruction 1
+    ])
+
+
+def day20(size: int, rng: random.Random) -> str:
+    """
+    random route regex: runs of directions, branches (A|B) and detours (NEWS|), nested at most 20 deep
+    """
+    parts = ["^"]
+    depth = 0
+    num_directions = 0
+    while num_directions < size:
+        choice = rng.random()
+        if choice < 0.1 and depth < 20:  # open a branch
+            parts.append("(")
+            depth += 1
+        elif choice < 0.2 and depth > 0:  # next option, or close the branch
+            parts.append(rng.choice(["|", ")"]))
+            if parts[-1] == ")":
+                depth -= 1
+        elif choice < 0.25:  # detour
+            detour = "".join(rng.choice("NESW") for _ in range(rng.randint(1, 4)))
+            back = detour[::-1].translate(str.maketrans("NESW", "SWNE"))
+            parts.append(f"({detour}{back}|)")
+            num_directions += 2 * len(detour)
+        else:
+            run = rng.randint(1, 10)
+            parts.append("".join(rng.choice("NESW") for _ in range(run)))
+            num_directions += run
+
+    parts.append(")" * depth + "$")
+    return "".join(parts)
+
+
+GENERATORS: Dict[int, Callable[[int, random.Random], str]] = {
+    1: day01, 2: day02, 3: day03, 4: day04, 5: day05, 6: day06, 7: day07, 8: day08, 9: day09, 10: day10,
+    11: day11, 12: day12, 13: day13, 14: day14, 15: day15, 16: day16, 17: day17, 18: day18, 19: day19, 20: day20,
+}
+
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    """
+    returns a synthetic input of the given size for the day. The same seed gives the same input
+    """
+    if day not in GENERATORS:
+        raise ValueError(f"No input generator for day {day}")
+
+    return GENERATORS[day](size, random.Random(f"{day}-{size}-{seed}"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print a synthetic puzzle input")
+    parser.add_argument("day", type=int)
+    parser.add_argument("size", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(generate(args.day, args.size, args.seed))
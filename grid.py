@@ -0,0 +1,173 @@
+"""
+Advent of code, 2018
+Grid: a 2D map of characters in one flat bytearray
+
+Days 13, 15, 17 and 18 simulate things on a map. A dict keyed by (x, y) hashes a tuple at every lookup and
+takes 100+ bytes per cell; here a cell is one byte, at index (y - y_lo) * width + (x - x_lo), row by row,
+so that the reading order (top to bottom, left to right) is the index order.
+
+There are two ways in:
+    grid[x, y], grid.get((x, y), "."), grid.items(), grid.render()   -- characters, for parsing and display
+    grid.cells[i], grid.cells[i + grid.width], grid.neighbor_indexes()  -- byte values and flat indexes,
+                                                                          for the inner loops of the simulations
+The cells are ASCII characters: ord("#") == grid.cells[grid.index(x, y)] when grid[x, y] == "#".
+"""
+
+from typing import Iterator, List, Optional, Tuple
+
+Pos = Tuple[int, int]  # x, y
+
+# (dx, dy) of the neighbors, in reading order
+NEIGHBORS_4 = ((0, -1), (-1, 0), (1, 0), (0, 1))
+NEIGHBORS_8 = ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+
+class Grid():
+    """
+    characters at the positions x_lo..x_hi, y_lo..y_hi (inclusive), all positions in between are present
+    """
+    __slots__ = ("x_lo", "y_lo", "width", "height", "cells")
+
+    def __init__(self, x_lo: int, y_lo: int, x_hi: int, y_hi: int, fill: str = "."):
+        self.x_lo = x_lo
+        self.y_lo = y_lo
+        self.width = x_hi - x_lo + 1
+        self.height = y_hi - y_lo + 1
+        self.cells = bytearray(fill.encode("ascii")) * (self.width * self.height)
+
+    @classmethod
+    def from_text(cls, text: str, fill: str = " ", x_lo: int = 0, y_lo: int = 0) -> "Grid":
+        """
+        one row per line, the first character of the first line at (x_lo, y_lo).
+        Lines shorter than the longest one are padded with fill
+        """
+        lines = text.splitlines()
+        width = max((len(line) for line in lines), default=0)
+        grid = cls(x_lo, y_lo, x_lo + width - 1, y_lo + len(lines) - 1, fill)
+        grid.cells[:] = b"".join(line.ljust(width, fill).encode("ascii") for line in lines)
+
+        return grid
+
+    @property
+    def x_hi(self) -> int:
+        return self.x_lo + self.width - 1
+
+    @property
+    def y_hi(self) -> int:
+        return self.y_lo + self.height - 1
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return self.x_lo <= x < self.x_lo + self.width and self.y_lo <= y < self.y_lo + self.height
+
+    def index(self, x: int, y: int) -> int:
+        """
+        the index of (x, y) in cells. Not checked: a position out of the bounds gives some other cell or an IndexError
+        """
+        return (y - self.y_lo) * self.width + (x - self.x_lo)
+
+    def position(self, i: int) -> Pos:
+        y, x = divmod(i, self.width)
+        return (x + self.x_lo, y + self.y_lo)
+
+    def __getitem__(self, pos: Pos) -> str:
+        x, y = pos
+        if not self.in_bounds(x, y):
+            raise IndexError(f"{pos} is outside of the grid")
+        return chr(self.cells[(y - self.y_lo) * self.width + (x - self.x_lo)])
+
+    def __setitem__(self, pos: Pos, char: str):
+        x, y = pos
+        if not self.in_bounds(x, y):
+            raise IndexError(f"{pos} is outside of the grid")
+        self.cells[(y - self.y_lo) * self.width + (x - self.x_lo)] = ord(char)
+
+    def get(self, pos: Pos, default: Optional[str] = None) -> Optional[str]:
+        """
+        the character at pos, default if pos is outside of the grid (like dict.get)
+        """
+        x, y = pos
+        if not self.in_bounds(x, y):
+            return default
+        return chr(self.cells[(y - self.y_lo) * self.width + (x - self.x_lo)])
+
+    def __contains__(self, pos: Pos) -> bool:
+        return self.in_bounds(*pos)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return (self.x_lo, self.y_lo, self.width, self.cells) == (other.x_lo, other.y_lo, other.width, other.cells)
+
+    def copy(self) -> "Grid":
+        grid = Grid.__new__(Grid)
+        grid.x_lo, grid.y_lo, grid.width, grid.height = self.x_lo, self.y_lo, self.width, self.height
+        grid.cells = bytearray(self.cells)
+        return grid
+
+    def positions(self) -> Iterator[Pos]:
+        """
+        all the positions in reading order
+        """
+        for y in range(self.y_lo, self.y_lo + self.height):
+            for x in range(self.x_lo, self.x_lo + self.width):
+                yield (x, y)
+
+    def items(self) -> Iterator[Tuple[Pos, str]]:
+        """
+        (position, character) pairs in reading order
+        """
+        return zip(self.positions(), self.cells.decode("ascii"))
+
+    def neighbors(self, pos: Pos, offsets: Tuple[Pos, ...] = NEIGHBORS_4) -> Iterator[Pos]:
+        """
+        the neighbors of pos that are in the grid, in reading order
+        """
+        x, y = pos
+        for dx, dy in offsets:
+            if self.in_bounds(x + dx, y + dy):
+                yield (x + dx, y + dy)
+
+    def neighbor_indexes(self, offsets: Tuple[Pos, ...] = NEIGHBORS_4) -> List[Tuple[int, ...]]:
+        """
+        for every index of cells, the indexes of its neighbors in the grid. Computed once, used in the inner loops
+        (a plain i - 1 would wrap around to the previous row at the left edge)
+        """
+        return [tuple(self.index(*neighbor) for neighbor in self.neighbors(pos, offsets)) for pos in self.positions()]
+
+    def count(self, char: str, y_lo: int = None, y_hi: int = None) -> int:
+        """
+        the number of cells with char, in the rows y_lo..y_hi (default: all rows)
+        """
+        start = 0 if y_lo is None else max(y_lo - self.y_lo, 0) * self.width
+        end = len(self.cells) if y_hi is None else max(y_hi - self.y_lo + 1, 0) * self.width
+        return self.cells.count(ord(char), start, end)
+
+    def find(self, char: str) -> Optional[Pos]:
+        """
+        the first position with char in reading order, None if there is none
+        """
+        i = self.cells.find(ord(char))
+        return self.position(i) if i >= 0 else None
+
+    def rfind(self, char: str) -> Optional[Pos]:
+        """
+        the last position with char in reading order, None if there is none
+        """
+        i = self.cells.rfind(ord(char))
+        return self.position(i) if i >= 0 else None
+
+    def row(self, y: int) -> str:
+        start = (y - self.y_lo) * self.width
+        return self.cells[start:start + self.width].decode("ascii")
+
+    def rows(self) -> List[str]:
+        return [self.row(y) for y in range(self.y_lo, self.y_lo + self.height)]
+
+    def render(self) -> str:
+        return "\n".join(self.rows())
+
+    def __str__(self):
+        return self.render()
+
+    def __repr__(self):
+        return f"<Grid x {self.x_lo}..{self.x_hi}, y {self.y_lo}..{self.y_hi}>"
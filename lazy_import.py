@@ -0,0 +1,46 @@
+"""
+Advent of code, 2018
+Lazy imports for the heavy libraries (numpy, networkx)
+
+The day modules bind these at the top level like a normal import:
+    np = lazy_import("numpy")
+but the actual import happens only when an attribute is first accessed,
+i.e. only on the code paths that really need the library.
+"""
+
+import importlib
+import sys
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """
+    placeholder module that imports the real module on first attribute access
+    """
+    def __getattr__(self, attr: str):
+        # only called for attributes not (yet) found in the instance dict
+        module = importlib.import_module(self.__name__)
+        # copy the real module's namespace here, so later accesses are plain attribute lookups
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+    def __repr__(self):
+        state = "loaded" if is_loaded(self.__name__) else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    returns the module if it has already been imported, otherwise a LazyModule placeholder for it
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    return LazyModule(name)
+
+
+def is_loaded(name: str) -> bool:
+    """
+    has the (real) module been imported in this process
+    """
+    return name in sys.modules
@@ -0,0 +1,145 @@
+"""
+Advent of code, 2018
+Memory report of a solve: peak traced memory, the top allocation sites and the objects by type
+
+tracemalloc gives the peak, but a snapshot at the end of a solve only shows what is still alive then:
+the big structures are usually gone by the time the answer is returned. So the solve is run twice under
+tracemalloc. The first run finds the peak. In the second run, a CPU time interval timer (SIGVTALRM) checks
+the traced memory every SAMPLE_INTERVAL_S. From SNAPSHOT_FROM of that peak on, a snapshot (allocation sites,
+and the gc tracked objects by type) is taken whenever the memory in use is GROWTH_STEP above the previous
+snapshot. The report shows the last one, the one closest to the high-water mark. (The very peak is often
+a short spike, like a dict being resized, that the sampling does not catch.)
+
+Tracing slows the code down a few times. The runner does the tracing after the timed runs.
+
+Usage (normally via the runner):
+    python run.py 9 14 --memory
+"""
+
+import gc
+import linecache
+import os
+import signal
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, List, NamedTuple, Tuple
+
+SAMPLE_INTERVAL_S = 0.01
+SNAPSHOT_FROM = 0.5  # no snapshots before the traced memory is at half of the peak
+GROWTH_STEP = 0.1  # then a new snapshot each time it has grown by 10 %
+TOP_N = 10
+
+
+class Site(NamedTuple):
+    location: str  # file:line
+    source: str  # the source line
+    size_bytes: int
+    count: int  # number of memory blocks allocated there
+
+
+class MemoryReport(NamedTuple):
+    peak_bytes: int  # tracemalloc peak
+    snapshot_bytes: int  # traced memory at the time of the snapshot, 0 if none was taken
+    sites: List[Site]
+    types: List[Tuple[str, int]]  # (type name, number of objects), the most common first
+
+
+class _HighWaterSnapshots():
+    """
+    keeps a snapshot of the highest traced memory use seen (from threshold_bytes on, in GROWTH_STEP steps)
+    """
+    def __init__(self, threshold_bytes: int, interval_s: float):
+        self.threshold_bytes = threshold_bytes
+        self.interval_s = interval_s
+        self.snapshot = None
+        self.snapshot_bytes = 0
+        self.types = Counter()
+
+    def check(self, signum=None, frame=None):
+        current, _ = tracemalloc.get_traced_memory()
+        if current < max(self.threshold_bytes, self.snapshot_bytes * (1 + GROWTH_STEP)):
+            return
+
+        # pause the timer: taking the snapshot takes longer than the interval
+        timer_on = signum is not None
+        if timer_on:
+            signal.setitimer(signal.ITIMER_VIRTUAL, 0, 0)
+
+        self.snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        self.snapshot_bytes = current
+        self.types = Counter(type(obj).__name__ for obj in gc.get_objects())
+
+        if timer_on:
+            signal.setitimer(signal.ITIMER_VIRTUAL, self.interval_s, self.interval_s)
+
+
+def _traced_peak(func: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def trace(func: Callable[[], Any], top_n: int = TOP_N, interval_s: float = SAMPLE_INTERVAL_S) -> MemoryReport:
+    """
+    runs func twice under tracemalloc, returns the memory report
+    """
+    peak = _traced_peak(func)
+
+    snapshotter = _HighWaterSnapshots(SNAPSHOT_FROM * peak, interval_s)
+    prev_handler = signal.signal(signal.SIGVTALRM, snapshotter.check)
+    tracemalloc.start()
+    try:
+        signal.setitimer(signal.ITIMER_VIRTUAL, interval_s, interval_s)
+        func()
+        signal.setitimer(signal.ITIMER_VIRTUAL, 0, 0)
+        snapshotter.check()  # in case the memory in use is at its highest at the end
+        # the two runs do not allocate exactly alike (the snapshots themselves take some memory)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        signal.setitimer(signal.ITIMER_VIRTUAL, 0, 0)
+        signal.signal(signal.SIGVTALRM, prev_handler)
+        tracemalloc.stop()
+
+    return MemoryReport(peak_bytes=peak, snapshot_bytes=snapshotter.snapshot_bytes,
+                        sites=_top_sites(snapshotter.snapshot, top_n), types=snapshotter.types.most_common(top_n))
+
+
+def _top_sites(snapshot: tracemalloc.Snapshot, top_n: int) -> List[Site]:
+    if snapshot is None:
+        return []
+
+    sites = []
+    for stat in snapshot.statistics("lineno")[:top_n]:
+        frame = stat.traceback[0]
+        sites.append(Site(location=f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                          source=linecache.getline(frame.filename, frame.lineno).strip(),
+                          size_bytes=stat.size, count=stat.count))
+    return sites
+
+
+def format_report(report: MemoryReport) -> str:
+    lines = [f"  peak traced memory {report.peak_bytes / 1024 ** 2:.1f} MB "
+             f"(snapshot taken at {report.snapshot_bytes / 1024 ** 2:.1f} MB)",
+             "  top allocation sites at the snapshot:"]
+    for site in report.sites:
+        lines.append(f"    {site.size_bytes / 1024 ** 2:>9.2f} MB {site.count:>10,} blocks  {site.location}  {site.source[:60]}")
+
+    lines.append("  objects by type (gc tracked objects) at the snapshot:")
+    for type_name, count in report.types:
+        lines.append(f"    {count:>12,}  {type_name}")
+
+    return "\n".join(lines)
+
+
+def as_dict(report: MemoryReport) -> dict:
+    """
+    the report as plain dicts and lists, for JSON
+    """
+    return {"peak_bytes": report.peak_bytes, "snapshot_bytes": report.snapshot_bytes,
+            "sites": [site._asdict() for site in report.sites], "types": dict(report.types)}
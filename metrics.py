@@ -0,0 +1,82 @@
+"""
+Advent of code, 2018
+Work counters of the simulations
+
+Each day module that counts its work has a counter set, off by default:
+    counts = metrics.counters("day17")
+and updates it behind a check of the flag, like the progress channels:
+    if counts.enabled:
+        counts["flow_one calls"] += 1
+The counts tell how much work a solve did (ticks, searches, instructions), independent of how fast each
+step is: compare them to see whether a change cut the work or only the constant factor.
+
+Counters are switched like the progress channels (progress.Switchboard): with the AOC_METRICS environment
+variable (AOC_METRICS=day17 or AOC_METRICS=all) or with enable(), e.g. by run.py --metrics, which reports
+the counts of each part after the table.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, Union
+
+from progress import Switchboard
+
+ENV_VAR = "AOC_METRICS"
+
+
+class Counters(Counter):
+    """
+    Counter with an on/off flag. Keys are the names of the counted things
+    """
+    def __init__(self, name: str, enabled: bool = False):
+        super().__init__()
+        self.name = name
+        self.enabled = enabled
+
+    def __repr__(self):
+        return f"<counters {self.name} ({'on' if self.enabled else 'off'}): {dict(self)}>"
+
+
+_counters = Switchboard(ENV_VAR, Counters)
+
+
+def counters(name: str) -> Counters:
+    """
+    returns the counter set of the given name, created on first use
+    """
+    return _counters.get(name)
+
+
+def enable(names: Iterable[str] = ("all",)):
+    """
+    turns the named counter sets on ("all": every set), also the ones created later
+    """
+    _counters.enable(names)
+
+
+def disable():
+    _counters.disable()
+
+
+def reset():
+    for c in _counters:
+        c.clear()
+
+
+def _key_name(key: Union[str, tuple]) -> str:
+    return " ".join(map(str, key)) if isinstance(key, tuple) else key
+
+
+def snapshot() -> Dict[str, int]:
+    """
+    all the non-zero counts, "set: counted thing" as the key.
+    A key can also be a tuple, like ("instructions at pc", 3): cheaper to make in a hot loop than a string
+    """
+    return {f"{c.name}: {_key_name(key)}": count
+            for c in _counters
+            for key, count in sorted(c.items(), key=lambda item: item[0] if isinstance(item[0], tuple) else (item[0],))
+            if count}
+
+
+def format_counts(counts: Dict[str, int]) -> str:
+    width = max((len(key) for key in counts), default=0)
+    return "\n".join(f"  {key:<{width}}  {count:>14,}" for key, count in counts.items())
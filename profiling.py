@@ -0,0 +1,140 @@
+"""
+Advent of code, 2018
+Profiling of a solve: cProfile stats, collapsed stacks and a top-N hot function summary
+
+While the code runs, cProfile records the calls, and a sampler (a CPU time interval timer, SIGPROF) records
+the Python stack every SAMPLE_INTERVAL_S. Three files come out, for prefix e.g. "profiles/day17_part1":
+    day17_part1.prof       cProfile stats, for pstats / snakeviz
+    day17_part1.collapsed  "outer;inner;innermost count" lines, input of flamegraph.pl / speedscope
+    day17_part1_top.txt    the top N functions by own time
+Both run in the same pass, so the stack proportions include the cProfile overhead, like the stats do.
+
+Usage (normally via the runner):
+    python run.py 17 --profile profiles/ --top 20
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import signal
+import sys
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Dict, List, Tuple
+
+SAMPLE_INTERVAL_S = 0.001
+TOP_N = 15
+
+
+def code_name(code: CodeType) -> str:
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def stack_depth(frame: FrameType) -> int:
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+
+    return depth
+
+
+class StackSampler():
+    """
+    counts the Python stacks seen at every tick of the profiling timer. Linux/macOS, main thread only
+    """
+    def __init__(self, interval_s: float = SAMPLE_INTERVAL_S):
+        self.interval_s = interval_s
+        self.stacks: Dict[Tuple[CodeType, ...], int] = {}  # stack (outermost first) -> number of samples
+        self.skip_frames = 0  # outermost frames left out of the stacks (the code that started the sampling)
+
+    def _sample(self, signum, frame: FrameType):
+        # runs under cProfile as well: no calls of builtin functions or methods here, those would be mixed
+        # up with the calls of the solve in the stats (the Python functions of this module are left out of the summary)
+        codes = []
+        while frame is not None:
+            codes += (frame.f_code,)
+            frame = frame.f_back
+        stack = tuple(codes[::-1][self.skip_frames:])
+        try:
+            self.stacks[stack] += 1
+        except KeyError:
+            self.stacks[stack] = 1
+
+    def start(self, skip_frames: int = 0):
+        self.skip_frames = skip_frames
+        self._prev_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval_s, self.interval_s)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._prev_handler)
+
+    def collapsed(self) -> str:
+        """
+        the stacks in the collapsed format, most common first
+        """
+        names = {}
+        lines = []
+        for stack, count in Counter(self.stacks).most_common():
+            if not stack:
+                continue
+            for code in stack:
+                if code not in names:
+                    names[code] = code_name(code)
+            lines.append(f"{';'.join(names[code] for code in stack)} {count}\n")
+
+        return "".join(lines)
+
+
+def top_functions(stats: pstats.Stats, top_n: int = TOP_N) -> str:
+    """
+    the top_n functions by own time (tottime), as a table. The profiler's own functions are left out
+    """
+    total = stats.total_tt or 1
+    rows = sorted(((func, stat) for func, stat in stats.stats.items() if func[0] != __file__),
+                  key=lambda item: -item[1][2])[:top_n]
+
+    lines = [f"{'own s':>8} {'own %':>6} {'cum s':>8} {'calls':>10}  function"]
+    for (filename, lineno, funcname), (_, ncalls, tottime, cumtime, _) in rows:
+        location = f"{os.path.basename(filename)}:{lineno}" if lineno else filename
+        lines.append(f"{tottime:>8.3f} {100 * tottime / total:>5.1f}% {cumtime:>8.3f} {ncalls:>10}  {funcname} ({location})")
+
+    return "\n".join(lines)
+
+
+class Profiler():
+    """
+    context manager, profiles the code in the with block and writes the three files for the prefix on exit
+    """
+    def __init__(self, prefix: str, top_n: int = TOP_N):
+        self.prefix = prefix
+        self.top_n = top_n
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler()
+
+    def __enter__(self) -> "Profiler":
+        # the stacks start from what is called in the with block, the frames of the caller and above are left out
+        self.sampler.start(skip_frames=stack_depth(sys._getframe(1)))
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.profile.disable()
+        self.sampler.stop()
+        self.write()
+
+    def paths(self) -> List[str]:
+        return [f"{self.prefix}.prof", f"{self.prefix}.collapsed", f"{self.prefix}_top.txt"]
+
+    def write(self):
+        prof_path, collapsed_path, top_path = self.paths()
+        os.makedirs(os.path.dirname(os.path.abspath(self.prefix)), exist_ok=True)
+
+        self.profile.dump_stats(prof_path)
+        with open(collapsed_path, "w") as f:
+            f.write(self.sampler.collapsed())
+        with open(top_path, "w") as f:
+            f.write(top_functions(pstats.Stats(self.profile, stream=io.StringIO()), self.top_n) + "\n")
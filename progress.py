@@ -0,0 +1,93 @@
+"""
+Advent of code, 2018
+Debug and progress output of the solutions
+
+Each day module has a channel, off by default:
+    debug = progress.channel("day13")
+and logs behind a check of the flag:
+    if debug.enabled: debug("tick:", self.tick)
+When the channel is off, that costs one attribute lookup: the arguments are not even evaluated,
+so no string formatting or grid rendering is done for output nobody sees.
+
+The output goes to stderr, the answers stay alone in stdout.
+Channels are enabled with the AOC_LOG environment variable (AOC_LOG=day13,day17 or AOC_LOG=all)
+or with enable(), e.g. by run.py --verbose.
+"""
+
+import os
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+ENV_VAR = "AOC_LOG"
+
+
+class Switchboard():
+    """
+    named things with an enabled flag (channels here, counter sets in metrics.py), created on first use.
+    They are switched on by name ("all": every one) from a comma separated environment variable or with enable(),
+    also the ones created later
+    """
+    def __init__(self, env_var: str, factory: Callable[..., Any]):
+        self.factory = factory  # factory(name, enabled=...)
+        self.items: Dict[str, Any] = {}
+        self.enabled_names = {name.strip() for name in os.environ.get(env_var, "").split(",") if name.strip()}
+
+    def wanted(self, name: str) -> bool:
+        return "all" in self.enabled_names or name in self.enabled_names
+
+    def get(self, name: str) -> Any:
+        if name not in self.items:
+            self.items[name] = self.factory(name, enabled=self.wanted(name))
+
+        return self.items[name]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.items.values())
+
+    def enable(self, names: Iterable[str] = ("all",)):
+        self.enabled_names.update(names)
+        for item in self:
+            item.enabled = self.wanted(item.name)
+
+    def disable(self):
+        self.enabled_names.clear()
+        for item in self:
+            item.enabled = False
+
+
+class Channel():
+    __slots__ = ("name", "enabled")
+
+    def __init__(self, name: str, enabled: bool = False):
+        self.name = name
+        self.enabled = enabled
+
+    def __call__(self, *args):
+        print(f"[{self.name}]", *args, file=sys.stderr)
+
+    def __repr__(self):
+        return f"<channel {self.name} ({'on' if self.enabled else 'off'})>"
+
+
+_channels = Switchboard(ENV_VAR, Channel)
+
+
+def channel(name: str) -> Channel:
+    """
+    returns the channel of the given name, created on first use
+    """
+    return _channels.get(name)
+
+
+def enable(names: Iterable[str] = ("all",)):
+    """
+    turns the named channels on ("all": every channel), also the ones created later
+    """
+    _channels.enable(names)
+
+
+def disable():
+    """
+    turns every channel off
+    """
+    _channels.disable()
@@ -0,0 +1,207 @@
+"""
+Advent of code, 2018
+Registry of the day modules
+
+Every day module exposes parse_puzzle(text), part1(puzzle) and part2(puzzle) (day 15 only part 1),
+and names its default input in INPUT_FILE (relative to the repository root).
+
+Parsed inputs are cached: read_puzzle pickles the parsed form under .cache/parsed/, keyed by the SHA-256
+of the input text. The hash of the source of the day module and of the repository modules it imports
+(grid.py, bulk_parse.py, day16 for day 19, ...) is part of the key as well, so a change in the parsing code
+or in the classes of the parsed form does not bring back stale parsed forms. Later reads of the same input
+skip the parsing. The cache is bounded in size: a hit touches the file, and the least recently used
+parsed forms are removed first.
+"""
+
+import ast
+import hashlib
+import importlib
+import os
+import pickle
+from types import ModuleType
+from typing import Any, Callable, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+PARSED_CACHE_DIR = os.path.join(HERE, ".cache", "parsed")
+PARSED_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+DAY_MODULES = {
+    1: "day01_chronal_calibration",
+    2: "day02_inventory_management_system",
+    3: "day03_no_matter_how_you_slice_it",
+    4: "day04_repose_record",
+    5: "day05_alchemical_reduction",
+    6: "day06_chronal_coordinates",
+    7: "day07_sum_of_its_parts",
+    8: "day08_memory_maneuver",
+    9: "day09_marble_mania_v3",
+    10: "day10_the_stars_align",
+    11: "day11_chronal_charge",
+    12: "day12_subterranean_sustainability",
+    13: "day13_mine_cart_madness",
+    14: "day14_chocolate_charts",
+    15: "day15_beverage_bandits",
+    16: "day16_chronal_classification",
+    17: "day17_reservoir_research",
+    18: "day18_settlers_of_the_north_pole",
+    19: "day19_go_with_the_flow",
+    20: "day20_a_regular_map",
+}
+
+PARTS = (1, 2)
+
+
+def load_module(day: int) -> ModuleType:
+    if day not in DAY_MODULES:
+        raise ValueError(f"No solution for day {day}")
+
+    return importlib.import_module(DAY_MODULES[day])
+
+
+def available_parts(day: int) -> List[int]:
+    module = load_module(day)
+    return [part for part in PARTS if hasattr(module, f"part{part}")]
+
+
+def get_solver(day: int, part: int) -> Callable[[Any], Any]:
+    module = load_module(day)
+    solver = getattr(module, f"part{part}", None)
+    if solver is None:
+        raise ValueError(f"No solution for day {day} part {part}")
+
+    return solver
+
+
+def default_input_path(day: int) -> str:
+    return os.path.join(HERE, load_module(day).INPUT_FILE)
+
+
+def read_text(day: int, path: str = None) -> str:
+    """
+    the input text of the day, from the default input of the day if no path is given
+    """
+    with open(path or default_input_path(day)) as f:
+        return f.read()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _local_imports(path: str) -> List[str]:
+    """
+    the paths of the repository modules imported by the module at path
+    """
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), path)
+
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+
+    paths = (os.path.join(HERE, f"{name}.py") for name in names)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def source_paths(day: int) -> List[str]:
+    """
+    the source of the day module and of the repository modules it imports, directly or not
+    """
+    paths, todo = set(), [os.path.abspath(load_module(day).__file__)]
+    while todo:
+        path = todo.pop()
+        if path not in paths:
+            paths.add(path)
+            todo.extend(_local_imports(path))
+
+    return sorted(paths)
+
+
+def module_source_hash(day: int) -> str:
+    sha = hashlib.sha256()
+    for path in source_paths(day):
+        with open(path, "rb") as f:
+            sha.update(os.path.basename(path).encode() + b"\0" + f.read())
+
+    return sha.hexdigest()[:16]
+
+
+def parsed_cache_path(day: int, text: str) -> str:
+    return os.path.join(PARSED_CACHE_DIR, f"day{day:02}_{text_hash(text)}_{module_source_hash(day)}.pickle")
+
+
+def _evict_parsed(max_bytes: int = PARSED_CACHE_MAX_BYTES):
+    """
+    removes least recently used parsed forms until the total size is within the bound
+    """
+    entries = []
+    for name in os.listdir(PARSED_CACHE_DIR) if os.path.isdir(PARSED_CACHE_DIR) else []:
+        if not name.endswith(".pickle"):
+            continue
+        path = os.path.join(PARSED_CACHE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:  # evicted by a parallel run
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def _load_parsed(cache_path: str) -> Optional[Any]:
+    try:
+        with open(cache_path, "rb") as f:
+            puzzle = pickle.load(f)
+        os.utime(cache_path)  # the modification time is the last use, see _evict_parsed
+        return puzzle
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):  # not cached, or unusable
+        return None
+
+
+def _save_parsed(cache_path: str, puzzle: Any):
+    try:
+        data = pickle.dumps(puzzle, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError):  # not picklable, just do not cache
+        return
+
+    os.makedirs(PARSED_CACHE_DIR, exist_ok=True)
+    # write + rename, so that parallel runs never read a half written file
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, cache_path)
+
+    _evict_parsed()
+
+
+def read_puzzle(day: int, path: str = None, use_cache: bool = True) -> Any:
+    """
+    reads and parses the input of the day. The default input of the day is used if no path is given.
+    With use_cache, the parsed form is loaded from the cache if this input has been parsed before
+    """
+    return parse_text(day, read_text(day, path), use_cache)
+
+
+def parse_text(day: int, text: str, use_cache: bool = True) -> Any:
+    if not use_cache:
+        return load_module(day).parse_puzzle(text)
+
+    cache_path = parsed_cache_path(day, text)
+    puzzle = _load_parsed(cache_path)
+    if puzzle is None:
+        puzzle = load_module(day).parse_puzzle(text)
+        _save_parsed(cache_path, puzzle)
+
+    return puzzle
@@ -0,0 +1,311 @@
+"""
+Advent of code, 2018
+Command line runner for the day solutions, with per-part timing
+
+Every part is run in a fresh worker process, so the measurements of one part are not affected
+by what ran before it (imports, caches, memory already allocated by other parts).
+
+With --jobs N the parts run in parallel in N worker processes. They are scheduled longest-first,
+using the runtimes recorded by earlier runs (parts without a recorded runtime go first), so the total
+wall time comes down to roughly the runtime of the slowest part. Results are reported in day/part order.
+
+Usage:
+    python run.py 1 5 9-11          # days 1, 5, 9, 10 and 11, all parts
+    python run.py all               # every day
+    python run.py 9 --part 2 --repeat 5
+    python run.py 17 --input other_scan.txt --json
+    python run.py all --jobs 8
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+import answer_cache
+import checkpoint
+import memory_report
+import metrics
+import profiling
+import progress
+import puzzles
+
+# wall times of earlier runs, used for the longest-first scheduling
+RUNTIMES_FILE = os.path.join(puzzles.HERE, ".cache", "runtimes.json")
+
+
+class PartResult(NamedTuple):
+    day: int
+    part: int
+    answer: Any
+    parse_s: float  # wall time of reading + parsing the input (or loading the cached parsed form)
+    wall_s: float  # best wall time over the repeats
+    wall_mean_s: float  # mean wall time over the repeats
+    cpu_s: float  # best CPU time (user + system) over the repeats
+    peak_rss_kb: int  # peak resident set size of the worker process
+    repeat: int
+    cached: bool = False  # the answer came from the answer cache, the timings are those of the cache lookup
+    counts: Dict[str, int] = None  # work counters of the solve (see metrics.py), if asked for
+    memory: memory_report.MemoryReport = None  # traced memory of the solve, if asked for
+
+
+def parse_days(specs: List[str]) -> List[int]:
+    """
+    given the day arguments ("all", "5", "9-11"), returns the sorted list of days
+    """
+    days = set()
+    for spec in specs:
+        if spec == "all":
+            days.update(puzzles.DAY_MODULES)
+        elif "-" in spec:
+            first, last = spec.split("-")
+            days.update(range(int(first), int(last) + 1))
+        else:
+            days.add(int(spec))
+
+    unknown = days - set(puzzles.DAY_MODULES)
+    if unknown:
+        raise ValueError(f"No solution for day(s): {sorted(unknown)}")
+
+    return sorted(days)
+
+
+def peak_rss_kb() -> int:
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux, in bytes on macOS
+    return maxrss // 1024 if sys.platform == "darwin" else maxrss
+
+
+def measure_part(day: int, part: int, input_path: str = None, repeat: int = 1, verbose: bool = False,
+                 use_cache: bool = True, use_answers: bool = False, profile_dir: str = None,
+                 top_n: int = profiling.TOP_N, count: bool = False, trace_memory: bool = False,
+                 save_checkpoints: bool = False, resume: bool = False, checkpoint_every: int = None) -> PartResult:
+    """
+    solves the part repeat times, returns the answer with the timings.
+    Meant to be run in a fresh process (see run_parts) so that the peak RSS is that of this part only.
+    With use_answers, a cached answer is returned if there is one, and a new answer is cached.
+    With profile_dir, the solving is profiled, see profiling.py (the timings then include the profiling overhead).
+    With count, the work counters of the solutions are on, and their counts (over all repeats) are returned.
+    With trace_memory, the memory allocations of the solving are traced after the timed runs, see memory_report.py.
+    With save_checkpoints, the long simulations save their state as they go (see checkpoint.py), with resume they
+    also continue from the states saved by an earlier run of the same part and input that did not finish
+    """
+    if use_answers:
+        start = time.perf_counter()
+        cache = answer_cache.AnswerCache()
+        key = answer_cache.answer_key(day, part, puzzles.read_text(day, input_path))
+        found, answer = cache.get(key)
+        lookup_s = time.perf_counter() - start
+        if found:
+            return PartResult(day=day, part=part, answer=answer, parse_s=0.0, wall_s=lookup_s, wall_mean_s=lookup_s,
+                              cpu_s=0.0, peak_rss_kb=peak_rss_kb(), repeat=0, cached=True)
+
+    # progress info of the solutions (to stderr) and anything else they print. Not wanted unless asked for
+    with contextlib.ExitStack() as stack:
+        if verbose:
+            progress.enable()
+        else:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+
+        start = time.perf_counter()
+        puzzle = puzzles.read_puzzle(day, input_path, use_cache)
+        parse_s = time.perf_counter() - start
+
+        solver = puzzles.get_solver(day, part)
+        if save_checkpoints or resume:
+            job = f"day{day:02}_part{part}_{puzzles.text_hash(puzzles.read_text(day, input_path))[:16]}"
+            checkpoint.enable(job, every=checkpoint_every, resume=resume)
+        if count:
+            metrics.enable()
+            metrics.reset()  # nothing counted while parsing
+        profiler = profiling.Profiler(profile_prefix(profile_dir, day, part), top_n) if profile_dir else contextlib.nullcontext()
+
+        walls, cpus = [], []
+        with profiler:
+            for _ in range(repeat):
+                wall_start, cpu_start = time.perf_counter(), time.process_time()
+                answer = solver(puzzle)
+                cpus.append(time.process_time() - cpu_start)
+                walls.append(time.perf_counter() - wall_start)
+                checkpoint.clear_job()  # solved, the checkpoints are not needed any more
+
+        checkpoint.disable()
+
+        # before the tracing, which would add to both
+        counts = metrics.snapshot() if count else None
+        rss_kb = peak_rss_kb()
+
+        memory = memory_report.trace(lambda: solver(puzzle), top_n) if trace_memory else None
+
+    if use_answers:
+        cache.put(key, answer, {"day": day, "part": part})
+
+    return PartResult(day=day, part=part, answer=answer, parse_s=parse_s,
+                      wall_s=min(walls), wall_mean_s=sum(walls) / len(walls), cpu_s=min(cpus),
+                      peak_rss_kb=rss_kb, repeat=repeat, counts=counts, memory=memory)
+
+
+def profile_prefix(profile_dir: str, day: int, part: int) -> str:
+    return os.path.join(profile_dir, f"day{day:02}_part{part}")
+
+
+def load_runtimes(path: str = RUNTIMES_FILE) -> Dict[str, float]:
+    """
+    returns the recorded wall times, "day.part" as the key
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def record_runtimes(results: List[PartResult], path: str = RUNTIMES_FILE):
+    runtimes = load_runtimes(path)
+    runtimes.update({f"{r.day}.{r.part}": r.wall_mean_s for r in results})
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(runtimes, f, indent=1, sort_keys=True)
+
+
+def longest_first(tasks: List[Tuple[int, int]], runtimes: Dict[str, float]) -> List[Tuple[int, int]]:
+    """
+    orders the tasks by their recorded runtime, descending. Tasks never run before go first
+    """
+    return sorted(tasks, key=lambda task: -runtimes.get(f"{task[0]}.{task[1]}", float("inf")))
+
+
+def run_parts(tasks: List[Tuple[int, int]], input_path: str = None, repeat: int = 1, verbose: bool = False,
+              jobs: int = 1, use_cache: bool = True, use_answers: bool = False, profile_dir: str = None,
+              top_n: int = profiling.TOP_N, count: bool = False, trace_memory: bool = False,
+              save_checkpoints: bool = False, resume: bool = False, checkpoint_every: int = None) -> List[PartResult]:
+    """
+    runs the (day, part) tasks in jobs worker processes, a fresh process for each task.
+    Returns the results in the order of the given tasks
+    """
+    schedule = longest_first(tasks, load_runtimes()) if jobs > 1 else tasks
+
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=get_context("spawn"), max_tasks_per_child=1) as pool:
+        futures = {task: pool.submit(measure_part, *task, input_path, repeat, verbose, use_cache, use_answers,
+                                     profile_dir, top_n, count, trace_memory, save_checkpoints, resume, checkpoint_every)
+                   for task in schedule}
+        results = [futures[task].result() for task in tasks]
+
+    # runtimes of other inputs would not tell much about the default inputs, nor would cache lookups,
+    # profiled or counted runs
+    if input_path is None and profile_dir is None and not count:
+        record_runtimes([r for r in results if not r.cached])
+
+    return results
+
+
+def format_table(results: List[PartResult]) -> str:
+    lines = [f"{'day':>3} {'part':>4}  {'wall s':>9} {'mean s':>9} {'cpu s':>9} {'parse s':>8} {'peak RSS MB':>11}  answer"]
+    for r in results:
+        answer = str(r.answer)
+        if "\n" in answer:  # the day 10 message
+            answer = "\n" + answer
+        if r.cached:
+            answer = f"{answer}  (cached)"
+        lines.append(f"{r.day:>3} {r.part:>4}  {r.wall_s:>9.3f} {r.wall_mean_s:>9.3f} {r.cpu_s:>9.3f} "
+                     f"{r.parse_s:>8.3f} {r.peak_rss_kb / 1024:>11.1f}  {answer}")
+
+    return "\n".join(lines)
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run Advent of code 2018 solutions with per-part timing")
+    parser.add_argument("days", nargs="+", help='days to run: numbers, ranges like 9-11, or "all"')
+    parser.add_argument("--part", type=int, choices=puzzles.PARTS, help="run only this part")
+    parser.add_argument("--input", help="input file (default: the input of the day in data/). Only with a single day")
+    parser.add_argument("--repeat", type=int, default=1, help="solve each part N times, report best and mean wall time")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="run parts in parallel in N worker processes, longest first (0: one per CPU)")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per part instead of a table")
+    parser.add_argument("--verbose", action="store_true", help="let the solutions print their progress output (all log channels on)")
+    parser.add_argument("--no-cache", action="store_true", help="always parse the input, do not use the parsed input cache")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="profile the solving, write cProfile stats, collapsed stacks and a top-N summary to DIR")
+    parser.add_argument("--top", type=int, default=profiling.TOP_N, help="number of functions in the profile summary")
+    parser.add_argument("--metrics", action="store_true",
+                        help="count the work of the simulations (ticks, searches, ...), report the counts after the table")
+    parser.add_argument("--memory", action="store_true",
+                        help="trace the memory allocations: peak, top allocation sites, objects by type (solves each part 2 more times)")
+    parser.add_argument("--checkpoint", action="store_true",
+                        help="let the long simulations save their state every N steps (see checkpoint.py)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue the parts from the checkpoints of an earlier run that was killed (implies --checkpoint)")
+    parser.add_argument("--checkpoint-every", type=int, metavar="N",
+                        help="save a checkpoint every N steps (default: the interval of each simulation)")
+    parser.add_argument("--answers", action="store_true",
+                        help="return cached answers of inputs solved before, cache the new ones (see answer_cache.py)")
+    return parser
+
+
+def main(argv: List[str] = None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        days = parse_days(args.days)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.input and len(days) > 1:
+        parser.error("--input can only be used with a single day")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.checkpoint_every is not None and args.checkpoint_every < 1:
+        parser.error("--checkpoint-every must be at least 1")
+
+    tasks = [(day, part) for day in days for part in puzzles.available_parts(day)
+             if args.part is None or part == args.part]
+
+    if args.jobs < 0:
+        parser.error("--jobs must be at least 1 (or 0 for one per CPU)")
+    jobs = args.jobs or os.cpu_count()
+
+    start = time.perf_counter()
+    results = run_parts(tasks, input_path=args.input, repeat=args.repeat, verbose=args.verbose, jobs=jobs,
+                        use_cache=not args.no_cache, use_answers=args.answers, profile_dir=args.profile, top_n=args.top,
+                        count=args.metrics, trace_memory=args.memory, save_checkpoints=args.checkpoint,
+                        resume=args.resume, checkpoint_every=args.checkpoint_every)
+    total_s = time.perf_counter() - start
+
+    if args.json:
+        for result in results:
+            record = result._asdict()
+            if result.memory:
+                record["memory"] = memory_report.as_dict(result.memory)
+            print(json.dumps(record))
+    else:
+        print(format_table(results))
+        print(f"\ntotal wall time {total_s:.3f} s with {jobs} worker(s)")
+
+    if args.metrics and not args.json:
+        for result in results:
+            if result.counts:
+                print(f"\nday {result.day} part {result.part} counts:\n{metrics.format_counts(result.counts)}")
+
+    if args.memory and not args.json:
+        for result in results:
+            if result.memory:
+                print(f"\nday {result.day} part {result.part} memory:\n{memory_report.format_report(result.memory)}")
+
+    if args.profile and not args.json:
+        for result in results:
+            if result.cached:
+                continue
+            prefix = profile_prefix(args.profile, result.day, result.part)
+            with open(f"{prefix}_top.txt") as f:
+                print(f"\nday {result.day} part {result.part}, hot functions (full profile: {prefix}.*)\n{f.read()}", end="")
+
+
+if __name__ == "__main__":
+    main()
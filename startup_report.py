@@ -0,0 +1,92 @@
+"""
+Advent of code, 2018
+Startup report: import time of each day module
+
+Each module is imported in a fresh interpreter with "python -X importtime", so the figures are
+cold import times (incl. everything the module pulls in), not affected by modules imported earlier.
+
+Usage:
+    python startup_report.py [module ...]
+"""
+
+import glob
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, NamedTuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# libraries that are expensive to import. Reported if a module import pulls them in
+HEAVY_LIBS = ("numpy", "networkx")
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    import_us: int  # cumulative import time of the module, microseconds
+    total_us: int  # cumulative import time of everything imported by "import module"
+    heavy_libs: List[str]  # HEAVY_LIBS imported as a side effect
+
+
+def day_modules() -> List[str]:
+    return sorted(os.path.basename(path)[:-3] for path in glob.glob(os.path.join(HERE, "day[0-9][0-9]_*.py")))
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """
+    returns dict of top level module name -> cumulative import time [us], from the -X importtime output
+    format: "import time:       self [us] |  cumulative | imported package"
+    """
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum_us, package = line[len("import time:"):].split("|")
+        if not package.startswith("  "):  # nested imports are indented by two spaces per level
+            cumulative[package.strip()] = int(cum_us)
+
+    return cumulative
+
+
+def time_import(module: str) -> ImportTiming:
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=HERE, capture_output=True, text=True, check=True)
+    cumulative = parse_importtime(proc.stderr)
+    imported = {line.split("|")[-1].strip() for line in proc.stderr.splitlines() if line.startswith("import time:")}
+
+    return ImportTiming(module=module,
+                        import_us=cumulative.get(module, 0),
+                        total_us=sum(cumulative.values()),
+                        heavy_libs=[lib for lib in HEAVY_LIBS if lib in imported])
+
+
+def interpreter_startup_ms(repeat: int = 5) -> float:
+    """
+    best-of-repeat wall time of starting an interpreter that does nothing
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], cwd=HERE, check=True)
+        best = min(best, time.perf_counter() - start)
+
+    return best * 1000
+
+
+def report(modules: List[str]) -> str:
+    timings = [time_import(module) for module in modules]
+
+    width = max(len(module) for module in modules)
+    lines = [f"{'module':<{width}}  {'import ms':>9}  {'total ms':>8}  heavy libs loaded"]
+    for timing in timings:
+        lines.append(f"{timing.module:<{width}}  {timing.import_us / 1000:>9.1f}  {timing.total_us / 1000:>8.1f}  "
+                     f"{', '.join(timing.heavy_libs) or '-'}")
+
+    lines.append(f"\ninterpreter startup (python -c pass): {interpreter_startup_ms():.1f} ms")
+
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(report(sys.argv[1:] or day_modules()))
@@ -0,0 +1,105 @@
+"""
+Advent of code, 2018
+Streaming input: the line oriented days parse their input lazily, one line at a time, from a file or a pipe
+
+A line oriented day module names the parser of one (stripped, non-empty) line of input, and the parts that
+consume the parsed records in a single pass:
+    parse_line = req_from_line
+    STREAMING_PARTS = (1, 2)
+Those parts are given the records as a generator, so that they run over inputs of any length in the memory
+of their own state (a running sum, counts of a fixed set of things), never holding the input.
+The other parts need the whole input: they get the records collected into a list, or by the
+collect_records of the module if it has one (day 4 sorts its log).
+
+Usage:
+    python streaming.py 1 big_input.txt --part 1
+    python generators.py 2 10000000 | python streaming.py 2 - --part 1
+"""
+
+import argparse
+import sys
+from typing import Any, Callable, Iterable, Iterator, List
+
+import puzzles
+
+
+def open_lines(path: str) -> Iterator[str]:
+    """
+    yields the lines of the file (stdin if path is "-") as they are read
+    """
+    if path == "-":
+        yield from sys.stdin
+        return
+
+    with open(path) as f:
+        yield from f
+
+
+def records(lines: Iterable[str], parse_line: Callable[[str], Any]) -> Iterator[Any]:
+    """
+    yields the parsed records of the non-empty lines
+    """
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield parse_line(line)
+
+
+def streaming_days() -> List[int]:
+    return [day for day in puzzles.DAY_MODULES if hasattr(puzzles.load_module(day), "parse_line")]
+
+
+def streaming_parts(day: int) -> tuple:
+    return getattr(puzzles.load_module(day), "STREAMING_PARTS", ())
+
+
+def stream_puzzle(day: int, path: str = None) -> Iterator[Any]:
+    """
+    the parsed records of the input of the day (default input if no path is given), as a generator
+    """
+    module = puzzles.load_module(day)
+    if not hasattr(module, "parse_line"):
+        raise ValueError(f"Day {day} is not line oriented, it cannot be streamed")
+
+    return records(open_lines(path or puzzles.default_input_path(day)), module.parse_line)
+
+
+def solve(day: int, part: int, path: str = None) -> Any:
+    """
+    solves the part from the streamed input: as a generator if the part takes one, else collected first
+    """
+    module = puzzles.load_module(day)
+    puzzle = stream_puzzle(day, path)
+    if part not in streaming_parts(day):
+        puzzle = getattr(module, "collect_records", list)(puzzle)
+
+    return puzzles.get_solver(day, part)(puzzle)
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("day", type=int)
+    parser.add_argument("path", nargs="?", help="input file, - for stdin (default: the input of the day)")
+    parser.add_argument("--part", type=int, choices=puzzles.PARTS, help="solve only this part")
+    return parser
+
+
+def main(argv: List[str] = None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+
+    if args.day not in puzzles.DAY_MODULES:
+        parser.error(f"No solution for day {args.day}")
+    if args.day not in streaming_days():
+        parser.error(f"Day {args.day} is not line oriented, streaming days: {streaming_days()}")
+
+    parts = [part for part in puzzles.available_parts(args.day) if args.part is None or part == args.part]
+    if args.path == "-" and len(parts) > 1:
+        parser.error("stdin can be read only once, give --part")
+
+    for part in parts:
+        print(solve(args.day, part, args.path), flush=True)
+
+
+if __name__ == "__main__":
+    main()